@@ -44,20 +44,36 @@ psql $POSTGRES_DB -c "
         id UUID NOT NULL,
         owner_id UUID NOT NULL,
         state machine_state NOT NULL,
-        coin_01_qty SMALLINT NOT NULL,
-        coin_05_qty SMALLINT NOT NULL,
-        coin_10_qty SMALLINT NOT NULL,
-        coin_25_qty SMALLINT NOT NULL,
-        coin_50_qty SMALLINT NOT NULL,
-        coin_100_qty SMALLINT NOT NULL,
+        coin_01_qty INT NOT NULL,
+        coin_05_qty INT NOT NULL,
+        coin_10_qty INT NOT NULL,
+        coin_25_qty INT NOT NULL,
+        coin_50_qty INT NOT NULL,
+        coin_100_qty INT NOT NULL,
+        version INT NOT NULL DEFAULT 0,
         CONSTRAINT pk_machine_id PRIMARY KEY (id)
     );
 
+    CREATE TABLE IF NOT EXISTS machines_schema.coin_movements(
+        id BIGINT GENERATED ALWAYS AS IDENTITY,
+        machine_id UUID NOT NULL,
+        coin_01_qty INT NOT NULL,
+        coin_05_qty INT NOT NULL,
+        coin_10_qty INT NOT NULL,
+        coin_25_qty INT NOT NULL,
+        coin_50_qty INT NOT NULL,
+        coin_100_qty INT NOT NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT now(),
+        CONSTRAINT pk_coin_movement_id PRIMARY KEY (id),
+        CONSTRAINT fk_machine_id FOREIGN KEY(machine_id) REFERENCES machines_schema.machines(id) ON UPDATE CASCADE ON DELETE CASCADE
+    );
+
     CREATE TABLE IF NOT EXISTS machines_schema.machine_products(
         machine_id UUID NOT NULL,
         product_id UUID NOT NULL,
         product_qty INT NOT NULL,
         code VARCHAR(2) NOT NULL,
+        CONSTRAINT chk_product_qty_not_negative CHECK (product_qty >= 0),
         CONSTRAINT fk_product_id FOREIGN KEY(product_id) REFERENCES products_schema.products(id) ON UPDATE CASCADE ON DELETE CASCADE,
         CONSTRAINT fk_machine_id FOREIGN KEY(machine_id) REFERENCES machines_schema.machines(id) ON UPDATE CASCADE ON DELETE CASCADE
     ) PARTITION BY LIST (machine_id);
@@ -110,6 +126,7 @@ psql $POSTGRES_DB -c "
     CREATE INDEX idx_hash_machines_id ON machines_schema.machines USING HASH (id);
     CREATE INDEX idx_hash_owners_id ON machines_schema.owners USING HASH (id);
     CREATE INDEX idx_btree_machine_products_product_id ON machines_schema.machine_products USING BTREE (product_id);
+    CREATE INDEX idx_btree_coin_movements_machine_id_id ON machines_schema.coin_movements USING BTREE (machine_id, id);
     CREATE INDEX idx_btree_orders_machine_id_id ON orders_schema.orders USING BTREE (machine_id, id);
     CREATE INDEX idx_btree_order_items_order_id_id ON orders_schema.order_items USING BTREE (order_id, id);
     CREATE INDEX idx_btree_payments_payment_date_id ON payments_schema.payments USING BTREE (payment_date, id);
@@ -174,6 +191,7 @@ psql $POSTGRES_DB -c "
     SELECT cron.schedule('payments_partition_maintainer_job', '0 0 $ * *', 'SELECT partman.run_maintenance(p_parent_table := ''payments_schema.payments'', p_analyze := false)');
     SELECT cron.schedule('cash_payments_partition_maintainer_job', '0 0 $ * *', 'SELECT partman.run_maintenance(p_parent_table := ''payments_schema.cash_payments'', p_analyze := false)');
     SELECT cron.schedule('clean_jobs_log_job', '0 0 * * *', 'DELETE FROM cron.job_run_details WHERE end_time < now() - interval ''7 days''');
+    SELECT cron.schedule('coin_movements_compaction_job', '* * * * *', 'SELECT fn_compact_coin_movements()');
 "
 
 # Super User Functions
@@ -194,12 +212,12 @@ psql $POSTGRES_DB -c "
     CREATE TYPE machine_type AS (
         id UUID,
         state machine_state,
-        coin_01_qty SMALLINT,
-        coin_05_qty SMALLINT,
-        coin_10_qty SMALLINT,
-        coin_25_qty SMALLINT,
-        coin_50_qty SMALLINT,
-        coin_100_qty SMALLINT
+        coin_01_qty INT,
+        coin_05_qty INT,
+        coin_10_qty INT,
+        coin_25_qty INT,
+        coin_50_qty INT,
+        coin_100_qty INT
     );
 
     CREATE OR REPLACE FUNCTION fn_create_machine_partition(machine machine_type, owner owner_type, products product_type[])
@@ -317,3 +335,74 @@ psql $POSTGRES_DB -c "
     FOR EACH ROW
     EXECUTE FUNCTION fn_delete_machine_products_partition_trigger();
 "
+
+# Notify Machine Changes
+psql $POSTGRES_DB -c "
+    CREATE OR REPLACE FUNCTION fn_notify_machine_changes()
+    RETURNS TRIGGER AS \$\$
+    BEGIN
+        -- notifications are only delivered on commit, equal payloads of one transaction are sent once
+        PERFORM pg_notify('machine_changes', to_jsonb(NEW) ->> TG_ARGV[0]);
+        RETURN NULL;
+    END;
+    \$\$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER after_machine_update_notify
+    AFTER UPDATE ON machines_schema.machines
+    FOR EACH ROW
+    WHEN (OLD.* IS DISTINCT FROM NEW.*)
+    EXECUTE FUNCTION fn_notify_machine_changes('id');
+
+    CREATE TRIGGER after_machine_products_update_notify
+    AFTER UPDATE ON machines_schema.machine_products
+    FOR EACH ROW
+    WHEN (OLD.* IS DISTINCT FROM NEW.*)
+    EXECUTE FUNCTION fn_notify_machine_changes('machine_id');
+
+    -- coin movements are only recorded by purchases, whose stock update already notifies for the machine
+"
+
+# Compact Coin Movements
+psql $POSTGRES_DB -c "
+    CREATE OR REPLACE FUNCTION fn_compact_coin_movements()
+    RETURNS VOID AS \$\$
+    DECLARE
+        machine RECORD;
+    BEGIN
+        -- every machine is folded on its own, a machine whose movements cannot be folded keeps them
+        -- for the next run without holding back the others
+        FOR machine IN SELECT DISTINCT machine_id AS id FROM machines_schema.coin_movements LOOP
+            BEGIN
+                -- movements are folded into the coins of their machine and deleted in the same statement,
+                -- movements not committed yet are not seen and stay for the next run
+                WITH folded AS (
+                    DELETE FROM machines_schema.coin_movements
+                    WHERE machine_id = machine.id
+                    RETURNING machine_id, coin_01_qty, coin_05_qty, coin_10_qty, coin_25_qty, coin_50_qty, coin_100_qty
+                ), totals AS (
+                    SELECT machine_id,
+                           SUM(coin_01_qty) AS coin_01_qty,
+                           SUM(coin_05_qty) AS coin_05_qty,
+                           SUM(coin_10_qty) AS coin_10_qty,
+                           SUM(coin_25_qty) AS coin_25_qty,
+                           SUM(coin_50_qty) AS coin_50_qty,
+                           SUM(coin_100_qty) AS coin_100_qty
+                    FROM folded
+                    GROUP BY machine_id
+                )
+                UPDATE machines_schema.machines machines
+                SET coin_01_qty = machines.coin_01_qty + totals.coin_01_qty,
+                    coin_05_qty = machines.coin_05_qty + totals.coin_05_qty,
+                    coin_10_qty = machines.coin_10_qty + totals.coin_10_qty,
+                    coin_25_qty = machines.coin_25_qty + totals.coin_25_qty,
+                    coin_50_qty = machines.coin_50_qty + totals.coin_50_qty,
+                    coin_100_qty = machines.coin_100_qty + totals.coin_100_qty
+                FROM totals
+                WHERE machines.id = totals.machine_id;
+            EXCEPTION WHEN OTHERS THEN
+                RAISE WARNING 'coin movements of machine % were not compacted: %', machine.id, SQLERRM;
+            END;
+        END LOOP;
+    END;
+    \$\$ LANGUAGE plpgsql;
+"
@@ -0,0 +1,17 @@
+from src.domain.value_objects.coins import CoinsVector
+
+
+class CheckoutInputDTO:
+    def __init__(
+        self,
+        machine_id: str,
+        product_id: str,
+        product_qty: int,
+        payment_type: str,
+        coins: CoinsVector,
+    ):
+        self.machine_id = machine_id
+        self.product_id = product_id
+        self.product_qty = product_qty
+        self.payment_type = payment_type
+        self.coins = coins
@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+
+from src.domain.contracts.dtos.checkout import CheckoutInputDTO
+from src.domain.contracts.dtos.machine import AddCoinsOutputDTO
+
+
+class ICheckoutService(ABC):
+    @abstractmethod
+    async def checkout(self, input_dto: CheckoutInputDTO) -> AddCoinsOutputDTO:
+        """Function used to pay for a product and dispense it, returning the change"""
+        raise NotImplementedError
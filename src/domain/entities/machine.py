@@ -1,31 +1,17 @@
 from enum import Enum
-from typing import Self
+from typing import Optional, Self
 
 from src.domain.entities.owner import OwnerEntity
 from src.domain.entities.product import ProductEntity
 
 from src.domain.value_objects.uuid import UUIDValueObject
-from src.domain.value_objects.coins import CoinsValueObject, CoinTypes
+from src.domain.value_objects.coins import CoinsVector, CoinTypes
+from src.domain.value_objects.change_solver import solve_change
 
 from src.domain.exceptions.no_change_available import NoChangeAvailableException
 
-
-class CoinsChange:
-    def __init__(
-        self,
-        coin_01_qty: int,
-        coin_05_qty: int,
-        coin_10_qty: int,
-        coin_25_qty: int,
-        coin_50_qty: int,
-        coin_100_qty: int,
-    ):
-        self.coin_01_qty: int = coin_01_qty
-        self.coin_05_qty: int = coin_05_qty
-        self.coin_10_qty: int = coin_10_qty
-        self.coin_25_qty: int = coin_25_qty
-        self.coin_50_qty: int = coin_50_qty
-        self.coin_100_qty: int = coin_100_qty
+# change handed back is a plain coins vector
+CoinsChange = CoinsVector
 
 
 class MachineState(Enum):
@@ -42,36 +28,21 @@ class MachineEntity:
         id: str,
         owner: OwnerEntity,
         state: MachineState,
-        coin_01_qty: int,
-        coin_05_qty: int,
-        coin_10_qty: int,
-        coin_25_qty: int,
-        coin_50_qty: int,
-        coin_100_qty: int,
+        coins: CoinsVector,
         products: list[ProductEntity],
+        version: int = 0,
     ):
         self._id: UUIDValueObject = UUIDValueObject.create(id)
         self._owner: OwnerEntity = owner
         self._state = state
-        self._coin_01: CoinsValueObject = CoinsValueObject.create(
-            CoinTypes.COIN_01, coin_01_qty
-        )
-        self._coin_05: CoinsValueObject = CoinsValueObject.create(
-            CoinTypes.COIN_05, coin_05_qty
-        )
-        self._coin_10: CoinsValueObject = CoinsValueObject.create(
-            CoinTypes.COIN_10, coin_10_qty
-        )
-        self._coin_25: CoinsValueObject = CoinsValueObject.create(
-            CoinTypes.COIN_25, coin_25_qty
-        )
-        self._coin_50: CoinsValueObject = CoinsValueObject.create(
-            CoinTypes.COIN_50, coin_50_qty
-        )
-        self._coin_100: CoinsValueObject = CoinsValueObject.create(
-            CoinTypes.COIN_100, coin_100_qty
-        )
-        self._products: list[ProductEntity] = products
+        self._persisted_state = state
+        self._coins: CoinsVector = coins
+        self._persisted_coins: CoinsVector = self._coins
+        # products are looked up by id and by slot code several times per request
+        self._products_by_id: dict[str, ProductEntity] = {product.id.value: product for product in products}
+        self._products_by_code: dict[str, ProductEntity] = {product.code: product for product in products}
+        # bumped by every write of the machine row, a write made from an older version is refused
+        self._version: int = version
 
     @classmethod
     def create(
@@ -79,68 +50,62 @@ class MachineEntity:
         id: str,
         owner: OwnerEntity,
         state: MachineState,
-        coin_01_qty: int,
-        coin_05_qty: int,
-        coin_10_qty: int,
-        coin_25_qty: int,
-        coin_50_qty: int,
-        coin_100_qty: int,
+        coins: CoinsVector,
         products: list[ProductEntity],
+        version: int = 0,
     ) -> Self:
         instance = super().__new__(cls)
-        instance.__init__(
-            id,
-            owner,
-            state,
-            coin_01_qty,
-            coin_05_qty,
-            coin_10_qty,
-            coin_25_qty,
-            coin_50_qty,
-            coin_100_qty,
-            products,
-        )
+        instance.__init__(id, owner, state, coins, products, version)
         return instance
 
     @property
     def id(self) -> UUIDValueObject:
         return self._id
 
+    @property
+    def version(self) -> int:
+        return self._version
+
     @property
     def state(self) -> MachineState:
         return self._state
 
     @property
-    def coin_01(self) -> CoinsValueObject:
-        return self._coin_01
+    def coins(self) -> CoinsVector:
+        return self._coins
 
     @property
-    def coin_05(self) -> CoinsValueObject:
-        return self._coin_05
+    def owner(self) -> OwnerEntity:
+        return self._owner
 
     @property
-    def coin_10(self) -> CoinsValueObject:
-        return self._coin_10
+    def products(self) -> list[ProductEntity]:
+        return list(self._products_by_id.values())
 
     @property
-    def coin_25(self) -> CoinsValueObject:
-        return self._coin_25
+    def state_changed(self) -> bool:
+        return self._state != self._persisted_state
 
     @property
-    def coin_50(self) -> CoinsValueObject:
-        return self._coin_50
+    def changed_coins(self) -> list[CoinTypes]:
+        return [coin for coin, qty in self._coins.items() if qty != self._persisted_coins[coin]]
 
     @property
-    def coin_100(self) -> CoinsValueObject:
-        return self._coin_100
+    def coins_change(self) -> tuple[int, ...]:
+        # coins added are positive and coins handed out negative, in the order `CoinTypes` declares them
+        return tuple(qty - persisted_qty for qty, persisted_qty in zip(self._coins, self._persisted_coins))
 
     @property
-    def owner(self) -> OwnerEntity:
-        return self._owner
+    def changed_products(self) -> list[ProductEntity]:
+        return [product for product in self._products_by_id.values() if product.changed]
 
-    @property
-    def products(self) -> list[ProductEntity]:
-        return self._products
+    def mark_as_persisted(self, version: Optional[int] = None) -> None:
+        if version is not None:
+            self._version = version
+        self._persisted_state = self._state
+        self._persisted_coins = self._coins
+        for product in self._products_by_id.values():
+            product.mark_as_persisted()
 
     def finish_dispense_product(self) -> None:
         self._state = MachineState.READY
@@ -148,156 +113,34 @@ class MachineEntity:
     def start_dispense_product(self) -> None:
         self._state = MachineState.DISPENSING
 
-    def get_amount_out_of_coins(
-        self,
-        coin_01_qty: int,
-        coin_05_qty: int,
-        coin_10_qty: int,
-        coin_25_qty: int,
-        coin_50_qty: int,
-        coin_100_qty: int,
-    ) -> int:
-        amount: int = 0
+    def get_amount_out_of_coins(self, coins: CoinsVector) -> int:
+        return coins.amount
 
-        while coin_01_qty > 0:
-            amount += 1
-            coin_01_qty -= 1
+    def get_coins_from_change(self, change: int) -> CoinsChange:
+        coins: dict[CoinTypes, int] | None = solve_change(change, self._coins.to_dict())
 
-        while coin_05_qty > 0:
-            amount += 5
-            coin_05_qty -= 1
+        if coins is None:
+            raise NoChangeAvailableException()
 
-        while coin_10_qty > 0:
-            amount += 10
-            coin_10_qty -= 1
+        # the inventory is only touched once a full set of coins was found
+        change_coins: CoinsChange = CoinsVector.from_mapping(coins)
+        self._coins = self._coins - change_coins
 
-        while coin_25_qty > 0:
-            amount += 25
-            coin_25_qty -= 1
+        return change_coins
 
-        while coin_50_qty > 0:
-            amount += 50
-            coin_50_qty -= 1
+    def add_coins(self, coins: CoinsVector) -> None:
+        self._coins = self._coins + coins
 
-        while coin_100_qty > 0:
-            amount += 100
-            coin_100_qty -= 1
+    def subtract_coins(self, coins: CoinsVector) -> None:
+        self._coins = self._coins - coins
 
-        return amount
+    def find_product_by_id(self, product_id: str) -> Optional[ProductEntity]:
+        return self._products_by_id.get(product_id)
 
-    def get_coins_from_change(self, change: int) -> CoinsChange:
-        coin_100: int = 0
-        while self._coin_100.qty > 0 and self._coin_100.value <= change:
-            self._coin_100.reduce_qty()
-            change -= self._coin_100.value
-            coin_100 += 1
-
-        coin_50: int = 0
-        while self._coin_50.qty > 0 and self._coin_50.value <= change:
-            self._coin_50.reduce_qty()
-            change -= self._coin_50.value
-            coin_50 += 1
-
-        coin_25: int = 0
-        while self._coin_25.qty > 0 and self._coin_25.value <= change:
-            self._coin_25.reduce_qty()
-            change -= self._coin_25.value
-            coin_25 += 1
-
-        coin_10: int = 0
-        while self._coin_10.qty > 0 and self._coin_10.value <= change:
-            self._coin_10.reduce_qty()
-            change -= self._coin_10.value
-            coin_10 += 1
-
-        coin_05: int = 0
-        while self._coin_05.qty > 0 and self._coin_05.value <= change:
-            self._coin_05.reduce_qty()
-            change -= self._coin_05.value
-            coin_05 += 1
-
-        coin_01: int = 0
-        while self._coin_01.qty > 0 and self._coin_01.value <= change:
-            self._coin_01.reduce_qty()
-            change -= self._coin_01.value
-            coin_01 += 1
-
-        if change != 0:
-            raise NoChangeAvailableException()
-
-        return CoinsChange(coin_01, coin_05, coin_10, coin_25, coin_50, coin_100)
-
-    def add_coins(
-        self,
-        coin_01_qty: int,
-        coin_05_qty: int,
-        coin_10_qty: int,
-        coin_25_qty: int,
-        coin_50_qty: int,
-        coin_100_qty: int,
-    ) -> None:
-        while coin_01_qty > 0:
-            self._coin_01.increase_qty()
-            coin_01_qty -= 1
-
-        while coin_05_qty > 0:
-            self._coin_05.increase_qty()
-            coin_05_qty -= 1
-
-        while coin_10_qty > 0:
-            self._coin_10.increase_qty()
-            coin_10_qty -= 1
-
-        while coin_25_qty > 0:
-            self._coin_25.increase_qty()
-            coin_25_qty -= 1
-
-        while coin_50_qty > 0:
-            self._coin_50.increase_qty()
-            coin_50_qty -= 1
-
-        while coin_100_qty > 0:
-            self._coin_100.increase_qty()
-            coin_100_qty -= 1
-
-    def subtract_coins(
-        self,
-        coin_01_qty: int,
-        coin_05_qty: int,
-        coin_10_qty: int,
-        coin_25_qty: int,
-        coin_50_qty: int,
-        coin_100_qty: int,
-    ) -> None:
-        while coin_01_qty > 0:
-            self._coin_01.reduce_qty()
-            coin_01_qty -= 1
-
-        while coin_05_qty > 0:
-            self._coin_05.reduce_qty()
-            coin_05_qty -= 1
-
-        while coin_10_qty > 0:
-            self._coin_10.reduce_qty()
-            coin_10_qty -= 1
-
-        while coin_25_qty > 0:
-            self._coin_25.reduce_qty()
-            coin_25_qty -= 1
-
-        while coin_50_qty > 0:
-            self._coin_50.reduce_qty()
-            coin_50_qty -= 1
-
-        while coin_100_qty > 0:
-            self._coin_100.reduce_qty()
-            coin_100_qty -= 1
+    def find_product_by_code(self, product_code: str) -> Optional[ProductEntity]:
+        return self._products_by_code.get(product_code)
 
     def deliver_product(self, product_id: UUIDValueObject) -> None:
-        product_found: ProductEntity = None
-
-        for product in self._products:
-            if product_id == product.id:
-                product_found = product
+        product_found: ProductEntity = self._products_by_id.get(product_id.value)
 
         product_found.reduce_qty()
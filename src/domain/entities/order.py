@@ -71,7 +71,8 @@ class OrderEntity:
         cls, id: str, machine_id: str, order_items: list[OrderItemEntity]
     ) -> Self:
         instance = super().__new__(cls)
-        timestamp: datetime = datetime.now()
+        # a time ordered id already names the partition of the order, both must agree
+        timestamp: datetime = UUIDValueObject.create(id).timestamp or datetime.now()
         created_at: datetime = timestamp
         updated_at: datetime = timestamp
         order_status: OrderStatus = OrderStatus.PENDING
@@ -49,7 +49,8 @@ class OrderItemEntity:
 
         price: int = product.unit_price * qty
 
-        created_at: datetime = datetime.now()
+        # like its order, a time ordered id carries the creation time instead of a separate clock read
+        created_at: datetime = UUIDValueObject.create(id).timestamp or datetime.now()
         instance.__init__(id, product, price, qty, created_at)
         return instance
 
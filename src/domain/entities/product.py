@@ -14,6 +14,7 @@ class ProductEntity:
         self._id: UUIDValueObject = UUIDValueObject.create(id)
         self._name: str = name
         self._qty: int = qty
+        self._persisted_qty: int = qty
         self._code: str = code
         self._unit_price: int = unit_price
 
@@ -47,10 +48,23 @@ class ProductEntity:
     def unit_price(self) -> int:
         return self._unit_price
 
-    def increase_qty(self) -> None:
-        self._qty += 1
+    @property
+    def changed(self) -> bool:
+        return self._qty != self._persisted_qty
+
+    @property
+    def qty_change(self) -> int:
+        return self._qty - self._persisted_qty
+
+    def mark_as_persisted(self) -> None:
+        self._persisted_qty = self._qty
+
+    def increase_qty(self, qty: int = 1) -> None:
+        if qty < 0:
+            raise InvalidProductsQtyException()
+        self._qty += qty
 
-    def reduce_qty(self) -> None:
-        if self._qty <= 0:
+    def reduce_qty(self, qty: int = 1) -> None:
+        if qty < 0 or qty > self._qty:
             raise InvalidProductsQtyException()
-        self._qty -= 1
+        self._qty -= qty
@@ -1,5 +1,4 @@
 from typing import Optional
-from datetime import datetime
 from abc import ABC, abstractmethod
 
 from src.domain.value_objects.uuid import UUIDValueObject
@@ -10,7 +9,7 @@ from src.domain.entities.order import OrderEntity
 class IOrderRepository(ABC):
     @abstractmethod
     async def find_by_id_and_machine_id(
-        self, id: UUIDValueObject, machine_id: UUIDValueObject, created_at: datetime
+        self, id: UUIDValueObject, machine_id: UUIDValueObject
     ) -> Optional[OrderEntity]:
         raise NotImplementedError
 
@@ -0,0 +1,109 @@
+import math
+
+from collections import deque
+
+from src.domain.value_objects.coins import CoinTypes
+
+# amounts up to this value are answered straight from the precomputed table when the inventory allows it
+TABLE_LIMIT: int = 500
+# amounts above this value are first brought down by whole blocks of coins, so the solver never works
+# on more than this many cents at once
+SOLVER_LIMIT: int = 2000
+
+_DENOMINATIONS: tuple[CoinTypes, ...] = tuple(sorted(CoinTypes, reverse=True))
+
+# every denomination divides a block, so a block of one denomination can always stand in for a block of another
+_BLOCK: int = math.lcm(*_DENOMINATIONS)
+
+
+def _build_table(limit: int) -> list[dict[CoinTypes, int]]:
+    best: list[int] = [0] + [limit + 1] * limit
+    last: list[CoinTypes] = [None] * (limit + 1)
+
+    for amount in range(1, limit + 1):
+        for coin in _DENOMINATIONS:
+            if coin <= amount and best[amount - coin] + 1 < best[amount]:
+                best[amount] = best[amount - coin] + 1
+                last[amount] = coin
+
+    table: list[dict[CoinTypes, int]] = []
+    for amount in range(limit + 1):
+        coins: dict[CoinTypes, int] = dict.fromkeys(_DENOMINATIONS, 0)
+        while amount > 0:
+            coins[last[amount]] += 1
+            amount -= last[amount]
+        table.append(coins)
+    return table
+
+
+# fewest coins for every small amount when there is no shortage of any coin
+_TABLE: list[dict[CoinTypes, int]] = _build_table(TABLE_LIMIT)
+
+
+def _solve_bounded(change: int, inventory: dict[CoinTypes, int]) -> dict[CoinTypes, int] | None:
+    unreachable: int = change + 1
+    best: list[int] = [0] + [unreachable] * change
+    # how many coins of each denomination were used to reach every amount
+    taken: list[list[int]] = []
+
+    for coin in _DENOMINATIONS:
+        limit: int = min(inventory[coin], change // coin)
+        next_best: list[int] = [unreachable] * (change + 1)
+        used: list[int] = [0] * (change + 1)
+
+        # best[r + i * coin] + (j - i) for i in a window of `limit + 1` steps, kept as a monotonic queue
+        for remainder in range(min(coin, change + 1)):
+            window: deque[tuple[int, int]] = deque()
+            for step, amount in enumerate(range(remainder, change + 1, coin)):
+                if best[amount] != unreachable:
+                    key: int = best[amount] - step
+                    while len(window) > 0 and window[-1][1] >= key:
+                        window.pop()
+                    window.append((step, key))
+                while len(window) > 0 and window[0][0] < step - limit:
+                    window.popleft()
+                if len(window) > 0:
+                    next_best[amount] = window[0][1] + step
+                    used[amount] = step - window[0][0]
+
+        best = next_best
+        taken.append(used)
+
+    if best[change] == unreachable:
+        return None
+
+    coins: dict[CoinTypes, int] = {}
+    for coin, used in reversed(list(zip(_DENOMINATIONS, taken))):
+        coins[coin] = used[change]
+        change -= used[change] * coin
+    return coins
+
+
+def solve_change(change: int, inventory: dict[CoinTypes, int]) -> dict[CoinTypes, int] | None:
+    """Function used to pick the fewest coins out of `inventory` adding up to `change`, None when it can not be paid"""
+    if change <= TABLE_LIMIT:
+        coins: dict[CoinTypes, int] = _TABLE[change]
+        if all(coins[coin] <= inventory[coin] for coin in _DENOMINATIONS):
+            return dict(coins)
+
+    remaining: dict[CoinTypes, int] = dict(inventory)
+    fixed: dict[CoinTypes, int] = dict.fromkeys(_DENOMINATIONS, 0)
+
+    # any way of paying the change is whole blocks plus less than a block's worth of each denomination,
+    # holding back that many coins of each keeps whatever could be paid payable once the blocks are taken
+    blocks: int = max(0, -(-(change - SOLVER_LIMIT) // _BLOCK))
+    for coin in _DENOMINATIONS:
+        per_block: int = _BLOCK // coin
+        qty: int = min(blocks, max(0, remaining[coin] - (per_block - 1)) // per_block)
+        fixed[coin] = qty * per_block
+        remaining[coin] -= qty * per_block
+        change -= qty * _BLOCK
+        blocks -= qty
+
+    if change > SOLVER_LIMIT:
+        return None
+
+    solved: dict[CoinTypes, int] | None = _solve_bounded(change, remaining)
+    if solved is None:
+        return None
+    return {coin: fixed[coin] + solved[coin] for coin in _DENOMINATIONS}
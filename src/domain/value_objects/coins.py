@@ -1,5 +1,6 @@
+from array import array
 from enum import IntEnum
-from typing import Self
+from typing import Iterator, Self
 
 from src.domain.exceptions.invalid_coins_qty import InvalidCoinsQtyException
 
@@ -13,13 +14,17 @@ class CoinTypes(IntEnum):
     COIN_100 = 100
 
 
-class CoinsValueObject:
+# one quantity per coin type, in the order `CoinTypes` declares them, so adding a
+# denomination only takes a new `CoinTypes` member
+class CoinsVector:
+    _INDEX: dict[CoinTypes, int] = {coin: index for index, coin in enumerate(CoinTypes)}
+    _VALUES: array = array("q", [coin.value for coin in CoinTypes])
+
     def __new__(cls, *args, **kwargs):
         raise Exception("Use the 'create' method to create an instance of this class.")
 
-    def __init__(self, value: CoinTypes, qty: int):
-        self._value = value
-        self._qty = qty
+    def __init__(self, quantities: array):
+        self._quantities = quantities
 
     @staticmethod
     def _validate(qty: int) -> None:
@@ -27,24 +32,56 @@ class CoinsValueObject:
             raise InvalidCoinsQtyException()
 
     @classmethod
-    def create(cls, value: CoinTypes, qty: int) -> Self:
-        CoinsValueObject._validate(qty)
+    def create(cls, *quantities: int) -> Self:
+        if len(quantities) != len(CoinTypes):
+            raise ValueError(f"expected {len(CoinTypes)} coin quantities, got {len(quantities)}")
+        for qty in quantities:
+            CoinsVector._validate(qty)
         instance = super().__new__(cls)
-        instance.__init__(value, qty)
+        instance.__init__(array("q", quantities))
         return instance
 
-    @property
-    def value(self) -> CoinTypes:
-        return self._value
+    @classmethod
+    def create_empty(cls) -> Self:
+        instance = super().__new__(cls)
+        instance.__init__(array("q", bytes(8 * len(CoinTypes))))
+        return instance
+
+    @classmethod
+    def from_mapping(cls, quantities: dict[CoinTypes, int]) -> Self:
+        return cls.create(*[quantities.get(coin, 0) for coin in CoinTypes])
 
     @property
-    def qty(self) -> int:
-        return self._qty
+    def amount(self) -> int:
+        return sum(qty * value for qty, value in zip(self._quantities, CoinsVector._VALUES))
+
+    def __getitem__(self, coin: CoinTypes) -> int:
+        return self._quantities[CoinsVector._INDEX[coin]]
 
-    def increase_qty(self) -> None:
-        self._qty += 1
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._quantities)
 
-    def reduce_qty(self) -> None:
-        if self._qty <= 0:
+    def __len__(self) -> int:
+        return len(self._quantities)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CoinsVector) and self._quantities == other._quantities
+
+    def __add__(self, other: Self) -> Self:
+        instance = super().__new__(CoinsVector)
+        instance.__init__(array("q", map(int.__add__, self._quantities, other._quantities)))
+        return instance
+
+    def __sub__(self, other: Self) -> Self:
+        quantities: array = array("q", map(int.__sub__, self._quantities, other._quantities))
+        if min(quantities) < 0:
             raise InvalidCoinsQtyException()
-        self._qty -= 1
+        instance = super().__new__(CoinsVector)
+        instance.__init__(quantities)
+        return instance
+
+    def items(self) -> Iterator[tuple[CoinTypes, int]]:
+        return zip(CoinTypes, self._quantities)
+
+    def to_dict(self) -> dict[CoinTypes, int]:
+        return dict(self.items())
@@ -1,9 +1,27 @@
+import os
+import time
 import uuid
 
-from typing import Self
+from datetime import datetime
+from typing import Optional, Self
 
 from src.domain.exceptions.invalid_uuid import InvalidUUIDException
 
+_TIME_ORDERED_VERSION: int = 7
+
+
+def _uuid7() -> uuid.UUID:
+    # 48 bits of unix time in milliseconds first, so ids created later sort after
+    # the earlier ones, followed by the version, the variant and 74 random bits
+    unix_ts_ms: int = time.time_ns() // 1_000_000
+    random_bits: int = int.from_bytes(os.urandom(10), "big")
+    value: int = (unix_ts_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= _TIME_ORDERED_VERSION << 76
+    value |= ((random_bits >> 62) & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= random_bits & 0x3FFF_FFFF_FFFF_FFFF
+    return uuid.UUID(int=value)
+
 
 class UUIDValueObject:
     def __new__(cls, *args, **kwargs):
@@ -17,7 +35,7 @@ class UUIDValueObject:
     @staticmethod
     def _validate(id: str) -> None:
         try:
-            uuid.UUID(id, version=4)
+            uuid.UUID(id)
             return True
         except ValueError:
             raise InvalidUUIDException(id)
@@ -30,14 +48,21 @@ class UUIDValueObject:
         return instance
 
     @classmethod
-    def create_new(cls) -> Self:
+    def create_new(cls, time_ordered: bool = False) -> Self:
         instance = super().__new__(cls)
-        instance.__init__(str(uuid.uuid4()))
+        instance.__init__(str(_uuid7() if time_ordered else uuid.uuid4()))
         return instance
 
     @property
     def value(self) -> str:
         return self._value
 
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        value: uuid.UUID = self.convert_value_to_UUID()
+        if value.version != _TIME_ORDERED_VERSION:
+            return None
+        return datetime.fromtimestamp((value.int >> 80) / 1000)
+
     def convert_value_to_UUID(self) -> uuid.UUID:
-        return uuid.UUID(self._value, version=4)
+        return uuid.UUID(self._value)
@@ -0,0 +1,109 @@
+import sys
+import time
+
+from collections import OrderedDict
+from typing import Any, Optional, Self
+
+
+def _estimate_size(value: Any) -> int:
+    size: int = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(_estimate_size(item) for item in value)
+    return size
+
+
+# Least recently used entries are evicted first once either the entry count or the estimated
+# memory goes above its bound, entries older than `ttl` seconds are never served.
+# Every invalidation bumps the generation and records it against its key, a value read before
+# its own key was invalidated is not stored after it while values of other keys still are.
+# Only the latest `max_entries` invalidations are remembered, the older ones raise a floor that
+# values read before it never go over
+class MachineCatalogCache:
+    _instance: Self = None
+
+    def __new__(cls, *args, **kwargs):
+        raise Exception("Use the 'get_instance' method to create an instance of this class.")
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._bytes: int = 0
+        self._generation: int = 0
+        self._invalidated_at: OrderedDict[str, int] = OrderedDict()
+        self._floor: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @classmethod
+    def get_instance(cls, ttl: float = 2.0, max_entries: int = 1024, max_bytes: int = 8 * 1024 * 1024) -> Self:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.__init__(ttl, max_entries, max_bytes)
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        cls._instance = None
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def size_in_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry: Optional[tuple[float, int, Any]] = self._entries.get(key)
+
+        if entry is None or time.monotonic() - entry[0] > self._ttl:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, key: str, value: Any, generation: int) -> None:
+        if self._invalidated_at.get(key, self._floor) > generation:
+            return
+
+        size: int = _estimate_size(value)
+
+        if size > self._max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (time.monotonic(), size, value)
+        self._bytes += size
+
+        while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, key: str) -> None:
+        self._generation += 1
+        self._invalidated_at[key] = self._generation
+        self._invalidated_at.move_to_end(key)
+        while len(self._invalidated_at) > self._max_entries:
+            self._floor = self._invalidated_at.popitem(last=False)[1]
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._floor = self._generation
+        self._invalidated_at.clear()
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key)[1]
@@ -0,0 +1,74 @@
+from typing import Any
+
+from src.services.contracts.database.base import IDatabaseTransaction
+
+
+# Defers the connection checkout and the BEGIN until the first query, so a request answered
+# without reaching the database never takes a connection from the pool
+class LazyTransaction(IDatabaseTransaction):
+    def __init__(self, decoratee: IDatabaseTransaction):
+        self._decoratee = decoratee
+        self._transaction_requested: bool = False
+        self._read_only_requested: bool = False
+        self._started: bool = False
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def _start(self) -> None:
+        if not self._started:
+            if self._read_only_requested:
+                await self._decoratee.open_read_only_transaction()
+            await self._decoratee.create_client()
+            self._started = True
+            if self._transaction_requested:
+                await self._decoratee.open_transaction()
+
+    async def query(self, input_data: Any) -> None:
+        await self._start()
+        await self._decoratee.query(input_data)
+
+    async def defer_query(self, input_data: Any) -> None:
+        await self._start()
+        await self._decoratee.defer_query(input_data)
+
+    async def fetchall(self) -> Any:
+        return await self._decoratee.fetchall()
+
+    async def create_client(self) -> None:
+        pass
+
+    async def open_transaction(self) -> None:
+        if self._started:
+            await self._decoratee.open_transaction()
+        else:
+            self._transaction_requested = True
+
+    async def open_read_only_transaction(self) -> None:
+        if self._started:
+            await self._decoratee.open_read_only_transaction()
+        else:
+            self._read_only_requested = True
+
+    async def commit(self) -> None:
+        if self._started:
+            await self._decoratee.commit()
+        self._transaction_requested = False
+
+    async def rollback(self) -> None:
+        if self._started:
+            await self._decoratee.rollback()
+        self._transaction_requested = False
+
+    async def release(self) -> None:
+        self._transaction_requested = False
+        self._read_only_requested = False
+        if self._started:
+            self._started = False
+            await self._decoratee.release()
+
+    async def close(self) -> None:
+        if self._started:
+            self._started = False
+            await self._decoratee.close()
@@ -0,0 +1,51 @@
+class Config:
+    def __init__(
+        self,
+        user: str,
+        password: str,
+        db: str,
+        host: str,
+        port: int,
+        min: int,
+        max: int,
+        connect_timeout: float = 30.0,
+        backoff_initial: float = 0.1,
+        backoff_max: float = 5.0,
+        acquire_timeout: float = 5.0,
+        max_waiting: int = 100,
+        replicas: list[tuple[str, int]] = None,
+        max_replica_lag: float = 1.0,
+        replica_check_interval: float = 1.0,
+    ):
+        self.user = user
+        self.password = password
+        self.db = db
+        self.host = host
+        self.port = port
+        self.min = min
+        self.max = max
+        self.connect_timeout = connect_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.acquire_timeout = acquire_timeout
+        self.max_waiting = max_waiting
+        # (host, port) of every read replica, they share the database and credentials of the primary
+        self.replicas = replicas or []
+        self.max_replica_lag = max_replica_lag
+        self.replica_check_interval = replica_check_interval
+
+    def for_replica(self, host: str, port: int) -> "Config":
+        return Config(
+            user=self.user,
+            password=self.password,
+            db=self.db,
+            host=host,
+            port=port,
+            min=self.min,
+            max=self.max,
+            connect_timeout=self.connect_timeout,
+            backoff_initial=self.backoff_initial,
+            backoff_max=self.backoff_max,
+            acquire_timeout=self.acquire_timeout,
+            max_waiting=self.max_waiting,
+        )
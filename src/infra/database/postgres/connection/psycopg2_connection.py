@@ -1,32 +1,196 @@
+import asyncio
+import math
+
 from typing import Self, Any
+from collections import deque
 
+import psycopg2
 from psycopg2 import pool
 
 from src.services.contracts.database.base import IDatabasePoolConnection
 
+from src.infra.database.postgres.connection.config import Config
+from src.infra.database.postgres.connection.replica_set import ReplicaSet, REPLICA_LAG_QUERY
+
+from src.infra.exceptions.database_connection_timeout import DatabaseConnectionTimeoutException
+from src.infra.exceptions.database_not_ready import DatabaseNotReadyException
+from src.infra.exceptions.database_acquire_timeout import DatabaseAcquireTimeoutException
+from src.infra.exceptions.database_pool_queue_full import DatabasePoolQueueFullException
+
 
-class Config:
+# ThreadedConnectionPool opens its minimum connections one after the other while holding its
+# lock, this one starts empty and adopts the connections that were opened concurrently.
+# Connections opened later by `acquire` are opened in a worker thread, so a server that does not
+# answer never blocks the event loop. When every connection is in use, `acquire` queues the caller
+# instead of failing right away, released connections are handed to the waiters in arrival order.
+# The pool is shared by every event loop of the process, so each waiter keeps the loop it waits on
+# and a connection released from another loop is handed over through that loop.
+# Connections run in autocommit, so BEGIN is only sent when a transaction is opened explicitly
+class Psycopg2ConnectionPool(pool.ThreadedConnectionPool):
     def __init__(
         self,
-        user: str,
-        password: str,
-        db: str,
-        host: str,
-        port: int,
-        min: int,
-        max: int,
+        minconn: int,
+        maxconn: int,
+        connections: list,
+        acquire_timeout: float,
+        max_waiting: int,
+        *args,
+        **kwargs,
     ):
-        self.user = user
-        self.password = password
-        self.db = db
-        self.host = host
-        self.port = port
-        self.min = min
-        self.max = max
+        super().__init__(0, maxconn, *args, **kwargs)
+        self.minconn = int(minconn)
+        self._pool.extend(connections)
+        self._acquire_timeout = acquire_timeout
+        self._max_waiting = max_waiting
+        self._waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._opening: int = 0
+        self._openers: set[asyncio.Task] = set()
+
+    def _connect(self, key: Any = None) -> Any:
+        conn = super()._connect(key)
+        conn.autocommit = True
+        return conn
+
+    def idle_count(self) -> int:
+        return len(self._pool)
+
+    def waiting_count(self) -> int:
+        return len(self._waiters)
+
+    async def _open(self) -> Any:
+        self._opening += 1
+        return await self._open_counted()
+
+    async def _open_counted(self) -> Any:
+        # the caller already counted this connection in `_opening`
+        try:
+            conn = await asyncio.to_thread(psycopg2.connect, *self._args, **self._kwargs)
+        finally:
+            self._opening -= 1
+
+        conn.autocommit = True
+        with self._lock:
+            if self.closed:
+                conn.close()
+                raise pool.PoolError("connection pool is closed")
+            key: int = self._getkey()
+            self._used[key] = conn
+            self._rused[id(conn)] = key
+        return conn
+
+    async def acquire(self) -> Any:
+        if self.closed:
+            raise pool.PoolError("connection pool is closed")
+
+        if len(self._waiters) == 0:
+            if len(self._pool) > 0:
+                return self.getconn()
+            if len(self._used) + self._opening < self.maxconn:
+                return await self._open()
+
+        if len(self._waiters) >= self._max_waiting:
+            raise DatabasePoolQueueFullException(self._acquire_timeout)
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        waiter: asyncio.Future = loop.create_future()
+        self._waiters.append((loop, waiter))
+
+        try:
+            return await asyncio.wait_for(waiter, self._acquire_timeout)
+        except BaseException as error:
+            if waiter.done() and not waiter.cancelled():
+                # the connection was handed over right when the wait gave up
+                self.release(waiter.result())
+            else:
+                try:
+                    self._waiters.remove((loop, waiter))
+                except ValueError:
+                    # already taken by a release, the connection it hands over comes back to the pool
+                    pass
+            if isinstance(error, TimeoutError):
+                raise DatabaseAcquireTimeoutException(self._acquire_timeout) from error
+            raise
+
+    def release(self, conn: Any) -> None:
+        self.putconn(conn)
+
+        while len(self._waiters) > 0:
+            loop, waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+
+            if len(self._pool) > 0:
+                conn = self.getconn()
+                hand_over, args = self._hand_over, (waiter, conn)
+            elif len(self._used) + self._opening < self.maxconn:
+                # a broken connection is closed instead of going back to the pool, its replacement is
+                # opened in a worker thread like the ones opened by `acquire`
+                self._opening += 1
+                hand_over, args = self._open_for, (loop, waiter)
+            else:
+                self._waiters.appendleft((loop, waiter))
+                return
+
+            if loop is _running_loop():
+                hand_over(*args)
+                return
+            try:
+                loop.call_soon_threadsafe(hand_over, *args)
+            except RuntimeError:
+                # the waiter's loop is closed, nobody is waiting there anymore
+                if hand_over == self._hand_over:
+                    self.putconn(conn)
+                else:
+                    self._opening -= 1
+                continue
+            return
+
+    def _hand_over(self, waiter: asyncio.Future, conn: Any) -> None:
+        if waiter.done():
+            # the waiter gave up before its loop ran the hand over
+            self.release(conn)
+        else:
+            waiter.set_result(conn)
+
+    def _open_for(self, loop: asyncio.AbstractEventLoop, waiter: asyncio.Future) -> None:
+        opener: asyncio.Task = loop.create_task(self._open_and_hand_over(waiter))
+        self._openers.add(opener)
+        opener.add_done_callback(self._openers.discard)
+
+    async def _open_and_hand_over(self, waiter: asyncio.Future) -> None:
+        try:
+            conn = await self._open_counted()
+        except Exception as error:
+            if not waiter.done():
+                waiter.set_exception(error)
+            return
+        self._hand_over(waiter, conn)
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _connect_timeout(config: Config) -> int:
+    # libpq only takes whole seconds and treats anything below 2 as 2
+    return max(2, math.ceil(config.connect_timeout))
+
+
+def _query_lag(conn: Any) -> Any:
+    with conn.cursor() as cursor:
+        cursor.execute(REPLICA_LAG_QUERY)
+        return cursor.fetchone()[0]
 
 
 class Psycopg2PoolConnection(IDatabasePoolConnection):
-    _pool: pool.ThreadedConnectionPool = None
+    _pool: Psycopg2ConnectionPool = None
+    _replicas: ReplicaSet = None
+    _replica_check_interval: float = 1.0
+    _lag_checks: dict[int, asyncio.Task] = {}
+    _ready: bool = False
     _instance: Self = None
 
     def __new__(cls, *args, **kwargs):
@@ -43,31 +207,136 @@ class Psycopg2PoolConnection(IDatabasePoolConnection):
     def reset_instance(cls) -> None:
         cls._instance = None
 
+    def _open_connection(self, config: Config) -> Any:
+        conn = psycopg2.connect(
+            user=config.user,
+            password=config.password,
+            host=config.host,
+            port=config.port,
+            database=config.db,
+            connect_timeout=_connect_timeout(config),
+        )
+        conn.autocommit = True
+        return conn
+
+    async def _open_connections(self, config: Config) -> list:
+        results: list = await asyncio.gather(
+            *[asyncio.to_thread(self._open_connection, config) for _ in range(config.min)],
+            return_exceptions=True,
+        )
+
+        connections: list = [result for result in results if not isinstance(result, BaseException)]
+
+        if len(connections) < len(results):
+            for connection in connections:
+                connection.close()
+            raise next(result for result in results if isinstance(result, BaseException))
+
+        return connections
+
+    def _make_pool(self, config: Config, connections: list) -> Psycopg2ConnectionPool:
+        return Psycopg2ConnectionPool(
+            config.min,
+            config.max,
+            connections,
+            config.acquire_timeout,
+            config.max_waiting,
+            user=config.user,
+            password=config.password,
+            host=config.host,
+            port=config.port,
+            database=config.db,
+            connect_timeout=_connect_timeout(config),
+        )
+
     async def connect(self, config: Config) -> Any:
         if Psycopg2PoolConnection._pool is None:
-            Psycopg2PoolConnection._pool = pool.ThreadedConnectionPool(
-                minconn=config.min,
-                maxconn=config.max,
-                user=config.user,
-                password=config.password,
-                host=config.host,
-                port=config.port,
-                database=config.db,
-            )
+            loop = asyncio.get_running_loop()
+            deadline: float = loop.time() + config.connect_timeout
+            backoff: float = config.backoff_initial
 
-            pool_client: Any = None
-
-            while pool_client is None:
+            while True:
                 try:
-                    pool_client = Psycopg2PoolConnection._pool.getconn()
-                except Exception as e:
-                    pool_client = None
+                    connections: list = await self._open_connections(config)
+                    break
+                except psycopg2.OperationalError:
+                    remaining: float = deadline - loop.time()
+                    if remaining <= 0:
+                        raise DatabaseConnectionTimeoutException(config.connect_timeout)
+                    await asyncio.sleep(min(backoff, remaining))
+                    backoff = min(backoff * 2, config.backoff_max)
 
-            Psycopg2PoolConnection._pool.putconn(pool_client)
+            Psycopg2PoolConnection._pool = self._make_pool(config, connections)
+            # replica pools open their connections on demand, the first lag check opens one
+            Psycopg2PoolConnection._replicas = ReplicaSet(
+                [self._make_pool(config.for_replica(host, port), []) for host, port in config.replicas],
+                config.max_replica_lag,
+            )
+            Psycopg2PoolConnection._replica_check_interval = config.replica_check_interval
+            Psycopg2PoolConnection._ready = True
 
     async def disconnect(self) -> None:
+        Psycopg2PoolConnection._ready = False
+        for lag_check in Psycopg2PoolConnection._lag_checks.values():
+            lag_check.cancel()
+        Psycopg2PoolConnection._lag_checks = {}
         Psycopg2PoolConnection._pool.closeall()
         Psycopg2PoolConnection._pool = None
+        for replica_pool in Psycopg2PoolConnection._replicas.pools:
+            replica_pool.closeall()
+        Psycopg2PoolConnection._replicas = None
+
+    async def get_pool(self) -> Psycopg2ConnectionPool:
+        if not Psycopg2PoolConnection._ready:
+            raise DatabaseNotReadyException()
+        return Psycopg2PoolConnection._pool
 
-    async def get_pool(self) -> pool.ThreadedConnectionPool:
+    async def get_read_pool(self) -> Psycopg2ConnectionPool:
+        if not Psycopg2PoolConnection._ready:
+            raise DatabaseNotReadyException()
+        if Psycopg2PoolConnection._replicas is not None:
+            replica_pool: Psycopg2ConnectionPool = Psycopg2PoolConnection._replicas.pick()
+            if replica_pool is not None:
+                return replica_pool
         return Psycopg2PoolConnection._pool
+
+    async def _query_lag(self, replica_pool: Psycopg2ConnectionPool) -> Any:
+        try:
+            conn = await replica_pool.acquire()
+        except (psycopg2.Error, pool.PoolError, DatabaseAcquireTimeoutException, DatabasePoolQueueFullException):
+            return None
+
+        try:
+            return await asyncio.to_thread(_query_lag, conn)
+        except psycopg2.Error:
+            return None
+        finally:
+            if not replica_pool.closed:
+                replica_pool.release(conn)
+
+    async def _measure_lag(self, replica_pool: Psycopg2ConnectionPool) -> Any:
+        # a replica that does not answer within a check interval stops taking reads, its check keeps
+        # running in the background and no other one is started on it until that one is over
+        lag_check: asyncio.Task = Psycopg2PoolConnection._lag_checks.get(id(replica_pool))
+        if lag_check is None or lag_check.done():
+            lag_check = asyncio.create_task(self._query_lag(replica_pool))
+            Psycopg2PoolConnection._lag_checks[id(replica_pool)] = lag_check
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(lag_check), Psycopg2PoolConnection._replica_check_interval)
+        except TimeoutError:
+            return None
+
+    async def check_replicas(self) -> None:
+        replicas: ReplicaSet = Psycopg2PoolConnection._replicas
+        for index, replica_pool in enumerate(replicas.pools):
+            replicas.record_lag(index, await self._measure_lag(replica_pool))
+
+    async def watch_replicas(self) -> None:
+        while True:
+            if Psycopg2PoolConnection._replicas is not None:
+                await self.check_replicas()
+            await asyncio.sleep(Psycopg2PoolConnection._replica_check_interval)
+
+    def is_ready(self) -> bool:
+        return Psycopg2PoolConnection._ready
@@ -0,0 +1,133 @@
+import asyncio
+import math
+
+from typing import Self, Any
+
+import psycopg
+
+from psycopg import AsyncConnection
+from psycopg.conninfo import make_conninfo
+from psycopg.types.string import TextLoader
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+from src.services.contracts.database.base import IDatabasePoolConnection
+
+from src.infra.database.postgres.connection.config import Config
+from src.infra.database.postgres.connection.replica_set import ReplicaSet, REPLICA_LAG_QUERY
+
+from src.infra.exceptions.database_connection_timeout import DatabaseConnectionTimeoutException
+from src.infra.exceptions.database_not_ready import DatabaseNotReadyException
+
+
+async def _configure(conn: AsyncConnection) -> None:
+    # repositories expect ids as strings, just like psycopg2 returns them
+    conn.adapters.register_loader("uuid", TextLoader)
+
+
+class Psycopg3PoolConnection(IDatabasePoolConnection):
+    _pool: AsyncConnectionPool = None
+    _replicas: ReplicaSet = None
+    _replica_check_interval: float = 1.0
+    _ready: bool = False
+    _instance: Self = None
+
+    def __new__(cls, *args, **kwargs):
+        raise Exception("Use the 'get_instance' method to create an instance of this class.")
+
+    @classmethod
+    def get_instance(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.__init__()
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        cls._instance = None
+
+    def _make_pool(self, config: Config) -> AsyncConnectionPool:
+        return AsyncConnectionPool(
+            conninfo=make_conninfo(
+                user=config.user,
+                password=config.password,
+                host=config.host,
+                port=config.port,
+                dbname=config.db,
+                connect_timeout=max(2, math.ceil(config.connect_timeout)),
+            ),
+            min_size=config.min,
+            max_size=config.max,
+            kwargs={"autocommit": True},
+            configure=_configure,
+            reconnect_timeout=config.connect_timeout,
+            timeout=config.acquire_timeout,
+            max_waiting=config.max_waiting,
+            open=False,
+        )
+
+    async def connect(self, config: Config) -> Any:
+        if Psycopg3PoolConnection._pool is None:
+            Psycopg3PoolConnection._pool = self._make_pool(config)
+
+            # the pool opens its minimum connections with its own workers and retries them with backoff
+            try:
+                await Psycopg3PoolConnection._pool.open(wait=True, timeout=config.connect_timeout)
+            except PoolTimeout:
+                await Psycopg3PoolConnection._pool.close()
+                Psycopg3PoolConnection._pool = None
+                raise DatabaseConnectionTimeoutException(config.connect_timeout)
+
+            # replica pools keep opening their connections in the background, a replica that is down
+            # only fails its lag checks
+            replica_pools: list[AsyncConnectionPool] = [
+                self._make_pool(config.for_replica(host, port)) for host, port in config.replicas
+            ]
+            for replica_pool in replica_pools:
+                await replica_pool.open(wait=False)
+            Psycopg3PoolConnection._replicas = ReplicaSet(replica_pools, config.max_replica_lag)
+            Psycopg3PoolConnection._replica_check_interval = config.replica_check_interval
+            Psycopg3PoolConnection._ready = True
+
+    async def disconnect(self) -> None:
+        Psycopg3PoolConnection._ready = False
+        await Psycopg3PoolConnection._pool.close()
+        Psycopg3PoolConnection._pool = None
+        for replica_pool in Psycopg3PoolConnection._replicas.pools:
+            await replica_pool.close()
+        Psycopg3PoolConnection._replicas = None
+
+    async def get_pool(self) -> AsyncConnectionPool:
+        if not Psycopg3PoolConnection._ready:
+            raise DatabaseNotReadyException()
+        return Psycopg3PoolConnection._pool
+
+    async def get_read_pool(self) -> AsyncConnectionPool:
+        if not Psycopg3PoolConnection._ready:
+            raise DatabaseNotReadyException()
+        if Psycopg3PoolConnection._replicas is not None:
+            replica_pool: AsyncConnectionPool = Psycopg3PoolConnection._replicas.pick()
+            if replica_pool is not None:
+                return replica_pool
+        return Psycopg3PoolConnection._pool
+
+    async def _measure_lag(self, replica_pool: AsyncConnectionPool) -> Any:
+        try:
+            async with replica_pool.connection(timeout=Psycopg3PoolConnection._replica_check_interval) as conn:
+                cursor = await conn.execute(REPLICA_LAG_QUERY)
+                return (await cursor.fetchone())[0]
+        except psycopg.Error:
+            return None
+
+    async def check_replicas(self) -> None:
+        replicas: ReplicaSet = Psycopg3PoolConnection._replicas
+        for index, replica_pool in enumerate(replicas.pools):
+            replicas.record_lag(index, await self._measure_lag(replica_pool))
+
+    async def watch_replicas(self) -> None:
+        while True:
+            if Psycopg3PoolConnection._replicas is not None:
+                await self.check_replicas()
+            await asyncio.sleep(Psycopg3PoolConnection._replica_check_interval)
+
+    def is_ready(self) -> bool:
+        return Psycopg3PoolConnection._ready
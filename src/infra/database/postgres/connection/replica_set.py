@@ -0,0 +1,38 @@
+import math
+
+from typing import Any
+
+# seconds the replica is behind the primary, a server that is not replaying WAL is never behind
+REPLICA_LAG_QUERY: str = (
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END AS lag"
+)
+
+
+# Read replica pools handed out in turns, a replica only takes reads once its lag was measured
+# and stays out while it is further behind than `max_lag` seconds or could not be reached
+class ReplicaSet:
+    def __init__(self, pools: list[Any], max_lag: float):
+        self._pools = pools
+        self._max_lag = max_lag
+        self._lags: list[float] = [math.inf] * len(pools)
+        self._next: int = 0
+
+    @property
+    def pools(self) -> list[Any]:
+        return self._pools
+
+    @property
+    def lags(self) -> list[float]:
+        return list(self._lags)
+
+    def record_lag(self, index: int, lag: Any) -> None:
+        self._lags[index] = math.inf if lag is None else float(lag)
+
+    def pick(self) -> Any:
+        for _ in range(len(self._pools)):
+            index: int = self._next
+            self._next = (self._next + 1) % len(self._pools)
+            if self._lags[index] <= self._max_lag:
+                return self._pools[index]
+        return None
@@ -0,0 +1,95 @@
+from typing import Self
+
+_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.bucket_counts: list[int] = [0] * len(_BUCKETS)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(_BUCKETS):
+            if value <= bound:
+                self.bucket_counts[index] += 1
+
+    def render(self) -> list[str]:
+        lines: list[str] = ["# HELP " + self.name + " " + self.help, "# TYPE " + self.name + " histogram"]
+        for bound, bucket_count in zip(_BUCKETS, self.bucket_counts):
+            lines.append(self.name + '_bucket{le="' + str(bound) + '"} ' + str(bucket_count))
+        lines.append(self.name + '_bucket{le="+Inf"} ' + str(self.count))
+        lines.append(self.name + "_sum " + repr(self.sum))
+        lines.append(self.name + "_count " + str(self.count))
+        return lines
+
+
+class PoolMetrics:
+    _instance: Self = None
+
+    def __new__(cls, *args, **kwargs):
+        raise Exception("Use the 'get_instance' method to create an instance of this class.")
+
+    def __init__(self):
+        self.checkout_wait = Histogram(
+            "db_pool_checkout_wait_seconds", "Time spent waiting for a connection from the pool"
+        )
+        self.hold = Histogram("db_pool_hold_seconds", "Time a connection stays checked out of the pool")
+        self.checkouts: int = 0
+        self.exhaustions: int = 0
+        self.in_use: int = 0
+        self.idle: int = 0
+        self.max: int = 0
+
+    @classmethod
+    def get_instance(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.__init__()
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        cls._instance = None
+
+    def record_checkout(self, wait: float, idle: int, max: int) -> None:
+        self.checkout_wait.observe(wait)
+        self.checkouts += 1
+        self.in_use += 1
+        self.idle = idle
+        self.max = max
+
+    def record_release(self, hold: float, idle: int) -> None:
+        self.hold.observe(hold)
+        self.in_use -= 1
+        self.idle = idle
+
+    def record_exhaustion(self, wait: float) -> None:
+        self.checkout_wait.observe(wait)
+        self.exhaustions += 1
+
+    def render(self) -> str:
+        lines: list[str] = [
+            "# HELP db_pool_connections_in_use Connections currently checked out of the pool",
+            "# TYPE db_pool_connections_in_use gauge",
+            "db_pool_connections_in_use " + str(self.in_use),
+            "# HELP db_pool_connections_idle Connections open and waiting in the pool",
+            "# TYPE db_pool_connections_idle gauge",
+            "db_pool_connections_idle " + str(self.idle),
+            "# HELP db_pool_connections_max Maximum connections the pool may open",
+            "# TYPE db_pool_connections_max gauge",
+            "db_pool_connections_max " + str(self.max),
+            "# HELP db_pool_checkouts_total Connections handed out by the pool",
+            "# TYPE db_pool_checkouts_total counter",
+            "db_pool_checkouts_total " + str(self.checkouts),
+            "# HELP db_pool_exhaustions_total Checkouts that failed because every connection was in use",
+            "# TYPE db_pool_exhaustions_total counter",
+            "db_pool_exhaustions_total " + str(self.exhaustions),
+        ]
+        lines.extend(self.checkout_wait.render())
+        lines.extend(self.hold.render())
+        return "\n".join(lines) + "\n"
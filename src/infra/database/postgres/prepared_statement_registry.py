@@ -0,0 +1,71 @@
+import re
+
+from typing import Any, Self
+from weakref import WeakKeyDictionary
+
+_PLACEHOLDER = re.compile(r"%([s%])")
+
+
+def _to_positional(text: str) -> str:
+    position: int = 0
+
+    def replace(match: re.Match) -> str:
+        nonlocal position
+        if match.group(1) == "%":
+            return "%"
+        position += 1
+        return "$" + str(position)
+
+    return _PLACEHOLDER.sub(replace, text)
+
+
+class Psycopg2PreparedStatementRegistry:
+    _instance: Self = None
+
+    def __new__(cls, *args, **kwargs):
+        raise Exception("Use the 'get_instance' method to create an instance of this class.")
+
+    def __init__(self):
+        self._statements: dict[str, str] = {}
+        self._prepared: WeakKeyDictionary[Any, set[str]] = WeakKeyDictionary()
+
+    @classmethod
+    def get_instance(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.__init__()
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        cls._instance = None
+
+    def register(self, name: str, text: str) -> None:
+        registered_text: str = self._statements.get(name)
+        if registered_text is None:
+            self._statements[name] = text
+        elif registered_text != text:
+            raise Exception('prepared statement - "' + name + '" - is already registered with another query')
+
+    def is_prepared(self, conn: Any, name: str) -> bool:
+        return name in self._prepared.get(conn, ())
+
+    def prepare(self, conn: Any, cursor: Any, name: str, text: str) -> None:
+        self.register(name, text)
+
+        if not self.is_prepared(conn, name):
+            cursor.execute("PREPARE " + name + " AS " + _to_positional(text))
+            self._prepared.setdefault(conn, set()).add(name)
+
+    def execute_text(self, name: str, values: Any) -> str:
+        if values is None or len(values) == 0:
+            return "EXECUTE " + name
+        return "EXECUTE " + name + " (" + ", ".join(["%s"] * len(values)) + ")"
+
+    def execute(self, conn: Any, cursor: Any, name: str, text: str, values: Any) -> None:
+        self.prepare(conn, cursor, name, text)
+
+        if values is None or len(values) == 0:
+            cursor.execute(self.execute_text(name, values))
+        else:
+            cursor.execute(self.execute_text(name, values), values)
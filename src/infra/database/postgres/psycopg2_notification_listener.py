@@ -0,0 +1,84 @@
+import asyncio
+
+from typing import Callable
+
+import psycopg2
+
+from src.infra.database.postgres.connection.config import Config
+
+
+# Keeps one connection outside of the pool listening on `channel`, every payload received is
+# handed to `on_notify`. Notifications sent while the connection is down are lost, so
+# `on_reconnect` runs each time listening starts again
+class Psycopg2NotificationListener:
+    def __init__(
+        self,
+        config: Config,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_reconnect: Callable[[], None],
+    ):
+        self._config = config
+        self._channel = channel
+        self._on_notify = on_notify
+        self._on_reconnect = on_reconnect
+        self._conn = None
+
+    def _connect(self):
+        conn = psycopg2.connect(
+            user=self._config.user,
+            password=self._config.password,
+            host=self._config.host,
+            port=self._config.port,
+            database=self._config.db,
+            # a connection dropped without the server noticing would otherwise never become readable
+            keepalives=1,
+            keepalives_idle=30,
+            keepalives_interval=10,
+            keepalives_count=3,
+        )
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute("LISTEN " + self._channel)
+        return conn
+
+    def _drain(self, lost: asyncio.Future) -> None:
+        try:
+            self._conn.poll()
+        except psycopg2.Error as error:
+            if not lost.done():
+                lost.set_exception(error)
+            return
+
+        while len(self._conn.notifies) > 0:
+            self._on_notify(self._conn.notifies.pop(0).payload)
+
+    async def listen(self) -> None:
+        loop = asyncio.get_running_loop()
+        backoff: float = self._config.backoff_initial
+
+        while True:
+            try:
+                self._conn = await asyncio.to_thread(self._connect)
+            except psycopg2.OperationalError:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self._config.backoff_max)
+                continue
+
+            backoff = self._config.backoff_initial
+            self._on_reconnect()
+
+            # the descriptor can not be asked again once the connection is closed
+            fileno: int = self._conn.fileno()
+            lost: asyncio.Future = loop.create_future()
+            loop.add_reader(fileno, self._drain, lost)
+
+            try:
+                await lost
+            except psycopg2.Error:
+                # the server went away, listening starts over with a new connection
+                pass
+            finally:
+                loop.remove_reader(fileno)
+                self._conn.close()
+                self._conn = None
@@ -1,7 +1,7 @@
 import json
+import time
 
-from typing import Any, TypedDict
-from psycopg2 import pool as psycopg2_pool
+from typing import Any
 from psycopg2.extras import RealDictCursor
 
 from src.services.contracts.database.base import (
@@ -9,42 +9,122 @@ from src.services.contracts.database.base import (
     IDatabasePoolConnection,
 )
 
+from src.infra.database.postgres.statements import QueryInput, BEGIN, COMMIT
+from src.infra.database.postgres.prepared_statement_registry import Psycopg2PreparedStatementRegistry
+from src.infra.database.postgres.pool_metrics import PoolMetrics
+from src.infra.database.postgres.connection.psycopg2_connection import Psycopg2ConnectionPool
 
-class QueryInput(TypedDict):
-    text: str
-    values: Any
+from src.infra.exceptions.database_acquire_timeout import DatabaseAcquireTimeoutException
+from src.infra.exceptions.database_pool_queue_full import DatabasePoolQueueFullException
 
 
 class Psycopg2Transaction(IDatabaseTransaction):
     def __init__(self, db_pool_conn: IDatabasePoolConnection):
         self._db_pool_conn = db_pool_conn
-        self._pool: psycopg2_pool.ThreadedConnectionPool = None
+        self._pool: Psycopg2ConnectionPool = None
         self._conn = None
         self._cursor = None
+        self._checked_out_at: float = None
+        self._read_only: bool = False
+        self._in_transaction: bool = False
+        # statements held back until the next query or the commit, starting with BEGIN
+        self._pending: list[QueryInput] = []
 
     async def create_client(self) -> None:
-        self._pool: psycopg2_pool.ThreadedConnectionPool = await self._db_pool_conn.get_pool()
-        self._conn = self._pool.getconn()
+        if self._read_only:
+            self._pool: Psycopg2ConnectionPool = await self._db_pool_conn.get_read_pool()
+        else:
+            self._pool: Psycopg2ConnectionPool = await self._db_pool_conn.get_pool()
+        started_at: float = time.perf_counter()
+        try:
+            self._conn = await self._pool.acquire()
+        except (DatabaseAcquireTimeoutException, DatabasePoolQueueFullException):
+            PoolMetrics.get_instance().record_exhaustion(time.perf_counter() - started_at)
+            raise
+        self._checked_out_at = time.perf_counter()
+        PoolMetrics.get_instance().record_checkout(
+            self._checked_out_at - started_at, self._pool.idle_count(), self._pool.maxconn
+        )
         self._cursor = self._conn.cursor(cursor_factory=RealDictCursor)
 
     async def open_transaction(self) -> None:
-        self._cursor.execute("BEGIN")
+        self._in_transaction = True
+        self._pending = [BEGIN]
+
+    async def open_read_only_transaction(self) -> None:
+        # pooled connections run in autocommit, without BEGIN every query is a transaction of its own.
+        # Before the client is taken, the next one comes from a read replica when one is caught up
+        self._read_only = True
 
     async def commit(self) -> None:
-        self._cursor.execute("COMMIT")
+        if self._read_only:
+            self._read_only = False
+            return
+        pending: list[QueryInput] = self._take_pending()
+        if pending == [BEGIN]:
+            # nothing ran inside the transaction
+            return
+        self._send([*pending, COMMIT])
+
+    def _take_pending(self) -> list[QueryInput]:
+        pending: list[QueryInput] = self._pending
+        self._in_transaction = False
+        self._pending = []
+        return pending
+
+    def _send(self, queries: list[QueryInput]) -> None:
+        # the statements go out as a single multi-statement query, only the first use of a
+        # named statement on this connection costs an extra PREPARE beforehand
+        registry = Psycopg2PreparedStatementRegistry.get_instance()
+        statements: list[bytes] = []
+        for input_data in queries:
+            if "name" in input_data:
+                registry.prepare(self._conn, self._cursor, input_data["name"], input_data["text"])
+                text: str = registry.execute_text(input_data["name"], input_data["values"])
+            else:
+                text: str = input_data["text"]
+            statements.append(self._cursor.mogrify(text, input_data["values"]))
+        self._cursor.execute(b";\n".join(statements))
+
+    async def defer_query(self, input_data: QueryInput) -> None:
+        if not self._in_transaction:
+            await self.query(input_data)
+            return
+        self._pending.append(input_data)
 
     async def query(self, input_data: QueryInput) -> None:
+        if len(self._pending) > 0:
+            pending: list[QueryInput] = self._pending
+            self._pending = []
+            self._send([*pending, input_data])
+            return
+        if "name" in input_data:
+            Psycopg2PreparedStatementRegistry.get_instance().execute(
+                self._conn, self._cursor, input_data["name"], input_data["text"], input_data["values"]
+            )
+            return
         self._cursor.execute(input_data["text"], input_data["values"])
 
     async def fetchall(self) -> Any:
         return self._cursor.fetchall()
 
     async def rollback(self) -> None:
+        if self._read_only:
+            self._read_only = False
+            return
+        pending: list[QueryInput] = self._take_pending()
+        if len(pending) > 0 and pending[0] is BEGIN:
+            # BEGIN never reached the server
+            return
         self._cursor.execute("ROLLBACK")
 
     async def release(self) -> None:
+        self._read_only = False
+        self._in_transaction = False
+        self._pending = []
         self._cursor.close()
-        self._pool.putconn(self._conn)
+        self._pool.release(self._conn)
+        PoolMetrics.get_instance().record_release(time.perf_counter() - self._checked_out_at, self._pool.idle_count())
 
     async def close(self) -> None:
         await self._db_pool_conn.disconnect()
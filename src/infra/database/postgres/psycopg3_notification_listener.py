@@ -0,0 +1,66 @@
+import asyncio
+
+from typing import Callable
+
+import psycopg
+
+from psycopg import AsyncConnection
+
+from src.infra.database.postgres.connection.config import Config
+
+
+# Keeps one connection outside of the pool listening on `channel`, every payload received is
+# handed to `on_notify`. Notifications sent while the connection is down are lost, so
+# `on_reconnect` runs each time listening starts again
+class Psycopg3NotificationListener:
+    def __init__(
+        self,
+        config: Config,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_reconnect: Callable[[], None],
+    ):
+        self._config = config
+        self._channel = channel
+        self._on_notify = on_notify
+        self._on_reconnect = on_reconnect
+
+    async def _connect(self) -> AsyncConnection:
+        conn: AsyncConnection = await AsyncConnection.connect(
+            user=self._config.user,
+            password=self._config.password,
+            host=self._config.host,
+            port=self._config.port,
+            dbname=self._config.db,
+            autocommit=True,
+            # a connection dropped without the server noticing would otherwise never become readable
+            keepalives=1,
+            keepalives_idle=30,
+            keepalives_interval=10,
+            keepalives_count=3,
+        )
+        await conn.execute("LISTEN " + self._channel)
+        return conn
+
+    async def listen(self) -> None:
+        backoff: float = self._config.backoff_initial
+
+        while True:
+            try:
+                conn: AsyncConnection = await self._connect()
+            except psycopg.OperationalError:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self._config.backoff_max)
+                continue
+
+            backoff = self._config.backoff_initial
+            self._on_reconnect()
+
+            try:
+                async for notify in conn.notifies():
+                    self._on_notify(notify.payload)
+            except psycopg.Error:
+                # the server went away, listening starts over with a new connection
+                pass
+            finally:
+                await conn.close()
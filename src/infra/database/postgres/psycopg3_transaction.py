@@ -0,0 +1,127 @@
+import time
+
+from typing import Any
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, PoolTimeout, TooManyRequests
+
+from src.services.contracts.database.base import (
+    IDatabaseTransaction,
+    IDatabasePoolConnection,
+)
+
+from src.infra.database.postgres.statements import QueryInput, BEGIN, COMMIT
+from src.infra.database.postgres.pool_metrics import PoolMetrics
+
+from src.infra.exceptions.database_acquire_timeout import DatabaseAcquireTimeoutException
+from src.infra.exceptions.database_pool_queue_full import DatabasePoolQueueFullException
+
+
+class Psycopg3Transaction(IDatabaseTransaction):
+    def __init__(self, db_pool_conn: IDatabasePoolConnection):
+        self._db_pool_conn = db_pool_conn
+        self._pool: AsyncConnectionPool = None
+        self._conn = None
+        self._cursor = None
+        self._checked_out_at: float = None
+        self._read_only: bool = False
+        self._in_transaction: bool = False
+        # statements held back until the next query or the commit, starting with BEGIN
+        self._pending: list[QueryInput] = []
+
+    async def create_client(self) -> None:
+        if self._read_only:
+            self._pool: AsyncConnectionPool = await self._db_pool_conn.get_read_pool()
+        else:
+            self._pool: AsyncConnectionPool = await self._db_pool_conn.get_pool()
+        started_at: float = time.perf_counter()
+        try:
+            self._conn = await self._pool.getconn()
+        except PoolTimeout as error:
+            PoolMetrics.get_instance().record_exhaustion(time.perf_counter() - started_at)
+            raise DatabaseAcquireTimeoutException(self._pool.timeout) from error
+        except TooManyRequests as error:
+            PoolMetrics.get_instance().record_exhaustion(time.perf_counter() - started_at)
+            raise DatabasePoolQueueFullException(self._pool.timeout) from error
+        self._checked_out_at = time.perf_counter()
+        PoolMetrics.get_instance().record_checkout(
+            self._checked_out_at - started_at, self._pool.get_stats()["pool_available"], self._pool.max_size
+        )
+        self._cursor = self._conn.cursor(row_factory=dict_row)
+
+    async def open_transaction(self) -> None:
+        self._in_transaction = True
+        self._pending = [BEGIN]
+
+    async def open_read_only_transaction(self) -> None:
+        # pooled connections run in autocommit, without BEGIN every query is a transaction of its own.
+        # Before the client is taken, the next one comes from a read replica when one is caught up
+        self._read_only = True
+
+    async def commit(self) -> None:
+        if self._read_only:
+            self._read_only = False
+            return
+        pending: list[QueryInput] = self._take_pending()
+        if pending == [BEGIN]:
+            # nothing ran inside the transaction
+            return
+        await self._send([*pending, COMMIT])
+
+    def _take_pending(self) -> list[QueryInput]:
+        pending: list[QueryInput] = self._pending
+        self._in_transaction = False
+        self._pending = []
+        return pending
+
+    async def _execute(self, input_data: QueryInput) -> None:
+        # psycopg keeps its own prepared statement cache per connection, named statements are
+        # prepared on their first execution instead of waiting for the automatic threshold
+        prepare: bool = True if "name" in input_data else None
+        await self._cursor.execute(input_data["text"], input_data["values"], prepare=prepare)
+
+    async def _send(self, queries: list[QueryInput]) -> None:
+        # in pipeline mode every statement is sent before waiting for the results, the cursor
+        # keeps the rows of the last one
+        async with self._conn.pipeline():
+            for input_data in queries:
+                await self._execute(input_data)
+
+    async def defer_query(self, input_data: QueryInput) -> None:
+        if not self._in_transaction:
+            await self.query(input_data)
+            return
+        self._pending.append(input_data)
+
+    async def query(self, input_data: QueryInput) -> None:
+        if len(self._pending) > 0:
+            pending: list[QueryInput] = self._pending
+            self._pending = []
+            await self._send([*pending, input_data])
+            return
+        await self._execute(input_data)
+
+    async def fetchall(self) -> Any:
+        return await self._cursor.fetchall()
+
+    async def rollback(self) -> None:
+        if self._read_only:
+            self._read_only = False
+            return
+        pending: list[QueryInput] = self._take_pending()
+        if len(pending) > 0 and pending[0] is BEGIN:
+            # BEGIN never reached the server
+            return
+        await self._cursor.execute("ROLLBACK")
+
+    async def release(self) -> None:
+        self._read_only = False
+        self._in_transaction = False
+        self._pending = []
+        await self._cursor.close()
+        await self._pool.putconn(self._conn)
+        PoolMetrics.get_instance().record_release(
+            time.perf_counter() - self._checked_out_at, self._pool.get_stats()["pool_available"]
+        )
+
+    async def close(self) -> None:
+        await self._db_pool_conn.disconnect()
@@ -70,6 +70,28 @@ class OpenTransactionResponseWithFailureObject(IOpenTransactionResponseObject):
         raise self.__response
 
 
+class IOpenReadOnlyTransactionResponseObject(ABC):
+    @abstractmethod
+    def execute(self):
+        pass
+
+
+class OpenReadOnlyTransactionResponseWithSuccessObject(IOpenReadOnlyTransactionResponseObject):
+    def __init__(self, response):
+        self.__response = response
+
+    def execute(self):
+        return self.__response
+
+
+class OpenReadOnlyTransactionResponseWithFailureObject(IOpenReadOnlyTransactionResponseObject):
+    def __init__(self, exception: Exception):
+        self.__response = exception
+
+    def execute(self):
+        raise self.__response
+
+
 class IReleaseResponseObject(ABC):
     @abstractmethod
     def execute(self):
@@ -191,6 +213,7 @@ class SpyTransaction(IDatabaseTransaction):
         commit_response_list: list[ICommitResponseObject],
         rollback_response_list: list[IRollbackResponseObject],
         close_response_list: list[ICloseResponseObject],
+        open_read_only_transaction_response_list: list[IOpenReadOnlyTransactionResponseObject] = None,
     ):
         self._query_response_list = query_response_list
         self._fetchall_response_list = fetchall_response_list
@@ -200,6 +223,7 @@ class SpyTransaction(IDatabaseTransaction):
         self._commit_response_list = commit_response_list
         self._rollback_response_list = rollback_response_list
         self._close_response_list = close_response_list
+        self._open_read_only_transaction_response_list = open_read_only_transaction_response_list or []
         self.query_counter = 0
         self.fetchall_counter = 0
         self.open_transaction_counter = 0
@@ -208,6 +232,7 @@ class SpyTransaction(IDatabaseTransaction):
         self.commit_counter = 0
         self.rollback_counter = 0
         self.close_counter = 0
+        self.open_read_only_transaction_counter = 0
 
     async def query(self, input_data: Any) -> None:
         aux_counter = self.query_counter
@@ -215,6 +240,10 @@ class SpyTransaction(IDatabaseTransaction):
         response = self._query_response_list[aux_counter].execute(input_data)
         return response
 
+    async def defer_query(self, input_data: Any) -> None:
+        # a held back statement is still a query, it shares the query responses and counter
+        return await self.query(input_data)
+
     async def fetchall(self) -> Any:
         aux_counter = self.fetchall_counter
         self.fetchall_counter += 1
@@ -227,6 +256,12 @@ class SpyTransaction(IDatabaseTransaction):
         response = self._open_transaction_response_list[aux_counter].execute()
         return response
 
+    async def open_read_only_transaction(self) -> None:
+        aux_counter = self.open_read_only_transaction_counter
+        self.open_read_only_transaction_counter += 1
+        response = self._open_read_only_transaction_response_list[aux_counter].execute()
+        return response
+
     async def release(self) -> None:
         aux_counter = self.release_counter
         self.release_counter += 1
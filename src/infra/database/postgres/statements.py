@@ -0,0 +1,12 @@
+from typing import Any, TypedDict, NotRequired
+
+
+class QueryInput(TypedDict):
+    text: str
+    values: Any
+    # statements with a name are prepared once per pooled connection and executed by name afterwards
+    name: NotRequired[str]
+
+
+BEGIN: QueryInput = {"text": "BEGIN", "values": None}
+COMMIT: QueryInput = {"text": "COMMIT", "values": None}
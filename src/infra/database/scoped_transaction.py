@@ -0,0 +1,42 @@
+from typing import Any
+from contextvars import ContextVar
+
+from src.services.contracts.database.base import IDatabaseTransaction
+
+
+class ScopedTransaction(IDatabaseTransaction):
+    def __init__(self):
+        self._current: ContextVar[IDatabaseTransaction] = ContextVar("scoped_transaction")
+
+    def enter_scope(self, transaction: IDatabaseTransaction) -> None:
+        self._current.set(transaction)
+
+    async def query(self, input_data: Any) -> None:
+        await self._current.get().query(input_data)
+
+    async def defer_query(self, input_data: Any) -> None:
+        await self._current.get().defer_query(input_data)
+
+    async def fetchall(self) -> Any:
+        return await self._current.get().fetchall()
+
+    async def open_transaction(self) -> None:
+        await self._current.get().open_transaction()
+
+    async def open_read_only_transaction(self) -> None:
+        await self._current.get().open_read_only_transaction()
+
+    async def release(self) -> None:
+        await self._current.get().release()
+
+    async def create_client(self) -> None:
+        await self._current.get().create_client()
+
+    async def commit(self) -> None:
+        await self._current.get().commit()
+
+    async def rollback(self) -> None:
+        await self._current.get().rollback()
+
+    async def close(self) -> None:
+        await self._current.get().close()
@@ -0,0 +1,5 @@
+class DatabaseAcquireTimeoutException(Exception):
+    def __init__(self, timeout: float):
+        message = 'database - no connection was released within "' + str(timeout) + '" - seconds'
+        super().__init__(message)
+        self.retry_after = timeout
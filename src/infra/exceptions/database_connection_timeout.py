@@ -0,0 +1,4 @@
+class DatabaseConnectionTimeoutException(Exception):
+    def __init__(self, timeout: float):
+        message = 'database - could not connect within "' + str(timeout) + '" - seconds'
+        super().__init__(message)
@@ -0,0 +1,5 @@
+class DatabaseLockTimeoutException(Exception):
+    def __init__(self, timeout: float):
+        message = 'database - the lock of the machine was not released within "' + str(timeout) + '" - seconds'
+        super().__init__(message)
+        self.retry_after = timeout
@@ -0,0 +1,5 @@
+class DatabaseNotReadyException(Exception):
+    def __init__(self):
+        message = "database - the connection pool is still warming up"
+        super().__init__(message)
+        self.retry_after = 1
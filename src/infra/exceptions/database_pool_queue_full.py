@@ -0,0 +1,5 @@
+class DatabasePoolQueueFullException(Exception):
+    def __init__(self, retry_after: float):
+        message = "database - too many requests are waiting for a connection"
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,66 @@
+import asyncio
+import random
+import time
+
+from src.services.contracts.database.base import IDatabaseQuery
+from src.services.contracts.locks.base import IKeyedLock
+
+from src.infra.database.postgres.statements import QueryInput
+
+from src.infra.exceptions.database_lock_timeout import DatabaseLockTimeoutException
+
+from src.infra.locks.lock_metrics import LockMetrics
+
+
+# Transaction level advisory lock, the key is hashed into the lock id postgres expects. The lock
+# is let go by the COMMIT or ROLLBACK of the transaction that took it, never by `release`.
+# A lock held by another worker is asked for again after a growing pause instead of waiting for it
+# in the database, so the event loop is never stuck behind the query, and given up after `lock_timeout`
+class PostgresAdvisoryLock(IKeyedLock):
+    def __init__(
+        self,
+        query_runner: IDatabaseQuery,
+        lock_timeout: float = 5.0,
+        poll_initial: float = 0.005,
+        poll_max: float = 0.1,
+    ):
+        self._query_runner: IDatabaseQuery = query_runner
+        self._lock_timeout = lock_timeout
+        self._poll_initial = poll_initial
+        self._poll_max = poll_max
+
+    async def _try_lock(self, key: str) -> bool:
+        try_lock_query_input: QueryInput = {
+            "name": "advisory_try_lock",
+            "text": "SELECT pg_try_advisory_xact_lock(hashtextextended(%s, 0)) AS locked",
+            "values": (key,),
+        }
+        await self._query_runner.query(try_lock_query_input)
+        rows = await self._query_runner.fetchall()
+        return rows[0]["locked"]
+
+    async def acquire(self, key: str) -> None:
+        if await self._try_lock(key):
+            LockMetrics.get_instance().record_advisory_acquire(0.0, False)
+            return
+
+        started_at: float = time.perf_counter()
+        deadline: float = started_at + self._lock_timeout
+        poll: float = self._poll_initial
+
+        while True:
+            now: float = time.perf_counter()
+            if now >= deadline:
+                raise DatabaseLockTimeoutException(self._lock_timeout)
+
+            # workers waiting for the same machine do not all ask again at once
+            await asyncio.sleep(min(random.uniform(poll / 2, poll), deadline - now))
+
+            if await self._try_lock(key):
+                LockMetrics.get_instance().record_advisory_acquire(time.perf_counter() - started_at, True)
+                return
+
+            poll = min(poll * 2, self._poll_max)
+
+    async def release(self, key: str) -> None:
+        pass
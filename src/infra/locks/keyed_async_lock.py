@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+from typing import Self
+
+from src.services.contracts.locks.base import IKeyedLock
+
+from src.infra.locks.lock_metrics import LockMetrics
+
+
+# One asyncio lock per key, shared by every request of the worker. Waiting requests hold
+# nothing but their place in the queue, and a key's lock is dropped once nobody holds or waits for it
+class KeyedAsyncLock(IKeyedLock):
+    _instance: Self = None
+
+    def __new__(cls, *args, **kwargs):
+        raise Exception("Use the 'get_instance' method to create an instance of this class.")
+
+    def __init__(self):
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._users: dict[str, int] = {}
+
+    @classmethod
+    def get_instance(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.__init__()
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        cls._instance = None
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    async def acquire(self, key: str) -> None:
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+            self._users[key] = 0
+        self._users[key] += 1
+
+        metrics: LockMetrics = LockMetrics.get_instance()
+        contended: bool = self._users[key] > 1
+        started_at: float = time.perf_counter()
+        metrics.waiting += 1
+
+        try:
+            await self._locks[key].acquire()
+        except BaseException:
+            self._forget(key)
+            raise
+        finally:
+            metrics.waiting -= 1
+
+        metrics.record_acquire(time.perf_counter() - started_at, contended)
+
+    async def release(self, key: str) -> None:
+        self._locks[key].release()
+        self._forget(key)
+
+    def _forget(self, key: str) -> None:
+        self._users[key] -= 1
+        if self._users[key] == 0:
+            del self._locks[key]
+            del self._users[key]
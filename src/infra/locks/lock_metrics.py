@@ -0,0 +1,68 @@
+from typing import Self
+
+from src.infra.database.postgres.pool_metrics import Histogram
+
+
+class LockMetrics:
+    _instance: Self = None
+
+    def __new__(cls, *args, **kwargs):
+        raise Exception("Use the 'get_instance' method to create an instance of this class.")
+
+    def __init__(self):
+        self.wait = Histogram(
+            "machine_lock_wait_seconds", "Time spent waiting for the lock of a machine in this worker"
+        )
+        self.advisory_wait = Histogram(
+            "machine_advisory_lock_wait_seconds", "Time spent waiting for the lock of a machine held by another worker"
+        )
+        self.acquisitions: int = 0
+        self.contentions: int = 0
+        self.advisory_acquisitions: int = 0
+        self.advisory_contentions: int = 0
+        self.waiting: int = 0
+
+    @classmethod
+    def get_instance(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.__init__()
+        return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        cls._instance = None
+
+    def record_acquire(self, wait: float, contended: bool) -> None:
+        self.wait.observe(wait)
+        self.acquisitions += 1
+        if contended:
+            self.contentions += 1
+
+    def record_advisory_acquire(self, wait: float, contended: bool) -> None:
+        self.advisory_wait.observe(wait)
+        self.advisory_acquisitions += 1
+        if contended:
+            self.advisory_contentions += 1
+
+    def render(self) -> str:
+        lines: list[str] = [
+            "# HELP machine_lock_waiting Requests currently waiting for the lock of a machine in this worker",
+            "# TYPE machine_lock_waiting gauge",
+            "machine_lock_waiting " + str(self.waiting),
+            "# HELP machine_lock_acquisitions_total Locks of a machine taken in this worker",
+            "# TYPE machine_lock_acquisitions_total counter",
+            "machine_lock_acquisitions_total " + str(self.acquisitions),
+            "# HELP machine_lock_contentions_total Locks of a machine that were already taken in this worker",
+            "# TYPE machine_lock_contentions_total counter",
+            "machine_lock_contentions_total " + str(self.contentions),
+            "# HELP machine_advisory_lock_acquisitions_total Locks of a machine taken in the database",
+            "# TYPE machine_advisory_lock_acquisitions_total counter",
+            "machine_advisory_lock_acquisitions_total " + str(self.advisory_acquisitions),
+            "# HELP machine_advisory_lock_contentions_total Locks of a machine that another worker held in the database",
+            "# TYPE machine_advisory_lock_contentions_total counter",
+            "machine_advisory_lock_contentions_total " + str(self.advisory_contentions),
+        ]
+        lines.extend(self.wait.render())
+        lines.extend(self.advisory_wait.render())
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,64 @@
+from typing import Any, Optional
+
+from src.domain.entities.machine import MachineEntity, MachineState
+from src.domain.entities.owner import OwnerEntity
+from src.domain.entities.product import ProductEntity
+
+from src.domain.value_objects.uuid import UUIDValueObject
+
+from src.domain.repositories.machine import IMachineRepository
+
+from src.infra.cache.machine_catalog_cache import MachineCatalogCache
+
+
+def _to_snapshot(entity: MachineEntity) -> tuple:
+    return (
+        entity.state.value,
+        entity.coins,
+        (entity.owner.id.value, entity.owner.full_name, entity.owner.email.value),
+        tuple(
+            (product.id.value, product.name, product.qty, product.code, product.unit_price)
+            for product in entity.products
+        ),
+    )
+
+
+def _from_snapshot(id: str, snapshot: tuple) -> MachineEntity:
+    state, coins, owner, products = snapshot
+    return MachineEntity.create(
+        id,
+        OwnerEntity.create(*owner),
+        MachineState[state],
+        coins,
+        [ProductEntity.create(*product) for product in products],
+    )
+
+
+# Serves machines out of the catalog cache, every hit builds a new entity so changes made
+# to it never reach the cache. Only meant for reads that do not write the machine back
+class CachedMachineRepository(IMachineRepository):
+    def __init__(self, decoratee: IMachineRepository, cache: MachineCatalogCache):
+        self._decoratee = decoratee
+        self._cache = cache
+
+    async def find_by_id(self, id: UUIDValueObject) -> Optional[MachineEntity]:
+        snapshot: Optional[Any] = self._cache.get(id.value)
+
+        if snapshot is not None:
+            return _from_snapshot(id.value, snapshot)
+
+        generation: int = self._cache.generation
+        entity: Optional[MachineEntity] = await self._decoratee.find_by_id(id)
+
+        if entity is not None:
+            self._cache.put(id.value, _to_snapshot(entity), generation)
+
+        return entity
+
+    async def save(self, entity: MachineEntity) -> None:
+        await self._decoratee.save(entity)
+        self._cache.invalidate(entity.id.value)
+
+    async def update(self, entity: MachineEntity) -> None:
+        await self._decoratee.update(entity)
+        self._cache.invalidate(entity.id.value)
@@ -0,0 +1,59 @@
+from typing import Optional
+
+from src.domain.entities.machine import MachineEntity
+
+from src.domain.value_objects.uuid import UUIDValueObject
+
+from src.domain.repositories.machine import IMachineRepository
+
+from src.services.contracts.database.base import IUnitOfWork
+
+from src.infra.cache.machine_catalog_cache import MachineCatalogCache
+
+
+# Machines written during the transaction are only evicted from the catalog cache once it is
+# committed, a read made in between would otherwise put the uncommitted state back in it
+class IdentityMapMachineRepository(IMachineRepository, IUnitOfWork):
+    def __init__(self, decoratee: IMachineRepository, catalog_cache: MachineCatalogCache = None):
+        self._decoratee = decoratee
+        self._catalog_cache = catalog_cache
+        self._identity_map: dict[str, MachineEntity] = {}
+        self._dirty: dict[str, MachineEntity] = {}
+        self._written: set[str] = set()
+
+    async def find_by_id(self, id: UUIDValueObject) -> Optional[MachineEntity]:
+        if id.value in self._identity_map:
+            return self._identity_map[id.value]
+
+        entity: Optional[MachineEntity] = await self._decoratee.find_by_id(id)
+
+        if entity is not None:
+            self._identity_map[id.value] = entity
+
+        return entity
+
+    async def save(self, entity: MachineEntity) -> None:
+        await self._decoratee.save(entity)
+        self._identity_map[entity.id.value] = entity
+        self._written.add(entity.id.value)
+
+    async def update(self, entity: MachineEntity) -> None:
+        self._identity_map[entity.id.value] = entity
+        self._dirty[entity.id.value] = entity
+
+    async def flush(self) -> None:
+        for entity in self._dirty.values():
+            await self._decoratee.update(entity)
+            self._written.add(entity.id.value)
+        self._dirty.clear()
+
+    async def after_commit(self) -> None:
+        if self._catalog_cache is not None:
+            for id in self._written:
+                self._catalog_cache.invalidate(id)
+        self._written.clear()
+
+    async def clear(self) -> None:
+        self._identity_map.clear()
+        self._dirty.clear()
+        self._written.clear()
@@ -1,14 +1,16 @@
 from typing import Optional
 
-from src.infra.database.postgres.psycopg2_transaction import QueryInput
+from src.infra.database.postgres.statements import QueryInput
 
 from src.domain.repositories.machine import IMachineRepository
 from src.domain.value_objects.uuid import UUIDValueObject
+from src.domain.value_objects.coins import CoinsVector
 from src.domain.entities.machine import MachineEntity, MachineState
 from src.domain.entities.owner import OwnerEntity
 from src.domain.entities.product import ProductEntity
 
 from src.services.contracts.database.base import IDatabaseQuery
+from src.services.exceptions.concurrent_machine_update import ConcurrentMachineUpdateException
 
 
 class Psycopg2MachineRepository(IMachineRepository):
@@ -17,8 +19,55 @@ class Psycopg2MachineRepository(IMachineRepository):
 
     async def find_by_id(self, id: UUIDValueObject) -> Optional[MachineEntity]:
         machine_query_input: QueryInput = {
-            "text": "SELECT * FROM machines_schema.machines WHERE id = %s LIMIT 1",
-            "values": (id.value,),
+            "name": "machine_find_by_id",
+            "text": """
+                SELECT machines.id AS id,
+                       machines.state AS state,
+                       machines.coin_01_qty + coin_movements.coin_01_qty AS coin_01_qty,
+                       machines.coin_05_qty + coin_movements.coin_05_qty AS coin_05_qty,
+                       machines.coin_10_qty + coin_movements.coin_10_qty AS coin_10_qty,
+                       machines.coin_25_qty + coin_movements.coin_25_qty AS coin_25_qty,
+                       machines.coin_50_qty + coin_movements.coin_50_qty AS coin_50_qty,
+                       machines.coin_100_qty + coin_movements.coin_100_qty AS coin_100_qty,
+                       machines.version AS version,
+                       owners.id AS owner_id,
+                       owners.full_name AS owner_full_name,
+                       owners.email AS owner_email,
+                       COALESCE(
+                           (
+                               SELECT json_agg(
+                                   json_build_object(
+                                       'product_id', products.id,
+                                       'name', products.name,
+                                       'unit_price', products.unit_price,
+                                       'code', products_stock.code,
+                                       'qty', products_stock.product_qty
+                                   )
+                                   ORDER BY products_stock.code
+                               )
+                               FROM machines_schema.machine_products products_stock
+                               INNER JOIN products_schema.products products ON products_stock.product_id = products.id
+                               WHERE products_stock.machine_id = %s
+                           ),
+                           '[]'
+                       ) AS products
+                FROM machines_schema.machines machines
+                INNER JOIN machines_schema.owners owners ON machines.owner_id = owners.id
+                -- coins are the last compacted snapshot plus every movement recorded since
+                CROSS JOIN LATERAL (
+                    SELECT COALESCE(SUM(movements.coin_01_qty), 0)::INT AS coin_01_qty,
+                           COALESCE(SUM(movements.coin_05_qty), 0)::INT AS coin_05_qty,
+                           COALESCE(SUM(movements.coin_10_qty), 0)::INT AS coin_10_qty,
+                           COALESCE(SUM(movements.coin_25_qty), 0)::INT AS coin_25_qty,
+                           COALESCE(SUM(movements.coin_50_qty), 0)::INT AS coin_50_qty,
+                           COALESCE(SUM(movements.coin_100_qty), 0)::INT AS coin_100_qty
+                    FROM machines_schema.coin_movements movements
+                    WHERE movements.machine_id = machines.id
+                ) coin_movements
+                WHERE machines.id = %s
+                LIMIT 1
+            """,
+            "values": (id.value, id.value),
         }
         await self._query_runner.query(machine_query_input)
         machine_rows = await self._query_runner.fetchall()
@@ -26,36 +75,9 @@ class Psycopg2MachineRepository(IMachineRepository):
         if len(machine_rows) == 0:
             return None
 
-        owner_query_input: QueryInput = {
-            "text": "SELECT * FROM machines_schema.owners WHERE id = %s LIMIT 1",
-            "values": (machine_rows[0]["owner_id"],),
-        }
-        await self._query_runner.query(owner_query_input)
-        owner_rows = await self._query_runner.fetchall()
-
-        if len(owner_rows) == 0:
-            return None
-
-        machine_products_query_input: QueryInput = {
-            "text": """
-                SELECT products.id AS product_id,
-                       products.name AS name,
-                       products.unit_price AS unit_price,
-                       products_stock.code AS code,
-                       products_stock.product_qty AS qty,
-                       products_stock.machine_id AS machine_id
-                FROM machines_schema.machine_products products_stock
-                INNER JOIN products_schema.products products ON products_stock.product_id = products.id
-                WHERE products_stock.machine_id = %s
-            """,
-            "values": (machine_rows[0]["id"],),
-        }
-        await self._query_runner.query(machine_products_query_input)
-        machine_products_rows = await self._query_runner.fetchall()
-
         products_list: list[ProductEntity] = []
 
-        for product in machine_products_rows:
+        for product in machine_rows[0]["products"]:
             products_list.append(
                 ProductEntity.create(
                     id=product["product_id"],
@@ -69,24 +91,28 @@ class Psycopg2MachineRepository(IMachineRepository):
         machine = MachineEntity.create(
             id=machine_rows[0]["id"],
             owner=OwnerEntity.create(
-                id=owner_rows[0]["id"],
-                full_name=owner_rows[0]["full_name"],
-                email=owner_rows[0]["email"],
+                id=machine_rows[0]["owner_id"],
+                full_name=machine_rows[0]["owner_full_name"],
+                email=machine_rows[0]["owner_email"],
             ),
             state=MachineState[machine_rows[0]["state"]],
-            coin_01_qty=machine_rows[0]["coin_01_qty"],
-            coin_05_qty=machine_rows[0]["coin_05_qty"],
-            coin_10_qty=machine_rows[0]["coin_10_qty"],
-            coin_25_qty=machine_rows[0]["coin_25_qty"],
-            coin_50_qty=machine_rows[0]["coin_50_qty"],
-            coin_100_qty=machine_rows[0]["coin_100_qty"],
+            coins=CoinsVector.create(
+                machine_rows[0]["coin_01_qty"],
+                machine_rows[0]["coin_05_qty"],
+                machine_rows[0]["coin_10_qty"],
+                machine_rows[0]["coin_25_qty"],
+                machine_rows[0]["coin_50_qty"],
+                machine_rows[0]["coin_100_qty"],
+            ),
             products=products_list,
+            version=machine_rows[0]["version"],
         )
 
         return machine
 
     async def save(self, entity: MachineEntity) -> None:
         owner_query_input: QueryInput = {
+            "name": "machine_save_owner",
             "text": "INSERT INTO machines_schema.owners (id, full_name, email) VALUES (%s, %s, %s)",
             "values": (
                 entity.owner.id.value,
@@ -95,6 +121,7 @@ class Psycopg2MachineRepository(IMachineRepository):
             ),
         }
         machine_query_input: QueryInput = {
+            "name": "machine_save",
             "text": """
                 INSERT INTO machines_schema.machines (
                     id, owner_id, state, coin_01_qty, coin_05_qty, coin_10_qty, coin_25_qty, coin_50_qty, coin_100_qty
@@ -104,18 +131,14 @@ class Psycopg2MachineRepository(IMachineRepository):
                 entity.id.value,
                 entity.owner.id.value,
                 entity.state.value,
-                entity.coin_01.qty,
-                entity.coin_05.qty,
-                entity.coin_10.qty,
-                entity.coin_25.qty,
-                entity.coin_50.qty,
-                entity.coin_100.qty,
+                *entity.coins,
             ),
         }
         machine_products_query_input_list: list[QueryInput] = []
         for product in entity.products:
             machine_products_query_input_list.append(
                 {
+                    "name": "machine_save_product",
                     "text": """INSERT INTO machines_schema.machine_products (
                             machine_id,
                             product_id,
@@ -130,61 +153,88 @@ class Psycopg2MachineRepository(IMachineRepository):
                     ),
                 }
             )
-        await self._query_runner.query(owner_query_input)
-        await self._query_runner.query(machine_query_input)
+        await self._query_runner.defer_query(owner_query_input)
+        await self._query_runner.defer_query(machine_query_input)
         for machine_products_query_input in machine_products_query_input_list:
-            await self._query_runner.query(machine_products_query_input)
+            await self._query_runner.defer_query(machine_products_query_input)
+
+        entity.mark_as_persisted()
 
     async def update(self, entity: MachineEntity):
-        owner_query_input: QueryInput = {
-            "text": "UPDATE machines_schema.owners SET id = %s, full_name = %s, email = %s WHERE id = %s",
-            "values": (
-                entity.owner.id.value,
-                entity.owner.full_name,
-                entity.owner.email.value,
-                entity.owner.id.value,
-            ),
-        }
-        machine_query_input: QueryInput = {
-            "text": """
-                UPDATE machines_schema.machines 
-                SET id = %s,
-                    owner_id = %s,
-                    state = %s,
-                    coin_01_qty = %s,
-                    coin_05_qty = %s,
-                    coin_10_qty = %s,
-                    coin_25_qty = %s,
-                    coin_50_qty = %s,
-                    coin_100_qty = %s
-                WHERE id = %s
-            """,
-            "values": (
-                entity.id.value,
-                entity.owner.id.value,
-                entity.state.value,
-                entity.coin_01.qty,
-                entity.coin_05.qty,
-                entity.coin_10.qty,
-                entity.coin_25.qty,
-                entity.coin_50.qty,
-                entity.coin_100.qty,
-                entity.id.value,
-            ),
-        }
-        products_stock_query_input_list: list[QueryInput] = []
-        for product in entity.products:
-            products_stock_query_input_list.append(
-                {
-                    "text": """
-                        UPDATE machines_schema.machine_products
-                        SET product_qty = %s
-                        WHERE machine_id = %s AND product_id = %s
-                    """,
-                    "values": (product.qty, entity.id.value, product.id.value),
-                }
+        machine_columns: list[str] = []
+        machine_values: list = []
+
+        if entity.state_changed:
+            machine_columns.append("state = %s")
+            machine_values.append(entity.state.value)
+
+        changed_products: list[ProductEntity] = entity.changed_products
+
+        statements: list[str] = []
+        values: list = []
+
+        if len(changed_products) > 0:
+            products_stock_rows: str = ", ".join(["(%s::UUID, %s::INT)"] * len(changed_products))
+            # stock moves by what changed since it was read, so concurrent changes are not overwritten
+            statements.append(f"""
+                    UPDATE machines_schema.machine_products products_stock
+                    SET product_qty = products_stock.product_qty + changes.qty_change
+                    FROM (VALUES {products_stock_rows}) AS changes (product_id, qty_change)
+                    WHERE products_stock.machine_id = %s AND products_stock.product_id = changes.product_id
+                """)
+            for product in changed_products:
+                values.extend((product.id.value, product.qty_change))
+            values.append(entity.id.value)
+
+        if len(entity.changed_coins) > 0:
+            # coins are recorded as a movement instead of rewriting the machine row every purchase.
+            # Like the stock changes they are not checked against the version, purchases of a machine
+            # are serialised by the machine locks taken before it is read, the version only guards
+            # writes of the machine row itself
+            coin_movement_query_input: QueryInput = {
+                "name": "machine_record_coin_movement",
+                "text": """
+                    INSERT INTO machines_schema.coin_movements (
+                        machine_id, coin_01_qty, coin_05_qty, coin_10_qty, coin_25_qty, coin_50_qty, coin_100_qty
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """,
+                "values": (entity.id.value, *entity.coins_change),
+            }
+            await self._query_runner.defer_query(coin_movement_query_input)
+
+        if len(machine_columns) > 0:
+            # the row is only written if nobody else wrote it since it was read
+            statements.append(
+                "UPDATE machines_schema.machines SET "
+                + ", ".join(machine_columns)
+                + ", version = version + 1 WHERE id = %s AND version = %s RETURNING version"
             )
-        await self._query_runner.query(owner_query_input)
-        await self._query_runner.query(machine_query_input)
-        for products_stock_query_input in products_stock_query_input_list:
-            await self._query_runner.query(products_stock_query_input)
+            values.extend((*machine_values, entity.id.value, entity.version))
+
+        version: Optional[int] = None
+
+        if len(statements) > 0:
+            # stock and machine changes touch different tables, so they can share one statement
+            text: str = statements[-1]
+            if len(statements) == 2:
+                text = "WITH products_stock_changes AS (" + statements[0] + ") " + statements[1]
+
+            machine_query_input: QueryInput = {
+                "text": text,
+                "values": tuple(values),
+            }
+
+            if len(machine_columns) == 0:
+                await self._query_runner.defer_query(machine_query_input)
+            else:
+                # the version check needs the written row back, so this statement does not wait for the commit
+                await self._query_runner.query(machine_query_input)
+                machine_rows = await self._query_runner.fetchall()
+
+                if len(machine_rows) == 0:
+                    raise ConcurrentMachineUpdateException()
+
+                version = machine_rows[0]["version"]
+
+        # stock reserved by orders of this machine is only written by the order repository
+        entity.mark_as_persisted(version)
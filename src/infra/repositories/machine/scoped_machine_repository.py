@@ -0,0 +1,38 @@
+from typing import Optional
+from contextvars import ContextVar
+
+from src.domain.entities.machine import MachineEntity
+
+from src.domain.value_objects.uuid import UUIDValueObject
+
+from src.domain.repositories.machine import IMachineRepository
+
+from src.services.contracts.database.base import IUnitOfWork
+
+from src.infra.repositories.machine.identity_map_machine_repository import IdentityMapMachineRepository
+
+
+class ScopedMachineRepository(IMachineRepository, IUnitOfWork):
+    def __init__(self):
+        self._current: ContextVar[IdentityMapMachineRepository] = ContextVar("scoped_machine_repository")
+
+    def enter_scope(self, repository: IdentityMapMachineRepository) -> None:
+        self._current.set(repository)
+
+    async def find_by_id(self, id: UUIDValueObject) -> Optional[MachineEntity]:
+        return await self._current.get().find_by_id(id)
+
+    async def save(self, entity: MachineEntity) -> None:
+        await self._current.get().save(entity)
+
+    async def update(self, entity: MachineEntity) -> None:
+        await self._current.get().update(entity)
+
+    async def flush(self) -> None:
+        await self._current.get().flush()
+
+    async def after_commit(self) -> None:
+        await self._current.get().after_commit()
+
+    async def clear(self) -> None:
+        await self._current.get().clear()
@@ -1,5 +1,4 @@
 from typing import Self
-from datetime import datetime
 
 from src.domain.entities.order import OrderEntity
 
@@ -39,9 +38,7 @@ class _BinaryTree:
         else:
             raise Exception("element already exists in tree")
 
-    def find_by_id_and_machine_id(
-        self, uuid: UUIDValueObject, machine_id: UUIDValueObject, created_at: datetime
-    ) -> OrderEntity:
+    def find_by_id_and_machine_id(self, uuid: UUIDValueObject, machine_id: UUIDValueObject) -> OrderEntity:
         node: _Node = self._inorder_traversal(self.root, uuid)
         if node is None:
             return None
@@ -85,10 +82,8 @@ class FakeOrderRepository(IOrderRepository):
     def reset_instance(cls) -> None:
         cls._instance = None
 
-    async def find_by_id_and_machine_id(
-        self, id: UUIDValueObject, machine_id: UUIDValueObject, created_at: datetime
-    ) -> OrderEntity:
-        return self._record.find_by_id_and_machine_id(id, machine_id, created_at)
+    async def find_by_id_and_machine_id(self, id: UUIDValueObject, machine_id: UUIDValueObject) -> OrderEntity:
+        return self._record.find_by_id_and_machine_id(id, machine_id)
 
     async def save(self, entity: OrderEntity) -> None:
         self._record.save(entity)
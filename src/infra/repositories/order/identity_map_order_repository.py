@@ -0,0 +1,50 @@
+from typing import Optional
+
+from src.domain.entities.order import OrderEntity
+
+from src.domain.value_objects.uuid import UUIDValueObject
+
+from src.domain.repositories.order import IOrderRepository
+
+from src.services.contracts.database.base import IUnitOfWork
+
+
+class IdentityMapOrderRepository(IOrderRepository, IUnitOfWork):
+    def __init__(self, decoratee: IOrderRepository):
+        self._decoratee = decoratee
+        self._identity_map: dict[str, OrderEntity] = {}
+        self._dirty: dict[str, OrderEntity] = {}
+
+    async def find_by_id_and_machine_id(
+        self, id: UUIDValueObject, machine_id: UUIDValueObject
+    ) -> Optional[OrderEntity]:
+        if id.value in self._identity_map:
+            entity: OrderEntity = self._identity_map[id.value]
+            return entity if entity.machine_id.value == machine_id.value else None
+
+        entity: Optional[OrderEntity] = await self._decoratee.find_by_id_and_machine_id(id, machine_id)
+
+        if entity is not None:
+            self._identity_map[id.value] = entity
+
+        return entity
+
+    async def save(self, entity: OrderEntity) -> None:
+        await self._decoratee.save(entity)
+        self._identity_map[entity.id.value] = entity
+
+    async def update(self, entity: OrderEntity) -> None:
+        self._identity_map[entity.id.value] = entity
+        self._dirty[entity.id.value] = entity
+
+    async def flush(self) -> None:
+        for entity in self._dirty.values():
+            await self._decoratee.update(entity)
+        self._dirty.clear()
+
+    async def after_commit(self) -> None:
+        pass
+
+    async def clear(self) -> None:
+        self._identity_map.clear()
+        self._dirty.clear()
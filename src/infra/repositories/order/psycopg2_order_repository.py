@@ -1,5 +1,7 @@
+import logging
+
 from typing import Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from src.domain.value_objects.uuid import UUIDValueObject
 from src.domain.entities.product import ProductEntity
@@ -9,99 +11,99 @@ from src.domain.repositories.order import IOrderRepository
 
 from src.services.contracts.database.base import IDatabaseQuery
 
-from src.infra.database.postgres.psycopg2_transaction import QueryInput
+from src.infra.database.postgres.statements import QueryInput
+
+logger = logging.getLogger(__name__)
+
+# stock moves by the change of the product instead of being overwritten, concurrent orders of the
+# same product all count and the `product_qty >= 0` check rejects the one that would oversell
+_PRODUCT_QTY_CHANGE: str = """
+    UPDATE machines_schema.machine_products
+    SET product_qty = product_qty + %s
+    WHERE machine_id = %s
+    AND product_id = %s;"""
 
 
 class Psycopg2OrderRepository(IOrderRepository):
     def __init__(self, query_runner: IDatabaseQuery):
         self._query_runner: IDatabaseQuery = query_runner
 
-    def _get_month_range(self, timestamp: datetime) -> Tuple[str, str]:
-        # First day of the month
-        first_day: str = timestamp.replace(day=1).isoformat(timespec="seconds")
-
-        # Calculate the last day of the month by going to the next month and subtracting one day
-        if timestamp.month == 12:
-            next_month = timestamp.replace(year=timestamp.year + 1, month=1, day=1)
+    def _get_month_range(self, timestamp: datetime) -> Tuple[datetime, datetime]:
+        # [first instant of the month, first instant of the next month), the bounds of exactly one monthly
+        # partition, passed as timestamps so postgres can prune the other partitions
+        month_start: datetime = timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        if month_start.month == 12:
+            next_month_start = month_start.replace(year=month_start.year + 1, month=1)
         else:
-            next_month = timestamp.replace(month=timestamp.month + 1, day=1)
-        last_day: str = (next_month - timedelta(days=1)).isoformat(timespec="seconds")
+            next_month_start = month_start.replace(month=month_start.month + 1)
+
+        return (month_start, next_month_start)
 
-        return (first_day, last_day)
+    def _get_id_range(self, id: UUIDValueObject) -> Tuple[datetime, datetime]:
+        # time ordered ids carry the creation time of the order, older random ids can be in any partition
+        created_at: Optional[datetime] = id.timestamp
+        if created_at is None:
+            return (datetime.min, datetime.max)
+
+        return self._get_month_range(created_at)
 
     async def find_by_id_and_machine_id(
-        self, id: UUIDValueObject, machine_id: UUIDValueObject, created_at: datetime
+        self, id: UUIDValueObject, machine_id: UUIDValueObject
     ) -> Optional[OrderEntity]:
-        timerange_month_tuple = self._get_month_range(created_at)
+        month_start, next_month_start = self._get_id_range(id)
         order_query_input: QueryInput = {
-            "text": "SELECT * FROM orders_schema.orders WHERE id = %s AND machine_id = %s AND created_at BETWEEN %s AND %s LIMIT 1",
+            "name": "order_find_by_id_and_machine_id",
+            "text": """
+                SELECT orders.id AS id,
+                       orders.machine_id AS machine_id,
+                       orders.status AS status,
+                       orders.created_at AS created_at,
+                       orders.updated_at AS updated_at,
+                       order_items.id AS order_item_id,
+                       order_items.created_at AS order_item_created_at,
+                       order_items.qty AS order_qty,
+                       products.id AS product_id,
+                       products.unit_price AS product_unit_price,
+                       products.name AS product_name,
+                       machine_products.product_qty AS product_total_qty,
+                       machine_products.code AS product_code
+                FROM orders_schema.orders orders
+                INNER JOIN orders_schema.order_items order_items
+                    ON order_items.order_id = orders.id
+                    AND order_items.created_at >= %s AND order_items.created_at < %s
+                INNER JOIN machines_schema.machine_products machine_products
+                    ON machine_products.product_id = order_items.product_id
+                    AND machine_products.machine_id = %s
+                INNER JOIN products_schema.products products ON products.id = order_items.product_id
+                WHERE orders.id = %s
+                AND orders.machine_id = %s
+                AND orders.created_at >= %s AND orders.created_at < %s""",
             "values": (
+                month_start,
+                next_month_start,
+                machine_id.value,
                 id.value,
                 machine_id.value,
-                timerange_month_tuple[0],
-                timerange_month_tuple[1],
+                month_start,
+                next_month_start,
             ),
         }
 
         await self._query_runner.query(order_query_input)
         order_rows = await self._query_runner.fetchall()
 
+        # an order without items is not returned either
         if len(order_rows) == 0:
             return None
 
-        order_items_query_input: QueryInput = {
-            "text": """
-                SELECT order_items.id AS order_item_id,
-                       order_items.order_id AS order_id,
-                       order_items.created_at AS order_created_at,
-                       order_items.qty AS order_qty,
-                       machine_products2.product_id AS product_id,
-                       machine_products2.unit_price AS product_unit_price,
-                       machine_products2.product_qty AS product_total_qty,
-                       machine_products2.name AS product_name,
-                       machine_products2.code AS product_code
-                FROM (
-                    SELECT *
-                    FROM orders_schema.order_items
-                    WHERE order_id = %s AND created_at BETWEEN %s AND %s
-                ) AS order_items
-                INNER JOIN (
-                    SELECT machine_products1.machine_id AS machine_id,
-                           machine_products1.product_id AS product_id,
-                           machine_products1.product_qty AS product_qty,
-                           machine_products1.code AS code,
-                           products1.unit_price AS unit_price,
-                           products1.name AS name
-                    FROM machines_schema.machine_products machine_products1
-                    INNER JOIN products_schema.products products1 ON machine_products1.product_id = products1.id
-                    WHERE machine_id = %s
-                ) AS machine_products2
-                ON machine_products2.product_id = order_items.product_id;""",
-            "values": (
-                id.value,
-                timerange_month_tuple[0],
-                timerange_month_tuple[1],
-                machine_id.value,
-            ),
-        }
-
-        await self._query_runner.query(order_items_query_input)
-        order_items_rows = await self._query_runner.fetchall()
-
-        if len(order_items_rows) == 0:
-            return None
-
         order_item_list: list[OrderItemEntity] = []
 
-        order_total_amount: int = 0
-
-        for order_item in order_items_rows:
-            order_total_amount += int(order_item["product_unit_price"])
+        for order_item in order_rows:
             order_item_list.append(
                 OrderItemEntity.create(
                     id=order_item["order_item_id"],
                     qty=int(order_item["order_qty"]),
-                    created_at=order_item["order_created_at"],
+                    created_at=order_item["order_item_created_at"],
                     product=ProductEntity.create(
                         id=order_item["product_id"],
                         unit_price=int(order_item["product_unit_price"]),
@@ -112,28 +114,6 @@ class Psycopg2OrderRepository(IOrderRepository):
                 )
             )
 
-        order_query_input: QueryInput = {
-            "text": """
-                SELECT *
-                FROM orders_schema.orders
-                WHERE machine_id = %s
-                AND id = %s
-                AND created_at BETWEEN %s AND %s
-                """,
-            "values": (
-                machine_id.value,
-                order_items_rows[0]["order_id"],
-                timerange_month_tuple[0],
-                timerange_month_tuple[1],
-            ),
-        }
-
-        await self._query_runner.query(order_query_input)
-        order_rows = await self._query_runner.fetchall()
-
-        if len(order_rows) == 0:
-            return None
-
         order: OrderEntity = OrderEntity.create(
             id=order_rows[0]["id"],
             machine_id=order_rows[0]["machine_id"],
@@ -146,8 +126,8 @@ class Psycopg2OrderRepository(IOrderRepository):
         return order
 
     async def save(self, entity: OrderEntity) -> None:
-        print(entity.order_items[0].product.qty)
         order_query_input: QueryInput = {
+            "name": "order_save",
             "text": """INSERT INTO orders_schema.orders (
                 id,
                 machine_id,
@@ -166,16 +146,14 @@ class Psycopg2OrderRepository(IOrderRepository):
             ),
         }
 
-        await self._query_runner.query(order_query_input)
+        await self._query_runner.defer_query(order_query_input)
 
         for order_item in entity.order_items:
-            print(order_item.qty)
-            print(order_item.product.qty)
-            counter = 0
-            while counter < order_item.qty:
-                order_item.product.reduce_qty()
-                counter += 1
+            order_item.product.reduce_qty(order_item.qty)
+            # items are written with the creation time of their order, so they always share its monthly
+            # partition and the lookup can bound both tables by the range of the order id
             order_item_query_input: QueryInput = {
+                "name": "order_save_order_item",
                 "text": """INSERT INTO orders_schema.order_items (
                     id,
                     order_id,
@@ -194,57 +172,60 @@ class Psycopg2OrderRepository(IOrderRepository):
                 ),
             }
             machine_products_query_input: QueryInput = {
-                "text": """
-                    UPDATE machines_schema.machine_products
-                    SET product_qty = %s
-                    WHERE machine_id = %s
-                    AND product_id = %s;""",
+                "name": "order_change_product_qty",
+                "text": _PRODUCT_QTY_CHANGE,
                 "values": (
-                    order_item.product.qty,
+                    order_item.product.qty_change,
                     entity.machine_id.value,
                     order_item.product.id.value,
                 ),
             }
-            await self._query_runner.query(order_item_query_input)
-            await self._query_runner.query(machine_products_query_input)
+            await self._query_runner.defer_query(order_item_query_input)
+            await self._query_runner.defer_query(machine_products_query_input)
+            order_item.product.mark_as_persisted()
+
+        logger.debug(
+            "order saved id=%s machine_id=%s items=%d",
+            entity.id.value,
+            entity.machine_id.value,
+            len(entity.order_items),
+        )
 
     async def update(self, entity: OrderEntity) -> None:
-        timerange_month_tuple = self._get_month_range(entity.created_at)
+        month_start, next_month_start = self._get_month_range(entity.created_at)
         order_query_input: QueryInput = {
+            "name": "order_update",
             "text": """
                 UPDATE orders_schema.orders
                 SET status = %s, updated_at = %s
                 WHERE machine_id = %s
                 AND id = %s
-                AND created_at BETWEEN %s AND %s;""",
+                AND created_at >= %s AND created_at < %s;""",
             "values": (
                 entity.order_status.value,
                 entity.updated_at.isoformat(timespec="seconds"),
                 entity.machine_id.value,
                 entity.id.value,
-                timerange_month_tuple[0],
-                timerange_month_tuple[1],
+                month_start,
+                next_month_start,
             ),
         }
 
-        await self._query_runner.query(order_query_input)
+        await self._query_runner.defer_query(order_query_input)
 
         if entity.order_status == OrderStatus.CANCELED:
             for order_item in entity.order_items:
-                counter = 0
-                while counter < order_item.qty:
-                    order_item.product.increase_qty()
-                    counter += 1
+                order_item.product.increase_qty(order_item.qty)
                 machine_products_query_input: QueryInput = {
-                    "text": """
-                        UPDATE machines_schema.machine_products
-                        SET product_qty = %s
-                        WHERE machine_id = %s
-                        AND product_id = %s;""",
+                    "name": "order_change_product_qty",
+                    "text": _PRODUCT_QTY_CHANGE,
                     "values": (
-                        order_item.product.qty,
+                        order_item.product.qty_change,
                         entity.machine_id.value,
                         order_item.product.id.value,
                     ),
                 }
-                await self._query_runner.query(machine_products_query_input)
+                await self._query_runner.defer_query(machine_products_query_input)
+                order_item.product.mark_as_persisted()
+
+        logger.debug("order updated id=%s status=%s", entity.id.value, entity.order_status.value)
@@ -0,0 +1,40 @@
+from typing import Optional
+from contextvars import ContextVar
+
+from src.domain.entities.order import OrderEntity
+
+from src.domain.value_objects.uuid import UUIDValueObject
+
+from src.domain.repositories.order import IOrderRepository
+
+from src.services.contracts.database.base import IUnitOfWork
+
+from src.infra.repositories.order.identity_map_order_repository import IdentityMapOrderRepository
+
+
+class ScopedOrderRepository(IOrderRepository, IUnitOfWork):
+    def __init__(self):
+        self._current: ContextVar[IdentityMapOrderRepository] = ContextVar("scoped_order_repository")
+
+    def enter_scope(self, repository: IdentityMapOrderRepository) -> None:
+        self._current.set(repository)
+
+    async def find_by_id_and_machine_id(
+        self, id: UUIDValueObject, machine_id: UUIDValueObject
+    ) -> Optional[OrderEntity]:
+        return await self._current.get().find_by_id_and_machine_id(id, machine_id)
+
+    async def save(self, entity: OrderEntity) -> None:
+        await self._current.get().save(entity)
+
+    async def update(self, entity: OrderEntity) -> None:
+        await self._current.get().update(entity)
+
+    async def flush(self) -> None:
+        await self._current.get().flush()
+
+    async def after_commit(self) -> None:
+        await self._current.get().after_commit()
+
+    async def clear(self) -> None:
+        await self._current.get().clear()
@@ -5,7 +5,7 @@ from src.domain.repositories.order import IOrderRepository
 
 class IFindByIdAndMachineIdResponseObject(ABC):
     @abstractmethod
-    def execute(self, id, machine_id, created_at):
+    def execute(self, id, machine_id):
         pass
 
 
@@ -13,7 +13,7 @@ class FindByIdAndMachineIdResponseWithSuccessObject(IFindByIdAndMachineIdRespons
     def __init__(self, response):
         self.__response = response
 
-    def execute(self, id, machine_id, created_at):
+    def execute(self, id, machine_id):
         return self.__response
 
 
@@ -21,7 +21,7 @@ class FindByIdAndMachineIdResponseWithFailureObject(IFindByIdAndMachineIdRespons
     def __init__(self, exception: Exception):
         self.__response = exception
 
-    def execute(self, id, machine_id, created_at):
+    def execute(self, id, machine_id):
         raise self.__response
 
 
@@ -77,10 +77,10 @@ class StubOrderRepository(IOrderRepository):
         self.__save_counter = 0
         self.__update_counter = 0
 
-    async def find_by_id_and_machine_id(self, id, machine_id, created_at):
+    async def find_by_id_and_machine_id(self, id, machine_id):
         aux_counter = self.__find_by_id_counter
         self.__find_by_id_counter += 1
-        response = self.__find_by_id_response_list[aux_counter].execute(id, machine_id, created_at)
+        response = self.__find_by_id_response_list[aux_counter].execute(id, machine_id)
         return response
 
     async def update(self, entity):
@@ -4,7 +4,7 @@ from src.domain.repositories.payment import IPaymentRepository
 
 from src.services.contracts.database.base import IDatabaseQuery
 
-from src.infra.database.postgres.psycopg2_transaction import QueryInput
+from src.infra.database.postgres.statements import QueryInput
 
 
 class Psycopg2PaymentRepository(IPaymentRepository):
@@ -12,30 +12,30 @@ class Psycopg2PaymentRepository(IPaymentRepository):
         self._query_runner: IDatabaseQuery = query_runner
 
     async def save(self, entity: PaymentEntity) -> None:
-        payment_query_input: QueryInput = {
-            "text": """INSERT INTO payments_schema.payments (
+        payment_insert: str = """INSERT INTO payments_schema.payments (
                 id,
                 order_id,
                 amount,
                 payment_type,
                 payment_date
-            ) VALUES (%s, %s, %s, %s, %s);""",
-            "values": (
-                entity.id.value,
-                entity.order_id.value,
-                entity.amount,
-                entity.type.value,
-                entity.payment_date.isoformat(timespec="seconds"),
-            ),
-        }
-
-        await self._query_runner.query(payment_query_input)
+            ) VALUES (%s, %s, %s, %s, %s)"""
+        payment_values: tuple = (
+            entity.id.value,
+            entity.order_id.value,
+            entity.amount,
+            entity.type.value,
+            entity.payment_date.isoformat(timespec="seconds"),
+        )
 
         if entity.type == PaymentType.CASH:
             cash_payment_entity: CashPaymentEntity = entity
 
+            # the payment and its cash payment are written by a single statement,
+            # the foreign key is only checked once the whole statement finishes
             cash_payment_query_input: QueryInput = {
-                "text": """INSERT INTO payments_schema.cash_payments (
+                "name": "payment_save_cash_payment",
+                "text": f"""WITH payment AS ({payment_insert})
+                INSERT INTO payments_schema.cash_payments (
                     id,
                     payment_id,
                     cash_tendered,
@@ -43,6 +43,7 @@ class Psycopg2PaymentRepository(IPaymentRepository):
                     payment_date
                 ) VALUES (%s, %s, %s, %s, %s);""",
                 "values": (
+                    *payment_values,
                     cash_payment_entity.id.value,
                     entity.id.value,
                     cash_payment_entity.cash_tendered,
@@ -51,4 +52,13 @@ class Psycopg2PaymentRepository(IPaymentRepository):
                 ),
             }
 
-            await self._query_runner.query(cash_payment_query_input)
+            await self._query_runner.defer_query(cash_payment_query_input)
+            return
+
+        payment_query_input: QueryInput = {
+            "name": "payment_save",
+            "text": payment_insert + ";",
+            "values": payment_values,
+        }
+
+        await self._query_runner.defer_query(payment_query_input)
@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+
+from src.services.contracts.database.base import IUnitOfWork
+
+
+class IFlushResponseObject(ABC):
+    @abstractmethod
+    def execute(self):
+        pass
+
+
+class FlushResponseWithSuccessObject(IFlushResponseObject):
+    def execute(self):
+        return None
+
+
+class FlushResponseWithFailureObject(IFlushResponseObject):
+    def __init__(self, exception: Exception):
+        self.__response = exception
+
+    def execute(self):
+        raise self.__response
+
+
+class IClearResponseObject(ABC):
+    @abstractmethod
+    def execute(self):
+        pass
+
+
+class ClearResponseWithSuccessObject(IClearResponseObject):
+    def execute(self):
+        return None
+
+
+class SpyUnitOfWork(IUnitOfWork):
+    def __init__(
+        self,
+        flush_response_list: list[IFlushResponseObject],
+        clear_response_list: list[IClearResponseObject],
+    ):
+        self._flush_response_list = flush_response_list
+        self._clear_response_list = clear_response_list
+        self.flush_counter = 0
+        self.after_commit_counter = 0
+        self.clear_counter = 0
+
+    async def flush(self) -> None:
+        aux_counter = self.flush_counter
+        self.flush_counter += 1
+        self._flush_response_list[aux_counter].execute()
+
+    async def after_commit(self) -> None:
+        self.after_commit_counter += 1
+
+    async def clear(self) -> None:
+        aux_counter = self.clear_counter
+        self.clear_counter += 1
+        self._clear_response_list[aux_counter].execute()
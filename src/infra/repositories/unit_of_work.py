@@ -0,0 +1,18 @@
+from src.services.contracts.database.base import IUnitOfWork
+
+
+class UnitOfWork(IUnitOfWork):
+    def __init__(self, participants: list[IUnitOfWork]):
+        self._participants = participants
+
+    async def flush(self) -> None:
+        for participant in self._participants:
+            await participant.flush()
+
+    async def after_commit(self) -> None:
+        for participant in self._participants:
+            await participant.after_commit()
+
+    async def clear(self) -> None:
+        for participant in self._participants:
+            await participant.clear()
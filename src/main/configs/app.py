@@ -1,19 +1,60 @@
+import asyncio
+import logging
+
+from typing import Awaitable, Callable
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.main.loaders.loaders import loader
+from src.infra.exceptions.database_acquire_timeout import DatabaseAcquireTimeoutException
+from src.infra.exceptions.database_pool_queue_full import DatabasePoolQueueFullException
+from src.infra.exceptions.database_not_ready import DatabaseNotReadyException
+from src.infra.exceptions.database_lock_timeout import DatabaseLockTimeoutException
+
+from src.services.exceptions.concurrent_machine_update import ConcurrentMachineUpdateException
+
+from src.main.configs.exception_handlers import database_unavailable_handler, concurrent_update_handler
+from src.main.loaders.loaders import loader, machine_changes_loader, replicas_loader
+
+from src.main.routes import machine_routes, health_routes, metrics_routes
+
+logger = logging.getLogger(__name__)
 
-from src.main.routes import machine_routes
+# seconds before a failed background task is started again
+_RESTART_DELAY: float = 1.0
 
 
 def application() -> FastAPI:
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
-        await loader()
+        tasks: dict[str, asyncio.Task] = {}
+        restarts: list[asyncio.TimerHandle] = []
+
+        # a background task that fails is logged and started again a little later, a worker whose pool
+        # could not warm up keeps trying instead of staying up without ever becoming ready
+        def start(name: str, run: Callable[[], Awaitable[None]]) -> None:
+            task: asyncio.Task = asyncio.create_task(run(), name=name)
+            task.add_done_callback(lambda done: restart(name, run, done))
+            tasks[name] = task
+
+        def restart(name: str, run: Callable[[], Awaitable[None]], task: asyncio.Task) -> None:
+            if task.cancelled() or task.exception() is None:
+                return
+            logger.error("background task %s failed, starting it again", name, exc_info=task.exception())
+            restarts.append(asyncio.get_running_loop().call_later(_RESTART_DELAY, start, name, run))
+
+        # the pool warms up in the background, "/health/ready" tells when the worker can take traffic
+        start("connecting", loader)
+        start("listening", machine_changes_loader)
+        start("watching", replicas_loader)
         yield
+        for handle in restarts:
+            handle.cancel()
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
 
     app = FastAPI(lifespan=lifespan)
 
@@ -27,6 +68,14 @@ def application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    app.add_exception_handler(DatabaseAcquireTimeoutException, database_unavailable_handler)
+    app.add_exception_handler(DatabasePoolQueueFullException, database_unavailable_handler)
+    app.add_exception_handler(DatabaseNotReadyException, database_unavailable_handler)
+    app.add_exception_handler(DatabaseLockTimeoutException, database_unavailable_handler)
+    app.add_exception_handler(ConcurrentMachineUpdateException, concurrent_update_handler)
+
     app.include_router(machine_routes.router)
+    app.include_router(health_routes.router)
+    app.include_router(metrics_routes.router)
 
     return app
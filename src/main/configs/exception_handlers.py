@@ -0,0 +1,19 @@
+import math
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+
+async def database_unavailable_handler(request: Request, error: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": {"error": {"message": str(error)}}},
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))},
+    )
+
+
+async def concurrent_update_handler(request: Request, error: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": {"error": {"message": str(error)}}},
+    )
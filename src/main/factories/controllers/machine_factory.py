@@ -1,33 +1,92 @@
+from functools import cache
+
+from src.domain.repositories.machine import IMachineRepository
+from src.domain.repositories.order import IOrderRepository
+from src.domain.repositories.payment import IPaymentRepository
+
 from src.presentation.controllers.machine import MachineController
 from src.presentation.controllers.decorators.machine_transaction_decorator import MachineTransactionDecorator
+from src.presentation.controllers.decorators.machine_lock_decorator import MachineLockDecorator
 from src.presentation.presenters.json_presenter import JSONPresenter
 
 from src.services.machine import MachineService
-from src.services.order import OrderService
-from src.services.payment import PaymentService
+from src.services.checkout import CheckoutService
 
-from src.services.contracts.database.base import IDatabasePoolConnection
+from src.services.contracts.controllers.machine import IMachineController
+from src.services.contracts.database.base import IDatabasePoolConnection, IDatabaseTransaction, IUnitOfWork
 
+from src.infra.locks.keyed_async_lock import KeyedAsyncLock
+from src.infra.locks.advisory_lock import PostgresAdvisoryLock
+from src.infra.database.scoped_transaction import ScopedTransaction
+from src.infra.database.lazy_transaction import LazyTransaction
 from src.infra.repositories.machine.psycopg2_machine_repository import Psycopg2MachineRepository
 from src.infra.repositories.order.psycopg2_order_repository import Psycopg2OrderRepository
 from src.infra.repositories.payment.psycopg2_payment_repository import Psycopg2PaymentRepository
+from src.infra.repositories.machine.identity_map_machine_repository import IdentityMapMachineRepository
+from src.infra.repositories.order.identity_map_order_repository import IdentityMapOrderRepository
+from src.infra.repositories.machine.scoped_machine_repository import ScopedMachineRepository
+from src.infra.repositories.machine.cached_machine_repository import CachedMachineRepository
+from src.infra.repositories.order.scoped_order_repository import ScopedOrderRepository
+from src.infra.repositories.unit_of_work import UnitOfWork
 
-from src.infra.database.postgres.psycopg2_transaction import Psycopg2Transaction
+from src.main.factories.infra.database_transaction import make_transaction
+from src.main.factories.infra.machine_catalog_cache import make_machine_catalog_cache
 
 
-def make_machine_controller(db_pool_conn: IDatabasePoolConnection) -> MachineController:
-    query_runner = Psycopg2Transaction(db_pool_conn)
+def _make_decorated_controller(
+    transaction: IDatabaseTransaction,
+    machine_repo: IMachineRepository,
+    order_repo: IOrderRepository,
+    payment_repo: IPaymentRepository,
+    unit_of_work: IUnitOfWork,
+    catalog_repo: IMachineRepository = None,
+) -> IMachineController:
+    machine_service = MachineService(machine_repo, catalog_repo)
+    checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
-    machine_repo = Psycopg2MachineRepository(query_runner)
-    order_repo = Psycopg2OrderRepository(query_runner)
-    payment_repo = Psycopg2PaymentRepository(query_runner)
+    json_presenter = JSONPresenter()
+    controller = MachineController(json_presenter, machine_service, checkout_service)
 
-    machine_service = MachineService(machine_repo)
-    order_service = OrderService(machine_repo, order_repo)
-    payment_service = PaymentService(order_repo, payment_repo)
+    # purchases of a machine queue in the worker before taking a connection, the advisory lock
+    # taken inside the transaction makes purchases from other workers wait as well
+    return MachineLockDecorator(
+        MachineTransactionDecorator(
+            MachineLockDecorator(controller, PostgresAdvisoryLock(transaction)),
+            transaction,
+            unit_of_work,
+            json_presenter,
+        ),
+        KeyedAsyncLock.get_instance(),
+    )
+
+
+class MachineControllerProvider:
+    def __init__(self, db_pool_conn: IDatabasePoolConnection):
+        self._db_pool_conn = db_pool_conn
+
+        self._transaction = ScopedTransaction()
+        self._catalog_cache = make_machine_catalog_cache()
+        self._machine_repo = Psycopg2MachineRepository(self._transaction)
+        self._order_repo = Psycopg2OrderRepository(self._transaction)
+        self._scoped_machine_repo = ScopedMachineRepository()
+        self._scoped_order_repo = ScopedOrderRepository()
+
+        self._controller = _make_decorated_controller(
+            self._transaction,
+            self._scoped_machine_repo,
+            self._scoped_order_repo,
+            Psycopg2PaymentRepository(self._transaction),
+            UnitOfWork([self._scoped_machine_repo, self._scoped_order_repo]),
+            CachedMachineRepository(self._machine_repo, self._catalog_cache),
+        )
+
+    def __call__(self) -> IMachineController:
+        self._transaction.enter_scope(LazyTransaction(make_transaction(self._db_pool_conn)))
+        self._scoped_machine_repo.enter_scope(IdentityMapMachineRepository(self._machine_repo, self._catalog_cache))
+        self._scoped_order_repo.enter_scope(IdentityMapOrderRepository(self._order_repo))
+        return self._controller
 
-    json_presenter = JSONPresenter()
-    controller = MachineController(json_presenter, machine_service, order_service, payment_service)
-    decorator = MachineTransactionDecorator(controller, query_runner)
 
-    return decorator
+@cache
+def make_machine_controller_provider(db_pool_conn: IDatabasePoolConnection) -> MachineControllerProvider:
+    return MachineControllerProvider(db_pool_conn)
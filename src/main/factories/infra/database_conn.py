@@ -1,5 +1,12 @@
+import os
+
+from src.services.contracts.database.base import IDatabasePoolConnection
+
 from src.infra.database.postgres.connection.psycopg2_connection import Psycopg2PoolConnection
+from src.infra.database.postgres.connection.psycopg3_connection import Psycopg3PoolConnection
 
 
-def make_conn():
+def make_conn() -> IDatabasePoolConnection:
+    if os.getenv("POSTGRES_DRIVER") == "psycopg3":
+        return Psycopg3PoolConnection.get_instance()
     return Psycopg2PoolConnection.get_instance()
@@ -0,0 +1,11 @@
+from src.services.contracts.database.base import IDatabasePoolConnection, IDatabaseTransaction
+
+from src.infra.database.postgres.connection.psycopg3_connection import Psycopg3PoolConnection
+from src.infra.database.postgres.psycopg2_transaction import Psycopg2Transaction
+from src.infra.database.postgres.psycopg3_transaction import Psycopg3Transaction
+
+
+def make_transaction(db_pool_conn: IDatabasePoolConnection) -> IDatabaseTransaction:
+    if isinstance(db_pool_conn, Psycopg3PoolConnection):
+        return Psycopg3Transaction(db_pool_conn)
+    return Psycopg2Transaction(db_pool_conn)
@@ -0,0 +1,12 @@
+import os
+
+from src.infra.cache.machine_catalog_cache import MachineCatalogCache
+
+
+def make_machine_catalog_cache() -> MachineCatalogCache:
+    # how stale a cached machine may get and how much of the worker it may take
+    return MachineCatalogCache.get_instance(
+        ttl=float(os.getenv("MACHINE_CACHE_TTL", "2")),
+        max_entries=int(os.getenv("MACHINE_CACHE_MAX_ENTRIES", "1024")),
+        max_bytes=int(os.getenv("MACHINE_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+    )
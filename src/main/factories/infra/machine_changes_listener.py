@@ -0,0 +1,14 @@
+import os
+
+from src.infra.database.postgres.connection.config import Config
+from src.infra.database.postgres.psycopg2_notification_listener import Psycopg2NotificationListener
+from src.infra.database.postgres.psycopg3_notification_listener import Psycopg3NotificationListener
+
+from src.main.factories.infra.machine_catalog_cache import make_machine_catalog_cache
+
+
+def make_machine_changes_listener(config: Config) -> Psycopg2NotificationListener | Psycopg3NotificationListener:
+    catalog_cache = make_machine_catalog_cache()
+    if os.getenv("POSTGRES_DRIVER") == "psycopg3":
+        return Psycopg3NotificationListener(config, "machine_changes", catalog_cache.invalidate, catalog_cache.clear)
+    return Psycopg2NotificationListener(config, "machine_changes", catalog_cache.invalidate, catalog_cache.clear)
@@ -1,17 +1,47 @@
 import os
 
-from src.infra.database.postgres.connection.psycopg2_connection import Psycopg2PoolConnection, Config
+from src.infra.database.postgres.connection.config import Config
 
+from src.main.factories.infra.database_conn import make_conn
+from src.main.factories.infra.machine_changes_listener import make_machine_changes_listener
 
-async def loader():
-    await Psycopg2PoolConnection.get_instance().connect(
-        Config(
-            user=os.getenv("POSTGRES_USER"),
-            password=os.getenv("POSTGRES_PASSWORD"),
-            db=os.getenv("POSTGRES_DB"),
-            host=os.getenv("POSTGRES_HOST"),
-            port=int(os.getenv("POSTGRES_PORT")),
-            min=int(os.getenv("POSTGRES_MIN")),
-            max=int(os.getenv("POSTGRES_MAX")),
-        )
+
+def _parse_replicas(addresses: str) -> list[tuple[str, int]]:
+    replicas: list[tuple[str, int]] = []
+    for address in addresses.split(","):
+        if address.strip() != "":
+            host, _, port = address.strip().rpartition(":")
+            replicas.append((host, int(port)))
+    return replicas
+
+
+def _make_config() -> Config:
+    return Config(
+        user=os.getenv("POSTGRES_USER"),
+        password=os.getenv("POSTGRES_PASSWORD"),
+        db=os.getenv("POSTGRES_DB"),
+        host=os.getenv("POSTGRES_HOST"),
+        port=int(os.getenv("POSTGRES_PORT")),
+        min=int(os.getenv("POSTGRES_MIN")),
+        max=int(os.getenv("POSTGRES_MAX")),
+        connect_timeout=float(os.getenv("POSTGRES_CONNECT_TIMEOUT", "30")),
+        acquire_timeout=float(os.getenv("POSTGRES_ACQUIRE_TIMEOUT", "5")),
+        max_waiting=int(os.getenv("POSTGRES_MAX_WAITING", "100")),
+        replicas=_parse_replicas(os.getenv("POSTGRES_REPLICAS", "")),
+        max_replica_lag=float(os.getenv("POSTGRES_MAX_REPLICA_LAG", "1")),
+        replica_check_interval=float(os.getenv("POSTGRES_REPLICA_CHECK_INTERVAL", "1")),
     )
+
+
+async def loader():
+    await make_conn().connect(_make_config())
+
+
+async def machine_changes_loader():
+    # machines changed by any worker are evicted from the catalog cache of this one
+    await make_machine_changes_listener(_make_config()).listen()
+
+
+async def replicas_loader():
+    # read replicas falling too far behind the primary stop taking reads until they catch up
+    await make_conn().watch_replicas()
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from src.main.factories.infra.database_conn import make_conn
+
+router = APIRouter()
+
+
+@router.get("/health/ready", status_code=status.HTTP_200_OK)
+async def get_health_ready():
+    if make_conn().is_ready():
+        return {"status": "ready"}
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "starting"})
@@ -1,24 +1,34 @@
 from typing import Literal, Annotated
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, status, Query, Body, Path
+from fastapi import APIRouter, HTTPException, status, Query, Body, Path, Depends
 from pydantic import BaseModel, Field
 
-from src.main.factories.controllers.machine_factory import make_machine_controller
+from src.main.factories.controllers.machine_factory import make_machine_controller_provider
 from src.main.factories.infra.database_conn import make_conn
 
+from src.domain.value_objects.coins import CoinsVector
 from src.domain.entities.payment import PaymentType
 
-from src.services.contracts.controllers.machine import ChooseProductInputControllerDTO, PayForProductInputControllerDTO
+from src.services.contracts.controllers.machine import (
+    ChooseProductInputControllerDTO,
+    PayForProductInputControllerDTO,
+    IMachineController,
+)
 
 router = APIRouter()
 
 
+# must stay a coroutine, FastAPI runs plain functions in a worker thread and the
+# request scope would not be visible to the route
+async def machine_controller() -> IMachineController:
+    return make_machine_controller_provider(make_conn())()
+
+
 @router.get("/v1/machine/{machine_id}/choose_product/{product_code}", status_code=status.HTTP_200_OK)
 async def get_machine_choose_product(
     machine_id: Annotated[str, Path(title="The ID from the machine")],
     product_code: Annotated[str, Path(title="The CODE from the product")],
+    controller: Annotated[IMachineController, Depends(machine_controller)],
 ):
-    controller = make_machine_controller(make_conn())
     result = await controller.choose_product(ChooseProductInputControllerDTO(product_code, machine_id))
     if result[1] == 200:
         return result[0]
@@ -33,6 +43,18 @@ class PayForProductRequestBody(BaseModel):
     coin_50_qty: int = Field(default=0, title="Quantity of 50 cent coins inserted in the machine")
     coin_100_qty: int = Field(default=0, title="Quantity of 1 dollar coins inserted in the machine")
 
+    @property
+    def coins(self) -> CoinsVector:
+        # negative quantities never counted as inserted coins
+        return CoinsVector.create(
+            max(self.coin_01_qty, 0),
+            max(self.coin_05_qty, 0),
+            max(self.coin_10_qty, 0),
+            max(self.coin_25_qty, 0),
+            max(self.coin_50_qty, 0),
+            max(self.coin_100_qty, 0),
+        )
+
 
 class PayForProductQueryParameters(BaseModel):
     model_config = {"extra": "forbid"}
@@ -47,21 +69,15 @@ async def post_machine_pay_for_product(
     product_id: Annotated[str, Path(title="The ID from the product")],
     body: Annotated[PayForProductRequestBody, Body()],
     query: Annotated[PayForProductQueryParameters, Query()],
+    controller: Annotated[IMachineController, Depends(machine_controller)],
 ):
-    controller = make_machine_controller(make_conn())
     result = await controller.pay_for_product(
         PayForProductInputControllerDTO(
             machine_id,
             product_id,
             int(query.product_qty),
             PaymentType[query.payment_type],
-            body.coin_01_qty,
-            body.coin_05_qty,
-            body.coin_10_qty,
-            body.coin_25_qty,
-            body.coin_50_qty,
-            body.coin_100_qty,
-            datetime.now().isoformat(timespec="seconds"),
+            body.coins,
         )
     )
     if result[1] == 201:
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from src.infra.database.postgres.pool_metrics import PoolMetrics
+from src.infra.locks.lock_metrics import LockMetrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK, response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(
+        PoolMetrics.get_instance().render() + LockMetrics.get_instance().render(),
+        media_type="text/plain; version=0.0.4",
+    )
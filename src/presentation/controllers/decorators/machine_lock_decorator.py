@@ -0,0 +1,27 @@
+from typing import Any
+
+from src.services.contracts.locks.base import IKeyedLock
+
+from src.services.contracts.controllers.machine import (
+    IMachineController,
+    ChooseProductInputControllerDTO,
+    PayForProductInputControllerDTO,
+)
+
+
+# A machine serves one customer at a time, purchases of the same machine wait for each other
+# here instead of racing through the machine state and having all but one rolled back
+class MachineLockDecorator(IMachineController):
+    def __init__(self, decoratee: IMachineController, lock: IKeyedLock):
+        self._decoratee = decoratee
+        self._lock = lock
+
+    async def choose_product(self, input_dto: ChooseProductInputControllerDTO) -> Any:
+        return await self._decoratee.choose_product(input_dto)
+
+    async def pay_for_product(self, input_dto: PayForProductInputControllerDTO) -> Any:
+        await self._lock.acquire(input_dto.machine_id)
+        try:
+            return await self._decoratee.pay_for_product(input_dto)
+        finally:
+            await self._lock.release(input_dto.machine_id)
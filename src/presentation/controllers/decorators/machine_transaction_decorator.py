@@ -1,6 +1,6 @@
 from typing import Any
 
-from src.services.contracts.database.base import IDatabaseTransaction
+from src.services.contracts.database.base import IDatabaseTransaction, IUnitOfWork
 
 from src.services.contracts.controllers.machine import (
     IMachineController,
@@ -8,36 +8,89 @@ from src.services.contracts.controllers.machine import (
     PayForProductInputControllerDTO,
 )
 
+from src.presentation.contracts.presenters.base import BasePresenter
+from src.presentation.presenters.json_presenter import JSONPresenter
+from src.presentation.controllers.machine import (
+    DATABASE_UNAVAILABLE_ERRORS,
+    PayForProductErrorOutputControllerDTO,
+)
+
 
 class MachineTransactionDecorator(IMachineController):
     def __init__(
         self,
         decoratee: IMachineController,
         transaction: IDatabaseTransaction,
+        unit_of_work: IUnitOfWork = None,
+        presenter: BasePresenter = None,
     ):
         self._decoratee = decoratee
         self._transaction = transaction
+        self._unit_of_work = unit_of_work
+        self._presenter = presenter if presenter is not None else JSONPresenter()
+
+    async def _commit(self) -> None:
+        try:
+            try:
+                if self._unit_of_work is not None:
+                    await self._unit_of_work.flush()
+                await self._transaction.commit()
+            except Exception:
+                await self._transaction.rollback()
+                raise
+            if self._unit_of_work is not None:
+                await self._unit_of_work.after_commit()
+        finally:
+            await self._release()
+
+    async def _rollback(self) -> None:
+        try:
+            await self._transaction.rollback()
+        finally:
+            await self._release()
+
+    async def _release(self) -> None:
+        if self._unit_of_work is not None:
+            await self._unit_of_work.clear()
+        await self._transaction.release()
 
     async def choose_product(self, input_dto: ChooseProductInputControllerDTO) -> Any:
+        # nothing is written while choosing a product, so there is no BEGIN and no COMMIT to wait for
+        # and the product may be read from a replica
+        await self._transaction.open_read_only_transaction()
         await self._transaction.create_client()
-        await self._transaction.open_transaction()
-        response = await self._decoratee.choose_product(input_dto)
-        if response[1] == 200:
-            await self._transaction.commit()
-            await self._transaction.release()
-        else:
-            await self._transaction.rollback()
-            await self._transaction.release()
-        return response
+        try:
+            return await self._decoratee.choose_product(input_dto)
+        finally:
+            await self._release()
 
     async def pay_for_product(self, input_dto: PayForProductInputControllerDTO) -> Any:
+        # purchases of a machine are serialised by the machine locks around this decorator, so nothing
+        # else writes the machine between its read and the commit and there is nothing to retry
         await self._transaction.create_client()
-        await self._transaction.open_transaction()
-        response = await self._decoratee.pay_for_product(input_dto)
-        if response[1] == 201:
-            await self._transaction.commit()
-            await self._transaction.release()
-        else:
-            await self._transaction.rollback()
-            await self._transaction.release()
+        try:
+            await self._transaction.open_transaction()
+            response = await self._decoratee.pay_for_product(input_dto)
+        except BaseException:
+            # whatever the purchase raised, even a cancellation, its connection goes back to the
+            # pool and nothing it read or wrote is kept for the next request
+            await self._rollback()
+            raise
+        if response[1] != 201:
+            await self._rollback()
+            return response
+        try:
+            await self._commit()
+        except Exception as error:
+            if (
+                type(error).__name__ in DATABASE_UNAVAILABLE_ERRORS
+                or type(error).__name__ == "ConcurrentMachineUpdateException"
+            ):
+                raise
+            # deferred writes only reach the database here, a write refused at the commit is answered
+            # the way the controller answers a failed purchase, with the coins handed back
+            return (
+                self._presenter.execute(PayForProductErrorOutputControllerDTO(str(error), input_dto.coins)),
+                500,
+            )
         return response
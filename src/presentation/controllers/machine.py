@@ -1,23 +1,14 @@
 from typing import Any
 
+from src.domain.value_objects.coins import CoinsVector
+
 from src.domain.contracts.dtos.base import BaseOutput
 
-from src.domain.contracts.dtos.machine import (
-    ChooseProductOutputDTO,
-    ChooseProductInputDTO,
-    AddCoinsInputDTO,
-    AllowDispenseInputDTO,
-    DeliverProductInputDTO,
-    FinishDispenseInputDTO,
-)
-from src.domain.contracts.dtos.order import CreateOrderInputDTO, CreateOrderOutputDTO
-from src.domain.contracts.dtos.payment import (
-    PayForProductInputDTO,
-)
+from src.domain.contracts.dtos.machine import ChooseProductOutputDTO, ChooseProductInputDTO
+from src.domain.contracts.dtos.checkout import CheckoutInputDTO
 
 from src.domain.contracts.services.machine import IMachineService
-from src.domain.contracts.services.order import IOrderService
-from src.domain.contracts.services.payment import IPaymentService
+from src.domain.contracts.services.checkout import ICheckoutService
 
 from src.services.contracts.controllers.machine import (
     ChooseProductInputControllerDTO,
@@ -27,6 +18,14 @@ from src.services.contracts.controllers.machine import (
 
 from src.presentation.contracts.presenters.base import BasePresenter
 
+# raised while taking a pooled connection, the app answers them with 503 and Retry-After
+DATABASE_UNAVAILABLE_ERRORS = (
+    "DatabaseNotReadyException",
+    "DatabaseAcquireTimeoutException",
+    "DatabasePoolQueueFullException",
+    "DatabaseLockTimeoutException",
+)
+
 
 class ChooseProductErrorOutputControllerDTO(BaseOutput):
     def __init__(self, message: str):
@@ -37,36 +36,15 @@ class ChooseProductErrorOutputControllerDTO(BaseOutput):
 
 
 class PayForProductErrorOutputControllerDTO(BaseOutput):
-    def __init__(
-        self,
-        message: str,
-        coin_01_qty: int,
-        coin_05_qty: int,
-        coin_10_qty: int,
-        coin_25_qty: int,
-        coin_50_qty: int,
-        coin_100_qty: int,
-    ):
+    def __init__(self, message: str, coins: CoinsVector):
         self.message = message
-        self.coin_01_qty = coin_01_qty
-        self.coin_05_qty = coin_05_qty
-        self.coin_10_qty = coin_10_qty
-        self.coin_25_qty = coin_25_qty
-        self.coin_50_qty = coin_50_qty
-        self.coin_100_qty = coin_100_qty
+        self.coins = coins
 
     def to_dict(self) -> Any:
         return {
             "error": {
                 "message": self.message,
-                "data": {
-                    "coin_01": self.coin_01_qty,
-                    "coin_05": self.coin_05_qty,
-                    "coin_10": self.coin_10_qty,
-                    "coin_25": self.coin_25_qty,
-                    "coin_50": self.coin_50_qty,
-                    "coin_100": self.coin_100_qty,
-                },
+                "data": {f"coin_{coin.value:02d}": qty for coin, qty in self.coins.items()},
             }
         }
 
@@ -76,13 +54,11 @@ class MachineController(IMachineController):
         self,
         presenter: BasePresenter,
         machine_service: IMachineService,
-        order_service: IOrderService,
-        payment_service: IPaymentService,
+        checkout_service: ICheckoutService,
     ):
         self._presenter = presenter
         self._machine_service = machine_service
-        self._order_service = order_service
-        self._payment_service = payment_service
+        self._checkout_service = checkout_service
 
     async def choose_product(self, input_dto: ChooseProductInputControllerDTO) -> Any:
         try:
@@ -91,6 +67,8 @@ class MachineController(IMachineController):
             )
             return self._presenter.execute(output), 200
         except Exception as error:
+            if type(error).__name__ in DATABASE_UNAVAILABLE_ERRORS:
+                raise
             if (
                 type(error).__name__ == "UnregisteredMachineException"
                 or type(error).__name__ == "ProductDoesNotExistException"
@@ -103,50 +81,22 @@ class MachineController(IMachineController):
 
     async def pay_for_product(self, input_dto: PayForProductInputControllerDTO) -> Any:
         try:
-            add_coins_output = await self._machine_service.add_coins(
-                AddCoinsInputDTO(
+            checkout_output = await self._checkout_service.checkout(
+                CheckoutInputDTO(
                     input_dto.machine_id,
                     input_dto.product_id,
-                    input_dto.coin_01_qty,
-                    input_dto.coin_05_qty,
-                    input_dto.coin_10_qty,
-                    input_dto.coin_25_qty,
-                    input_dto.coin_50_qty,
-                    input_dto.coin_100_qty,
-                )
-            )
-            create_order_output: CreateOrderOutputDTO = await self._order_service.create(
-                CreateOrderInputDTO(input_dto.machine_id, input_dto.product_id, input_dto.product_qty)
-            )
-            await self._payment_service.pay_for_product(
-                PayForProductInputDTO(
-                    create_order_output.order_id,
-                    input_dto.machine_id,
-                    add_coins_output.amount_paid,
+                    input_dto.product_qty,
                     input_dto.payment_type,
-                    input_dto.order_created_at,
+                    input_dto.coins,
                 )
             )
-            await self._machine_service.allow_dispense(AllowDispenseInputDTO(input_dto.machine_id))
-            await self._machine_service.deliver_product(
-                DeliverProductInputDTO(input_dto.machine_id, input_dto.product_id, input_dto.product_qty)
-            )
-            await self._machine_service.finish_dispense(FinishDispenseInputDTO(input_dto.machine_id))
-            return self._presenter.execute(add_coins_output), 201
+            return self._presenter.execute(checkout_output), 201
         except Exception as error:
+            if type(error).__name__ in DATABASE_UNAVAILABLE_ERRORS:
+                raise
             if type(error).__name__ == "MachineIsNotReadyException":
                 return (
-                    self._presenter.execute(
-                        PayForProductErrorOutputControllerDTO(
-                            str(error),
-                            input_dto.coin_01_qty,
-                            input_dto.coin_05_qty,
-                            input_dto.coin_10_qty,
-                            input_dto.coin_25_qty,
-                            input_dto.coin_50_qty,
-                            input_dto.coin_100_qty,
-                        )
-                    ),
+                    self._presenter.execute(PayForProductErrorOutputControllerDTO(str(error), input_dto.coins)),
                     400,
                 )
             if (
@@ -156,45 +106,15 @@ class MachineController(IMachineController):
                 or type(error).__name__ == "NoChangeAvailableException"
             ):
                 return (
-                    self._presenter.execute(
-                        PayForProductErrorOutputControllerDTO(
-                            str(error),
-                            input_dto.coin_01_qty,
-                            input_dto.coin_05_qty,
-                            input_dto.coin_10_qty,
-                            input_dto.coin_25_qty,
-                            input_dto.coin_50_qty,
-                            input_dto.coin_100_qty,
-                        )
-                    ),
+                    self._presenter.execute(PayForProductErrorOutputControllerDTO(str(error), input_dto.coins)),
                     404,
                 )
             if type(error).__name__ == "IncorrectNegativeChangeException":
                 return (
-                    self._presenter.execute(
-                        PayForProductErrorOutputControllerDTO(
-                            str(error),
-                            input_dto.coin_01_qty,
-                            input_dto.coin_05_qty,
-                            input_dto.coin_10_qty,
-                            input_dto.coin_25_qty,
-                            input_dto.coin_50_qty,
-                            input_dto.coin_100_qty,
-                        )
-                    ),
+                    self._presenter.execute(PayForProductErrorOutputControllerDTO(str(error), input_dto.coins)),
                     416,
                 )
             return (
-                self._presenter.execute(
-                    PayForProductErrorOutputControllerDTO(
-                        str(error),
-                        input_dto.coin_01_qty,
-                        input_dto.coin_05_qty,
-                        input_dto.coin_10_qty,
-                        input_dto.coin_25_qty,
-                        input_dto.coin_50_qty,
-                        input_dto.coin_100_qty,
-                    )
-                ),
+                self._presenter.execute(PayForProductErrorOutputControllerDTO(str(error), input_dto.coins)),
                 500,
             )
@@ -0,0 +1,114 @@
+from src.domain.entities.machine import MachineEntity, MachineState, CoinsChange
+from src.domain.entities.product import ProductEntity
+from src.domain.entities.order_item import OrderItemEntity
+from src.domain.entities.order import OrderEntity
+from src.domain.entities.payment import CashPaymentEntity, PaymentEntity, PaymentType
+
+from src.domain.value_objects.uuid import UUIDValueObject
+from src.domain.value_objects.coins import CoinsVector
+
+from src.domain.repositories.machine import IMachineRepository
+from src.domain.repositories.order import IOrderRepository
+from src.domain.repositories.payment import IPaymentRepository
+
+from src.domain.contracts.dtos.checkout import CheckoutInputDTO
+from src.domain.contracts.dtos.machine import AddCoinsOutputDTO
+
+from src.domain.contracts.services.checkout import (
+    ICheckoutService,
+)
+
+from src.services.exceptions.unregistered_machine import UnregisteredMachineException
+from src.services.exceptions.machine_is_not_ready import MachineIsNotReadyException
+from src.services.exceptions.product_does_not_exist import ProductDoesNotExistException
+from src.services.exceptions.unavailable_product import UnavailableProductException
+from src.services.exceptions.incorrect_negative_change import (
+    IncorrectNegativeChangeException,
+)
+from src.services.exceptions.not_enough_for_payment import NotEnoughForPaymentException
+from src.services.exceptions.invalid_payment_type import InvalidPaymentTypeException
+
+
+class CheckoutService(ICheckoutService):
+    def __init__(
+        self,
+        machine_repo: IMachineRepository,
+        order_repo: IOrderRepository,
+        payment_repo: IPaymentRepository,
+    ):
+        self.__machine_repo: IMachineRepository = machine_repo
+        self.__order_repo: IOrderRepository = order_repo
+        self.__payment_repo: IPaymentRepository = payment_repo
+
+    async def checkout(self, input_dto: CheckoutInputDTO) -> AddCoinsOutputDTO:
+        machine_found: MachineEntity = await self.__machine_repo.find_by_id(
+            UUIDValueObject.create(input_dto.machine_id)
+        )
+        if not machine_found:
+            raise UnregisteredMachineException(input_dto.machine_id)
+        if machine_found.state != MachineState.READY:
+            raise MachineIsNotReadyException()
+
+        product_found: ProductEntity = machine_found.find_product_by_id(input_dto.product_id)
+
+        if not product_found:
+            raise ProductDoesNotExistException()
+        if product_found.qty == 0:
+            raise UnavailableProductException(product_found.id.value)
+
+        coins_inserted: CoinsVector = input_dto.coins
+
+        amount: int = machine_found.get_amount_out_of_coins(coins_inserted)
+
+        change: int = amount - product_found.unit_price
+
+        if change < 0:
+            raise IncorrectNegativeChangeException()
+
+        machine_found.add_coins(coins_inserted)
+
+        coins: CoinsChange = machine_found.get_coins_from_change(change)
+
+        amount_paid: int = product_found.unit_price
+
+        if product_found.qty < input_dto.product_qty:
+            raise UnavailableProductException(product_found.id.value)
+
+        order_item: OrderItemEntity = OrderItemEntity.create_new(
+            UUIDValueObject.create_new(time_ordered=True).value, input_dto.product_qty, product_found
+        )
+        order: OrderEntity = OrderEntity.create_new(
+            UUIDValueObject.create_new(time_ordered=True).value, input_dto.machine_id, [order_item]
+        )
+
+        if order.total_amount > amount_paid:
+            raise NotEnoughForPaymentException(amount_paid, order.id.value)
+
+        payment: PaymentEntity = None
+
+        if input_dto.payment_type == PaymentType.CASH:
+            payment = CashPaymentEntity.create(
+                UUIDValueObject.create_new(time_ordered=True).value,
+                order.id.value,
+                order.total_amount,
+                amount_paid,
+            )
+
+        if payment is None:
+            raise InvalidPaymentTypeException(str(input_dto.payment_type))
+
+        # saving the order reserves its items from the machine stock
+        await self.__order_repo.save(order)
+
+        machine_found.start_dispense_product()
+
+        if product_found.qty < input_dto.product_qty:
+            raise UnavailableProductException(product_found.id.value)
+
+        machine_found.deliver_product(product_found.id)
+        machine_found.finish_dispense_product()
+
+        await self.__payment_repo.save(payment)
+        await self.__machine_repo.update(machine_found)
+
+        return AddCoinsOutputDTO(coins, amount_paid)
@@ -18,6 +18,21 @@ class IDatabasePoolConnection(ABC):
         """Function used to get the client pool from the database connection pool"""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_read_pool(self) -> Any:
+        """Function used to get the client pool of a replica caught up with the primary, the primary one otherwise"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def watch_replicas(self) -> None:
+        """Function used to keep measuring how far behind the primary every read replica is"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_ready(self) -> bool:
+        """Function used to tell if the pool finished warming up and can hand out clients"""
+        raise NotImplementedError
+
 
 class IDatabaseQuery(ABC):
     @abstractmethod
@@ -25,6 +40,11 @@ class IDatabaseQuery(ABC):
         """Function used to query data from database"""
         raise NotImplementedError
 
+    @abstractmethod
+    async def defer_query(self, input_data: Any) -> None:
+        """Function used to hold back a statement whose result is not read until the next query or the commit"""
+        raise NotImplementedError
+
     @abstractmethod
     async def fetchall(self) -> Any:
         """Function used to fetch results from the cursor"""
@@ -37,6 +57,11 @@ class IDatabaseTransaction(IDatabaseQuery):
         """Function used to open a transaction to database after getting a connection client"""
         raise NotImplementedError
 
+    @abstractmethod
+    async def open_read_only_transaction(self) -> None:
+        """Function used to read without BEGIN nor COMMIT, called before `create_client` it may read from a replica"""
+        raise NotImplementedError
+
     @abstractmethod
     async def release(self) -> None:
         """Function used to release client and return it to pool"""
@@ -61,3 +86,20 @@ class IDatabaseTransaction(IDatabaseQuery):
     async def close(self) -> None:
         """Function used to close pool connection"""
         raise NotImplementedError
+
+
+class IUnitOfWork(ABC):
+    @abstractmethod
+    async def flush(self) -> None:
+        """Function used to persist every entity changed during the transaction"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def after_commit(self) -> None:
+        """Function used to run what has to wait until the transaction is committed"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Function used to forget every entity tracked during the transaction"""
+        raise NotImplementedError
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+
+class IKeyedLock(ABC):
+    @abstractmethod
+    async def acquire(self, key: str) -> None:
+        """Function used to wait until no one else holds the lock of `key` and take it"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Function used to hand the lock of `key` to the next one waiting for it"""
+        raise NotImplementedError
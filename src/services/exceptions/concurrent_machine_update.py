@@ -0,0 +1,4 @@
+class ConcurrentMachineUpdateException(Exception):
+    def __init__(self):
+        message = "machine was changed by another operation"
+        super().__init__(message)
@@ -1,4 +0,0 @@
-class MachineIsNotDispensingException(Exception):
-    def __init__(self):
-        message = "machine is not DISPENSING for operation"
-        super().__init__(message)
@@ -5,26 +5,33 @@ from fastapi.testclient import TestClient
 
 from src.services.contracts.database.base import IDatabaseTransaction
 
-from src.infra.database.postgres.psycopg2_transaction import Psycopg2Transaction
-from src.infra.database.postgres.connection.psycopg2_connection import Psycopg2PoolConnection
+from src.infra.cache.machine_catalog_cache import MachineCatalogCache
 
 from src.main.bootstrap.bootstrap import load
 from src.main.configs.app import application
 from src.main.loaders.loaders import loader
+from src.main.factories.infra.database_conn import make_conn
+from src.main.factories.infra.database_transaction import make_transaction as make_query_runner
 
 
 def make_transaction() -> IDatabaseTransaction:
-    query_runner = Psycopg2Transaction(Psycopg2PoolConnection.get_instance())
+    query_runner = make_query_runner(make_conn())
 
     return query_runner
 
 
 class Test_E2E_Pay_For_Product:
-    @pytest_asyncio.fixture(scope="class", autouse=True)
-    async def bootstrap_and_load(self):
-        load()
-        await loader()
-        yield
+    @pytest_asyncio.fixture(scope="class", autouse=True, params=["psycopg2", "psycopg3"])
+    async def bootstrap_and_load(self, request: pytest.FixtureRequest):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setenv("POSTGRES_DRIVER", request.param)
+            load()
+            await loader()
+            yield
+            conn = make_conn()
+            await conn.disconnect()
+            type(conn).reset_instance()
+            MachineCatalogCache.reset_instance()
 
     @pytest_asyncio.fixture(scope="function", autouse=True)
     async def manage_data(self):
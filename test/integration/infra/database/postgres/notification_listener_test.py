@@ -0,0 +1,239 @@
+import os
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from src.services.contracts.database.base import IDatabaseTransaction
+
+from src.infra.database.postgres.psycopg2_transaction import Psycopg2Transaction
+from src.infra.database.postgres.connection.config import Config
+from src.infra.database.postgres.connection.psycopg2_connection import Psycopg2PoolConnection
+from src.infra.database.postgres.psycopg2_notification_listener import Psycopg2NotificationListener
+from src.infra.database.postgres.psycopg3_notification_listener import Psycopg3NotificationListener
+
+from src.main.bootstrap.bootstrap import load
+from src.main.loaders.loaders import loader
+
+
+def make_transaction() -> IDatabaseTransaction:
+    query_runner = Psycopg2Transaction(Psycopg2PoolConnection.get_instance())
+
+    return query_runner
+
+
+def make_config() -> Config:
+    return Config(
+        user=os.getenv("POSTGRES_USER"),
+        password=os.getenv("POSTGRES_PASSWORD"),
+        db=os.getenv("POSTGRES_DB"),
+        host=os.getenv("POSTGRES_HOST"),
+        port=int(os.getenv("POSTGRES_PORT")),
+        min=1,
+        max=1,
+    )
+
+
+@pytest.fixture(params=[Psycopg2NotificationListener, Psycopg3NotificationListener])
+def listener_class(request):
+    return request.param
+
+
+class Test_Postgres_Notification_Listener:
+    @pytest_asyncio.fixture(scope="class", autouse=True)
+    async def bootstrap_and_load(self):
+        load()
+        await loader()
+        yield
+        await Psycopg2PoolConnection.get_instance().disconnect()
+
+    @pytest_asyncio.fixture(scope="function", autouse=True)
+    async def manage_data(self):
+        transaction = make_transaction()
+
+        await transaction.create_client()
+        await transaction.open_transaction()
+
+        await transaction.query(
+            {
+                "text": """INSERT INTO products_schema.products (id, name, unit_price) VALUES ('223e4567-e89b-12d3-a456-426614174003', 'Pepsi', 150);""",
+                "values": [],
+            }
+        )
+        await transaction.query(
+            {
+                "text": """
+                    SELECT fn_create_machine_partition(
+                        ROW(
+                            'a8351752-ec32-4578-bdb6-883d703cbee7'::UUID,
+                            'READY'::machine_state,
+                            0,
+                            0,
+                            0,
+                            0,
+                            0,
+                            0
+                        )::machine_type,
+                        ROW(
+                            '223e4567-e89b-12d3-a456-426614174001'::UUID,
+                            'Jane Doe',
+                            'jane.doe@example.com'
+                        )::owner_type,
+                        ARRAY[
+                            ROW(
+                                '223e4567-e89b-12d3-a456-426614174003'::UUID,
+                                'Pepsi',
+                                150,
+                                10
+                            )::product_type
+                        ]::product_type[]
+                    );
+                """,
+                "values": [],
+            }
+        )
+
+        await transaction.commit()
+        await transaction.release()
+
+        yield
+
+        await transaction.create_client()
+        await transaction.open_transaction()
+
+        await transaction.query(
+            {
+                "text": """DELETE FROM machines_schema.machine_products;""",
+                "values": [],
+            }
+        )
+        await transaction.query(
+            {
+                "text": """DELETE FROM machines_schema.machines;""",
+                "values": [],
+            }
+        )
+        await transaction.query(
+            {
+                "text": """DELETE FROM machines_schema.owners;""",
+                "values": [],
+            }
+        )
+        await transaction.query(
+            {
+                "text": """DELETE FROM products_schema.products;""",
+                "values": [],
+            }
+        )
+
+        await transaction.commit()
+        await transaction.release()
+
+    @pytest.mark.asyncio
+    async def test_should_receive_machine_id_once_stock_change_is_committed(self, listener_class):
+        payloads: list[str] = []
+        listening = asyncio.Event()
+        notified = asyncio.Event()
+
+        def on_notify(payload: str) -> None:
+            payloads.append(payload)
+            notified.set()
+
+        listener = listener_class(make_config(), "machine_changes", on_notify, listening.set)
+        task = asyncio.create_task(listener.listen())
+
+        try:
+            await asyncio.wait_for(listening.wait(), 5)
+
+            transaction = make_transaction()
+
+            await transaction.create_client()
+            await transaction.open_transaction()
+            await transaction.query(
+                {
+                    "text": "UPDATE machines_schema.machine_products SET product_qty = product_qty - 1 WHERE machine_id = %s",
+                    "values": ("a8351752-ec32-4578-bdb6-883d703cbee7",),
+                }
+            )
+            await transaction.query(
+                {
+                    "text": "UPDATE machines_schema.machines SET coin_01_qty = 1 WHERE id = %s",
+                    "values": ("a8351752-ec32-4578-bdb6-883d703cbee7",),
+                }
+            )
+
+            await asyncio.sleep(0.1)
+            assert payloads == []
+
+            await transaction.commit()
+            await transaction.release()
+
+            await asyncio.wait_for(notified.wait(), 5)
+            await asyncio.sleep(0.1)
+        finally:
+            task.cancel()
+
+        assert payloads == ["a8351752-ec32-4578-bdb6-883d703cbee7"]
+
+    @pytest.mark.asyncio
+    async def test_should_not_notify_when_nothing_changed(self, listener_class):
+        payloads: list[str] = []
+        listening = asyncio.Event()
+
+        listener = listener_class(make_config(), "machine_changes", payloads.append, listening.set)
+        task = asyncio.create_task(listener.listen())
+
+        try:
+            await asyncio.wait_for(listening.wait(), 5)
+
+            transaction = make_transaction()
+
+            await transaction.create_client()
+            await transaction.open_transaction()
+            await transaction.query(
+                {
+                    "text": "UPDATE machines_schema.machines SET coin_01_qty = 0 WHERE id = %s",
+                    "values": ("a8351752-ec32-4578-bdb6-883d703cbee7",),
+                }
+            )
+            await transaction.commit()
+            await transaction.release()
+
+            await asyncio.sleep(0.2)
+        finally:
+            task.cancel()
+
+        assert payloads == []
+
+    @pytest.mark.asyncio
+    async def test_should_listen_again_after_losing_the_connection(self, listener_class):
+        reconnections: list[int] = []
+        listening = asyncio.Event()
+
+        def on_reconnect() -> None:
+            reconnections.append(1)
+            listening.set()
+
+        listener = listener_class(make_config(), "machine_changes", lambda payload: None, on_reconnect)
+        task = asyncio.create_task(listener.listen())
+
+        try:
+            await asyncio.wait_for(listening.wait(), 5)
+            listening.clear()
+
+            transaction = make_transaction()
+
+            await transaction.create_client()
+            await transaction.query(
+                {
+                    "text": "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE query = 'LISTEN machine_changes'",
+                    "values": (),
+                }
+            )
+            await transaction.release()
+
+            await asyncio.wait_for(listening.wait(), 5)
+        finally:
+            task.cancel()
+
+        assert len(reconnections) == 2
@@ -3,6 +3,7 @@ import pytest
 from src.domain.entities.owner import OwnerEntity
 from src.domain.entities.product import ProductEntity
 from src.domain.entities.machine import MachineEntity, MachineState
+from src.domain.value_objects.coins import CoinsVector, CoinTypes
 
 from src.domain.exceptions.invalid_coins_qty import InvalidCoinsQtyException
 from src.domain.exceptions.no_change_available import NoChangeAvailableException
@@ -39,12 +40,7 @@ def test_should_get_id():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         [],
     )
     assert machine.id.value == "a8351752-ec32-4578-bdb6-883d703cbee7"
@@ -59,12 +55,7 @@ def test_should_get_state():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         [],
     )
     assert machine.state == MachineState.READY
@@ -79,12 +70,7 @@ def test_should_start_dispense_product():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         [],
     )
     machine.start_dispense_product()
@@ -100,12 +86,7 @@ def test_should_finish_dispense_product():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.DISPENSING,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         [],
     )
     machine.finish_dispense_product()
@@ -121,15 +102,10 @@ def test_should_get_coin_01():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         [],
     )
-    assert machine.coin_01.qty == 0
+    assert machine.coins[CoinTypes.COIN_01] == 0
 
 
 def test_should_get_coin_05():
@@ -141,15 +117,10 @@ def test_should_get_coin_05():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         [],
     )
-    assert machine.coin_05.qty == 0
+    assert machine.coins[CoinTypes.COIN_05] == 0
 
 
 def test_should_get_coin_10():
@@ -161,15 +132,10 @@ def test_should_get_coin_10():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         [],
     )
-    assert machine.coin_10.qty == 0
+    assert machine.coins[CoinTypes.COIN_10] == 0
 
 
 def test_should_get_coin_25():
@@ -181,15 +147,10 @@ def test_should_get_coin_25():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         [],
     )
-    assert machine.coin_25.qty == 0
+    assert machine.coins[CoinTypes.COIN_25] == 0
 
 
 def test_should_get_coin_50():
@@ -201,15 +162,10 @@ def test_should_get_coin_50():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         [],
     )
-    assert machine.coin_50.qty == 0
+    assert machine.coins[CoinTypes.COIN_50] == 0
 
 
 def test_should_get_coin_100():
@@ -221,15 +177,10 @@ def test_should_get_coin_100():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         [],
     )
-    assert machine.coin_100.qty == 0
+    assert machine.coins[CoinTypes.COIN_100] == 0
 
 
 def test_should_get_products():
@@ -246,12 +197,7 @@ def test_should_get_products():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         products,
     )
     assert machine.products[0].id.value == "b9651752-6c44-4578-bdb6-883d703cbfff"
@@ -271,12 +217,7 @@ def test_should_get_owner():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         products,
     )
     assert machine.owner.id.value == "b9651752-6c44-4578-bdb6-883d703cbff5"
@@ -294,23 +235,18 @@ def test_should_add_coins():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         products,
     )
 
-    machine.add_coins(1, 1, 1, 1, 1, 1)
+    machine.add_coins(CoinsVector.create(1, 1, 1, 1, 1, 1))
 
-    assert machine.coin_01.qty == 1
-    assert machine.coin_05.qty == 1
-    assert machine.coin_10.qty == 1
-    assert machine.coin_25.qty == 1
-    assert machine.coin_50.qty == 1
-    assert machine.coin_100.qty == 1
+    assert machine.coins[CoinTypes.COIN_01] == 1
+    assert machine.coins[CoinTypes.COIN_05] == 1
+    assert machine.coins[CoinTypes.COIN_10] == 1
+    assert machine.coins[CoinTypes.COIN_25] == 1
+    assert machine.coins[CoinTypes.COIN_50] == 1
+    assert machine.coins[CoinTypes.COIN_100] == 1
 
 
 def test_should_subtract_coins():
@@ -323,23 +259,18 @@ def test_should_subtract_coins():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        1,
-        1,
-        1,
-        1,
-        1,
-        1,
+        CoinsVector.create(1, 1, 1, 1, 1, 1),
         products,
     )
 
-    machine.subtract_coins(1, 1, 1, 1, 1, 1)
+    machine.subtract_coins(CoinsVector.create(1, 1, 1, 1, 1, 1))
 
-    assert machine.coin_01.qty == 0
-    assert machine.coin_05.qty == 0
-    assert machine.coin_10.qty == 0
-    assert machine.coin_25.qty == 0
-    assert machine.coin_50.qty == 0
-    assert machine.coin_100.qty == 0
+    assert machine.coins[CoinTypes.COIN_01] == 0
+    assert machine.coins[CoinTypes.COIN_05] == 0
+    assert machine.coins[CoinTypes.COIN_10] == 0
+    assert machine.coins[CoinTypes.COIN_25] == 0
+    assert machine.coins[CoinTypes.COIN_50] == 0
+    assert machine.coins[CoinTypes.COIN_100] == 0
 
 
 def test_should_raise_exception_when_there_is_enough_coins_to_subtract():
@@ -355,15 +286,10 @@ def test_should_raise_exception_when_there_is_enough_coins_to_subtract():
             "a8351752-ec32-4578-bdb6-883d703cbee7",
             owner,
             MachineState.READY,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
+            CoinsVector.create(1, 1, 1, 1, 1, 1),
             products,
         )
-        machine.subtract_coins(1, 1, 1, 1, 1, 2)
+        machine.subtract_coins(CoinsVector.create(1, 1, 1, 1, 1, 2))
 
 
 def test_should_get_amount_out_of_coins():
@@ -376,15 +302,10 @@ def test_should_get_amount_out_of_coins():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        0,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
         products,
     )
-    amount: int = machine.get_amount_out_of_coins(1, 1, 1, 1, 1, 1)
+    amount: int = machine.get_amount_out_of_coins(CoinsVector.create(1, 1, 1, 1, 1, 1))
     assert amount == 191
 
 
@@ -401,12 +322,7 @@ def test_should_raise_exception_if_machine_does_not_have_enough_coins_for_change
             "a8351752-ec32-4578-bdb6-883d703cbee7",
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
         change: int = 1
@@ -423,22 +339,17 @@ def test_should_get_coins_from_change():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        1,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(1, 0, 0, 0, 0, 0),
         products,
     )
     change: int = 1
     coins_change = machine.get_coins_from_change(change)
-    assert coins_change.coin_01_qty == 1
-    assert coins_change.coin_05_qty == 0
-    assert coins_change.coin_10_qty == 0
-    assert coins_change.coin_25_qty == 0
-    assert coins_change.coin_50_qty == 0
-    assert coins_change.coin_100_qty == 0
+    assert coins_change[CoinTypes.COIN_01] == 1
+    assert coins_change[CoinTypes.COIN_05] == 0
+    assert coins_change[CoinTypes.COIN_10] == 0
+    assert coins_change[CoinTypes.COIN_25] == 0
+    assert coins_change[CoinTypes.COIN_50] == 0
+    assert coins_change[CoinTypes.COIN_100] == 0
 
 
 def test_should_deliver_product_and_reduce_its_quantity():
@@ -455,13 +366,183 @@ def test_should_deliver_product_and_reduce_its_quantity():
         "a8351752-ec32-4578-bdb6-883d703cbee7",
         owner,
         MachineState.READY,
-        1,
-        0,
-        0,
-        0,
-        0,
-        0,
+        CoinsVector.create(1, 0, 0, 0, 0, 0),
         products,
     )
     machine.deliver_product(products[0].id)
     assert machine.products[0].qty == 0
+
+
+def test_should_track_changes():
+    """Function to test if the machine reports only the state, coins and products that changed"""
+    products = [
+        ProductEntity.create(
+            "b9651752-6c44-4578-bdb6-883d703cbfff", "Hersheys", 1, "00", 0
+        ),
+        ProductEntity.create(
+            "b9651752-6c44-4578-bdb6-883d703cbffe", "Twix", 1, "01", 0
+        ),
+    ]
+    owner = OwnerEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com"
+    )
+    machine = MachineEntity.create(
+        "a8351752-ec32-4578-bdb6-883d703cbee7",
+        owner,
+        MachineState.READY,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
+        products,
+    )
+
+    assert machine.state_changed is False
+    assert machine.changed_coins == []
+    assert machine.changed_products == []
+
+    machine.start_dispense_product()
+    machine.add_coins(CoinsVector.create(0, 1, 0, 0, 0, 0))
+    machine.deliver_product(products[1].id)
+
+    assert machine.state_changed is True
+    assert machine.changed_coins == [CoinTypes.COIN_05]
+    assert machine.changed_products == [products[1]]
+
+    machine.mark_as_persisted()
+
+    assert machine.state_changed is False
+    assert machine.changed_coins == []
+    assert machine.changed_products == []
+
+
+def test_should_handle_large_coin_quantities():
+    """Function to test if coin arithmetic works on quantities far too large to walk one coin at a time"""
+    owner = OwnerEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com"
+    )
+    machine = MachineEntity.create(
+        "a8351752-ec32-4578-bdb6-883d703cbee7",
+        owner,
+        MachineState.READY,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
+        [],
+    )
+    qty = 10**7
+
+    amount = machine.get_amount_out_of_coins(CoinsVector.create(qty, qty, qty, qty, qty, qty))
+    machine.add_coins(CoinsVector.create(qty, qty, qty, qty, qty, qty))
+    coins = machine.get_coins_from_change(qty * 100 + 1)
+    machine.subtract_coins(CoinsVector.create(qty - 1, qty, qty, qty, qty, 0))
+
+    assert amount == qty * 191
+    assert coins[CoinTypes.COIN_100] == qty
+    assert coins[CoinTypes.COIN_01] == 1
+    assert machine.coins[CoinTypes.COIN_01] == 0
+    assert machine.coins[CoinTypes.COIN_100] == 0
+
+
+def test_should_give_change_when_largest_coin_first_would_fail():
+    """Function to test if change is given with smaller coins and only the chosen coins leave the machine"""
+    owner = OwnerEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com"
+    )
+    machine = MachineEntity.create(
+        "a8351752-ec32-4578-bdb6-883d703cbee7",
+        owner,
+        MachineState.READY,
+        CoinsVector.create(0, 0, 3, 1, 0, 0),
+        [],
+    )
+    coins = machine.get_coins_from_change(30)
+    assert coins[CoinTypes.COIN_10] == 3
+    assert coins[CoinTypes.COIN_25] == 0
+    assert machine.coins[CoinTypes.COIN_10] == 0
+    assert machine.coins[CoinTypes.COIN_25] == 1
+
+
+def test_should_keep_coins_when_change_can_not_be_given():
+    """Function to test if no coin leaves the machine when the change can not be paid"""
+    owner = OwnerEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com"
+    )
+    machine = MachineEntity.create(
+        "a8351752-ec32-4578-bdb6-883d703cbee7",
+        owner,
+        MachineState.READY,
+        CoinsVector.create(4, 0, 2, 1, 0, 0),
+        [],
+    )
+    with pytest.raises(
+        NoChangeAvailableException, match="not enough change in the machine"
+    ):
+        machine.get_coins_from_change(30)
+    assert machine.coins[CoinTypes.COIN_01] == 4
+    assert machine.coins[CoinTypes.COIN_10] == 2
+    assert machine.coins[CoinTypes.COIN_25] == 1
+
+
+def test_should_find_products_by_id_and_by_code():
+    """Function to test if machine finds its products by id and by slot code"""
+    products = [
+        ProductEntity.create(
+            "b9651752-6c44-4578-bdb6-883d703cbfff", "Hersheys", 1, "00", 0
+        ),
+        ProductEntity.create(
+            "b9651752-6c44-4578-bdb6-883d703cbffe", "Twix", 1, "01", 0
+        ),
+    ]
+    owner = OwnerEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff6", "Sebastião Maia", "test@mail.com"
+    )
+    machine = MachineEntity.create(
+        "a8351752-ec32-4578-bdb6-883d703cbee7",
+        owner,
+        MachineState.READY,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
+        products,
+    )
+    assert machine.find_product_by_id(products[1].id.value) is products[1]
+    assert machine.find_product_by_code("00") is products[0]
+    assert machine.find_product_by_id("b9651752-6c44-4578-bdb6-883d703cbffd") is None
+    assert machine.find_product_by_code("02") is None
+    assert machine.products == products
+
+
+def test_should_keep_product_indexes_when_products_list_is_changed_outside():
+    """Function to test if changing the list of products returned does not change the machine products"""
+    products = [
+        ProductEntity.create(
+            "b9651752-6c44-4578-bdb6-883d703cbfff", "Hersheys", 1, "00", 0
+        ),
+    ]
+    owner = OwnerEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff6", "Sebastião Maia", "test@mail.com"
+    )
+    machine = MachineEntity.create(
+        "a8351752-ec32-4578-bdb6-883d703cbee7",
+        owner,
+        MachineState.READY,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
+        products,
+    )
+    machine.products.clear()
+    products.clear()
+    assert len(machine.products) == 1
+    assert machine.find_product_by_code("00").name == "Hersheys"
+
+
+def test_should_get_coins_change_since_last_persisted():
+    """Function to test if coins change holds coins added as positive and coins handed out as negative"""
+    owner = OwnerEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff6", "Sebastião Maia", "test@mail.com"
+    )
+    machine = MachineEntity.create(
+        "a8351752-ec32-4578-bdb6-883d703cbee7",
+        owner,
+        MachineState.READY,
+        CoinsVector.create(0, 0, 0, 1, 0, 0),
+        [],
+    )
+    machine.add_coins(CoinsVector.create(0, 0, 0, 0, 1, 1))
+    machine.get_coins_from_change(25)
+    assert machine.coins_change == (0, 0, 0, -1, 1, 1)
+    machine.mark_as_persisted()
+    assert machine.coins_change == (0, 0, 0, 0, 0, 0)
@@ -2,6 +2,8 @@ from datetime import datetime
 
 import pytest
 
+from src.domain.value_objects.uuid import UUIDValueObject
+
 from src.domain.entities.product import ProductEntity
 from src.domain.entities.order_item import OrderItemEntity
 
@@ -66,6 +68,14 @@ def test_should_create_new():
     assert sut.created_at.timestamp() < datetime.now().timestamp()
 
 
+def test_should_create_new_with_the_timestamp_of_a_time_ordered_id():
+    """Function to test if A NON-EXISTING order_item with a time ordered id is created at the time carried by the id"""
+    product: ProductEntity = ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "00", 0)
+    order_item_id: UUIDValueObject = UUIDValueObject.create_new(time_ordered=True)
+    sut = OrderItemEntity.create_new(order_item_id.value, 1, product)
+    assert sut.created_at == order_item_id.timestamp
+
+
 def test_should_create_new_with_qty_with_2():
     """Function to test if A NON-EXISTING order_item is created with right parameters"""
     product: ProductEntity = ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 2, "00", 25)
@@ -2,6 +2,8 @@ from datetime import datetime
 
 import pytest
 
+from src.domain.value_objects.uuid import UUIDValueObject
+
 from src.domain.entities.order import OrderEntity, OrderStatus
 from src.domain.entities.order_item import OrderItemEntity
 from src.domain.entities.product import ProductEntity
@@ -80,6 +82,18 @@ def test_should_create_new():
     assert sut.total_amount == total_amount
 
 
+def test_should_create_new_with_the_timestamp_of_a_time_ordered_id():
+    """Function to test if A NON-EXISTING order with a time ordered id is created at the time carried by the id"""
+    machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
+    product: ProductEntity = ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "00", 0)
+    order_items = [OrderItemEntity.create("f3331752-6c11-4578-adb7-331d703cb445", 1, product, datetime(1970, 1, 1))]
+    order_id: UUIDValueObject = UUIDValueObject.create_new(time_ordered=True)
+    sut = OrderEntity.create_new(order_id.value, machine_id, order_items)
+
+    assert sut.created_at == order_id.timestamp
+    assert sut.updated_at == order_id.timestamp
+
+
 def test_should_raise_exception_when_try_to_cancel_order_when_order_is_delivered():
     """Function to test if order will raise exception if when try to cancel an order that is already delivered"""
     machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
@@ -102,3 +102,57 @@ def test_raise_exception_when_product_quantity_is_0():
             "b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 0, "00", 0
         )
         sut.reduce_qty()
+
+
+def test_should_be_changed_after_qty_changes():
+    """Function to test if changing the product quantity marks the product as changed"""
+    sut = ProductEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "00", 0
+    )
+    assert sut.changed is False
+    sut.reduce_qty()
+    assert sut.changed is True
+
+
+def test_should_not_be_changed_after_being_persisted():
+    """Function to test if mark_as_persisted clears the changes of the product"""
+    sut = ProductEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "00", 0
+    )
+    sut.reduce_qty()
+    sut.mark_as_persisted()
+    assert sut.changed is False
+
+
+def test_should_change_qty_by_many_units_at_once():
+    """Function to test if increase_qty and reduce_qty accept a quantity of units"""
+    sut = ProductEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 5, "00", 0
+    )
+    sut.reduce_qty(4)
+    assert sut.qty == 1
+    sut.increase_qty(3)
+    assert sut.qty == 4
+
+
+def test_raise_exception_when_reducing_more_units_than_available():
+    """Function to test if the software component will raise an exception when more units are reduced than available"""
+    sut = ProductEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 2, "00", 0
+    )
+    with pytest.raises(
+        InvalidProductsQtyException, match="quantity of products can not be negative"
+    ):
+        sut.reduce_qty(3)
+    assert sut.qty == 2
+
+
+def test_should_get_qty_change_since_last_persisted():
+    """Function to test if qty_change tells how many units were added or removed since the product was persisted"""
+    sut = ProductEntity.create(
+        "b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 5, "00", 0
+    )
+    sut.reduce_qty(3)
+    assert sut.qty_change == -3
+    sut.mark_as_persisted()
+    assert sut.qty_change == 0
@@ -0,0 +1,108 @@
+import random
+import itertools
+
+from src.domain.value_objects.coins import CoinTypes
+from src.domain.value_objects.change_solver import solve_change, TABLE_LIMIT, SOLVER_LIMIT
+
+
+def _inventory(coin_01=0, coin_05=0, coin_10=0, coin_25=0, coin_50=0, coin_100=0) -> dict[CoinTypes, int]:
+    return {
+        CoinTypes.COIN_01: coin_01,
+        CoinTypes.COIN_05: coin_05,
+        CoinTypes.COIN_10: coin_10,
+        CoinTypes.COIN_25: coin_25,
+        CoinTypes.COIN_50: coin_50,
+        CoinTypes.COIN_100: coin_100,
+    }
+
+
+def _fewest_coins(change: int, inventory: dict[CoinTypes, int]) -> int | None:
+    best = None
+    ranges = [range(min(inventory[coin], change // coin) + 1) for coin in CoinTypes]
+    for combination in itertools.product(*ranges):
+        if sum(qty * coin for qty, coin in zip(combination, CoinTypes)) == change:
+            if best is None or sum(combination) < best:
+                best = sum(combination)
+    return best
+
+
+def test_should_return_no_coins_for_no_change():
+    """Function to test if no coins are picked when there is no change"""
+    assert solve_change(0, _inventory()) == _inventory()
+
+
+def test_should_use_table_when_inventory_is_plenty():
+    """Function to test if small amounts are answered with the fewest coins when no coin is missing"""
+    coins = solve_change(TABLE_LIMIT - 9, _inventory(10, 10, 10, 10, 10, 10))
+    assert coins == _inventory(1, 1, 1, 1, 1, 4)
+
+
+def test_should_find_change_where_greedy_fails():
+    """Function to test if change is found when taking the largest coin first would not pay it"""
+    coins = solve_change(30, _inventory(0, 0, 3, 1, 0, 0))
+    assert coins == _inventory(0, 0, 3, 0, 0, 0)
+
+
+def test_should_prefer_fewer_coins_than_greedy():
+    """Function to test if the change picked uses the fewest coins the inventory allows"""
+    coins = solve_change(30, _inventory(5, 0, 3, 1, 0, 0))
+    assert coins == _inventory(0, 0, 3, 0, 0, 0)
+
+
+def test_should_return_none_when_change_can_not_be_paid():
+    """Function to test if None is returned when no set of coins adds up to the change"""
+    assert solve_change(30, _inventory(4, 0, 2, 1, 0, 0)) is None
+
+
+def test_should_solve_amounts_above_solver_limit():
+    """Function to test if large amounts are brought down with the largest coins before being solved"""
+    coins = solve_change(SOLVER_LIMIT * 3 + 30, _inventory(0, 0, 3, 1, 0, 60))
+    assert coins == _inventory(0, 0, 3, 0, 0, 60)
+
+
+def test_should_solve_amounts_above_solver_limit_where_largest_coins_first_fails():
+    """Function to test if large amounts are paid when taking the largest coins first would leave them unpayable"""
+    assert solve_change(2030, _inventory(0, 0, 203, 1, 0, 0)) == _inventory(0, 0, 203, 0, 0, 0)
+    assert solve_change(2530, _inventory(0, 0, 300, 3, 0, 0)) == _inventory(0, 0, 248, 2, 0, 0)
+
+
+def test_should_pay_every_payable_amount_above_solver_limit():
+    """Function to test if large amounts are only refused when no set of coins adds up to them"""
+    generator = random.Random(11)
+    for _ in range(100):
+        inventory = _inventory(0, 0, generator.randint(150, 300), generator.randint(0, 5), generator.randint(0, 3), 0)
+        change = SOLVER_LIMIT + 10 * generator.randint(0, 100)
+        payable = any(
+            change - quarters * 25 - halves * 50 >= 0
+            and (change - quarters * 25 - halves * 50) % 10 == 0
+            and (change - quarters * 25 - halves * 50) // 10 <= inventory[CoinTypes.COIN_10]
+            for quarters in range(inventory[CoinTypes.COIN_25] + 1)
+            for halves in range(inventory[CoinTypes.COIN_50] + 1)
+        )
+        coins = solve_change(change, inventory)
+        if payable:
+            assert sum(qty * coin for coin, qty in coins.items()) == change
+            assert all(coins[coin] <= inventory[coin] for coin in CoinTypes)
+        else:
+            assert coins is None
+
+
+def test_should_return_none_when_inventory_is_below_change():
+    """Function to test if None is returned when every coin together does not reach the change"""
+    assert solve_change(SOLVER_LIMIT * 3, _inventory(100, 100, 100, 100, 0, 10)) is None
+
+
+def test_should_match_brute_force_on_small_inventories():
+    """Function to test if the coins picked are the fewest possible for random small inventories"""
+    generator = random.Random(7)
+    for _ in range(300):
+        inventory = _inventory(*[generator.randint(0, 4) for _ in CoinTypes])
+        change = generator.randint(0, 300)
+        coins = solve_change(change, inventory)
+        expected = _fewest_coins(change, inventory)
+        if expected is None:
+            assert coins is None
+        else:
+            assert sum(qty * coin for coin, qty in coins.items()) == change
+            assert all(coins[coin] <= inventory[coin] for coin in CoinTypes)
+            assert sum(coins.values()) == expected
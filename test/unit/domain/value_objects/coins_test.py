@@ -1,56 +1,66 @@
 import pytest
 
-from src.domain.value_objects.coins import CoinsValueObject, CoinTypes
+from src.domain.value_objects.coins import CoinsVector, CoinTypes
 from src.domain.exceptions.invalid_coins_qty import InvalidCoinsQtyException
 
 
-def test_should_raise_exception_by_using_constructor():
-    """Function to test if the software component will raise an exception if calls the constructor"""
+def test_should_raise_exception_by_using_vector_constructor():
+    """Function to test if the software component will raise an exception if calls the vector constructor"""
     with pytest.raises(
         Exception, match="Use the 'create' method to create an instance of this class."
     ):
-        CoinsValueObject(CoinTypes.COIN_01, 0)
+        CoinsVector([0, 0, 0, 0, 0, 0])
 
 
-def test_should_raise_exception_if_coin_quantity_is_negative():
-    """Function to test if Coins will raise exception if there quantity is negative"""
-    qty = -1
+def test_raise_exception_when_vector_quantity_is_negative():
+    """Function to test if a coins vector will raise exception if one quantity is negative"""
     with pytest.raises(
         InvalidCoinsQtyException, match="quantity of coins can not be negative"
     ):
-        CoinsValueObject.create(CoinTypes.COIN_01, qty)
+        CoinsVector.create(0, 0, -1, 0, 0, 0)
 
 
-def test_should_get_value():
-    """Function to test if value property is called"""
-    sut = CoinsValueObject.create(CoinTypes.COIN_05, 0)
-    assert sut.value == CoinTypes.COIN_05
+def test_raise_exception_when_vector_does_not_have_every_coin_type():
+    """Function to test if a coins vector will raise exception if it misses a coin type"""
+    with pytest.raises(ValueError, match="expected 6 coin quantities, got 5"):
+        CoinsVector.create(0, 0, 0, 0, 0)
 
 
-def test_should_get_qty():
-    """Function to test if qty property is called"""
-    sut = CoinsValueObject.create(CoinTypes.COIN_01, 0)
-    assert sut.qty == 0
+def test_should_index_vector_by_coin_type():
+    """Function to test if a coins vector returns the quantity of each coin type"""
+    sut = CoinsVector.create(1, 2, 3, 4, 5, 6)
+    assert sut[CoinTypes.COIN_01] == 1
+    assert sut[CoinTypes.COIN_25] == 4
+    assert sut[CoinTypes.COIN_100] == 6
+    assert list(sut) == [1, 2, 3, 4, 5, 6]
+    assert sut == CoinsVector.from_mapping(
+        {
+            CoinTypes.COIN_01: 1,
+            CoinTypes.COIN_05: 2,
+            CoinTypes.COIN_10: 3,
+            CoinTypes.COIN_25: 4,
+            CoinTypes.COIN_50: 5,
+            CoinTypes.COIN_100: 6,
+        }
+    )
 
 
-def test_should_increase_qty():
-    """Function to test if increase_qty increases quantity of coins"""
-    sut = CoinsValueObject.create(CoinTypes.COIN_01, 0)
-    sut.increase_qty()
-    assert sut.qty == 1
+def test_should_get_vector_amount():
+    """Function to test if a coins vector amount is the sum of every coin value"""
+    assert CoinsVector.create(1, 1, 1, 1, 1, 1).amount == 191
+    assert CoinsVector.create_empty().amount == 0
 
 
-def test_should_reduce_qty():
-    """Function to if test reduce_qty reduces quantity of coins"""
-    sut = CoinsValueObject.create(CoinTypes.COIN_01, 1)
-    sut.reduce_qty()
-    assert sut.qty == 0
+def test_should_add_and_subtract_vectors():
+    """Function to test if coins vectors are added and subtracted coin by coin"""
+    sut = CoinsVector.create(1, 2, 3, 4, 5, 6) + CoinsVector.create(1, 0, 0, 0, 0, 1)
+    assert sut == CoinsVector.create(2, 2, 3, 4, 5, 7)
+    assert sut - CoinsVector.create(2, 2, 0, 0, 0, 7) == CoinsVector.create(0, 0, 3, 4, 5, 0)
 
 
-def test_raise_exception_when_coin_quantity_is_0():
-    """Function to test if Coins will raise exception if quantity is reduced below 0"""
+def test_raise_exception_when_vector_subtraction_is_above_quantity():
+    """Function to test if a coins vector will raise exception if more coins are subtracted than it holds"""
     with pytest.raises(
         InvalidCoinsQtyException, match="quantity of coins can not be negative"
     ):
-        sut = CoinsValueObject.create(CoinTypes.COIN_01, 0)
-        sut.reduce_qty()
+        CoinsVector.create(1, 0, 0, 0, 0, 0) - CoinsVector.create(0, 1, 0, 0, 0, 0)
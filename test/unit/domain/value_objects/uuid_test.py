@@ -1,5 +1,7 @@
 import uuid
 
+from datetime import datetime, timedelta
+
 import pytest
 
 from src.domain.value_objects.uuid import UUIDValueObject
@@ -39,3 +41,42 @@ def test_should_convert_to_UUID():
     """Function to test if an UUID is created"""
     sut = UUIDValueObject.create_new()
     assert isinstance(sut.convert_value_to_UUID(), uuid.UUID) is True
+
+
+def test_should_create_new_time_ordered():
+    """Function to test if a time ordered UUID is created with version 7 and the RFC variant"""
+    sut = UUIDValueObject.create_new(time_ordered=True)
+    assert sut.convert_value_to_UUID().version == 7
+    assert sut.convert_value_to_UUID().variant == uuid.RFC_4122
+
+
+def test_should_create_time_ordered_from_its_value():
+    """Function to test if a time ordered UUID is accepted as a predefined value"""
+    id_value: str = str(UUIDValueObject.create_new(time_ordered=True).value)
+    sut = UUIDValueObject.create(id_value)
+    assert sut.value == id_value
+    assert sut.convert_value_to_UUID().version == 7
+
+
+def test_should_sort_time_ordered_by_creation_time():
+    """Function to test if time ordered UUIDs created in different milliseconds sort by creation time"""
+    first = UUIDValueObject.create_new(time_ordered=True)
+    second = UUIDValueObject.create_new(time_ordered=True)
+    while second.timestamp == first.timestamp:
+        second = UUIDValueObject.create_new(time_ordered=True)
+    assert first.value < second.value
+    assert first.convert_value_to_UUID() < second.convert_value_to_UUID()
+
+
+def test_should_return_timestamp_of_time_ordered():
+    """Function to test if a time ordered UUID returns the time it was created at"""
+    before = datetime.now() - timedelta(milliseconds=1)
+    sut = UUIDValueObject.create_new(time_ordered=True)
+    after = datetime.now()
+    assert before <= sut.timestamp <= after
+
+
+def test_should_not_return_timestamp_of_random():
+    """Function to test if a random UUID returns no timestamp"""
+    sut = UUIDValueObject.create("b9651752-6c44-4578-bdb6-883d703cbff5")
+    assert sut.timestamp is None
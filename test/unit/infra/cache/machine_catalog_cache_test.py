@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from src.infra.cache.machine_catalog_cache import MachineCatalogCache
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    MachineCatalogCache.reset_instance()
+    yield
+    MachineCatalogCache.reset_instance()
+
+
+class Test_Machine_Catalog_Cache:
+    def test_should_raise_exception_by_using_constructor(self):
+        with pytest.raises(Exception, match="Use the 'get_instance' method to create an instance of this class."):
+            MachineCatalogCache(1.0, 1, 1)
+
+    def test_should_return_the_same_instance(self):
+        assert MachineCatalogCache.get_instance() is MachineCatalogCache.get_instance()
+
+    def test_should_store_and_return_values(self):
+        sut = MachineCatalogCache.get_instance()
+
+        sut.put("machine", ("READY",), sut.generation)
+
+        assert sut.get("machine") == ("READY",)
+        assert sut.get("other") is None
+        assert sut.hits == 1
+        assert sut.misses == 1
+
+    def test_should_expire_values_after_ttl(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        sut = MachineCatalogCache.get_instance(ttl=2.0)
+
+        sut.put("machine", ("READY",), sut.generation)
+        now[0] += 2.5
+
+        assert sut.get("machine") is None
+        assert len(sut) == 0
+        assert sut.size_in_bytes == 0
+
+    def test_should_evict_least_recently_used_value_when_full(self):
+        sut = MachineCatalogCache.get_instance(max_entries=2)
+
+        sut.put("first", ("READY",), sut.generation)
+        sut.put("second", ("READY",), sut.generation)
+        sut.get("first")
+        sut.put("third", ("READY",), sut.generation)
+
+        assert sut.get("second") is None
+        assert sut.get("first") == ("READY",)
+        assert sut.get("third") == ("READY",)
+
+    def test_should_evict_values_when_memory_bound_is_reached(self):
+        value = tuple(str(index) * 50 for index in range(10))
+        sut = MachineCatalogCache.get_instance(max_bytes=1500)
+
+        sut.put("first", value, sut.generation)
+        sut.put("second", value, sut.generation)
+
+        assert sut.get("first") is None
+        assert sut.get("second") == value
+        assert sut.size_in_bytes <= 1500
+
+    def test_should_not_store_value_bigger_than_memory_bound(self):
+        sut = MachineCatalogCache.get_instance(max_bytes=100)
+
+        sut.put("machine", ("x" * 200,), sut.generation)
+
+        assert len(sut) == 0
+
+    def test_should_invalidate_value(self):
+        sut = MachineCatalogCache.get_instance()
+
+        sut.put("machine", ("READY",), sut.generation)
+        sut.invalidate("machine")
+
+        assert sut.get("machine") is None
+        assert sut.size_in_bytes == 0
+
+    def test_should_not_store_value_read_before_an_invalidation(self):
+        sut = MachineCatalogCache.get_instance()
+
+        generation = sut.generation
+        sut.invalidate("machine")
+        sut.put("machine", ("READY",), generation)
+
+        assert sut.get("machine") is None
+
+    def test_should_store_value_read_before_another_key_was_invalidated(self):
+        sut = MachineCatalogCache.get_instance()
+
+        generation = sut.generation
+        sut.invalidate("other")
+        sut.put("machine", ("READY",), generation)
+
+        assert sut.get("machine") == ("READY",)
+
+    def test_should_not_store_value_read_before_a_forgotten_invalidation(self):
+        sut = MachineCatalogCache.get_instance(max_entries=1)
+
+        generation = sut.generation
+        sut.invalidate("machine")
+        sut.invalidate("other")
+        sut.put("machine", ("READY",), generation)
+
+        assert sut.get("machine") is None
+
+    def test_should_not_store_value_read_before_a_clear(self):
+        sut = MachineCatalogCache.get_instance()
+
+        generation = sut.generation
+        sut.clear()
+        sut.put("machine", ("READY",), generation)
+
+        assert sut.get("machine") is None
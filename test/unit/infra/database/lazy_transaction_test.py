@@ -0,0 +1,117 @@
+import pytest
+
+from src.infra.database.lazy_transaction import LazyTransaction
+from src.infra.database.postgres.spy_transaction import (
+    SpyTransaction,
+    QueryResponseWithSuccessObject,
+    FetchallResponseWithSuccessObject,
+    OpenTransactionResponseWithSuccessObject,
+    OpenReadOnlyTransactionResponseWithSuccessObject,
+    ReleaseResponseWithSuccessObject,
+    CreateClientResponseWithSuccessObject,
+    CommitResponseWithSuccessObject,
+    RollbackResponseWithSuccessObject,
+)
+
+
+def make_spy() -> SpyTransaction:
+    return SpyTransaction(
+        [QueryResponseWithSuccessObject(None)],
+        [FetchallResponseWithSuccessObject([{"id": 1}])],
+        [OpenTransactionResponseWithSuccessObject(None)],
+        [ReleaseResponseWithSuccessObject(None)],
+        [CreateClientResponseWithSuccessObject(None)],
+        [CommitResponseWithSuccessObject(None)],
+        [RollbackResponseWithSuccessObject(None)],
+        [],
+    )
+
+
+class Test_Lazy_Transaction:
+    @pytest.mark.asyncio
+    async def test_should_not_take_a_connection_when_nothing_is_queried(self):
+        spy = make_spy()
+        sut = LazyTransaction(spy)
+
+        await sut.create_client()
+        await sut.open_transaction()
+        await sut.commit()
+        await sut.release()
+
+        assert spy.create_client_counter == 0
+        assert spy.open_transaction_counter == 0
+        assert spy.commit_counter == 0
+        assert spy.release_counter == 0
+
+    @pytest.mark.asyncio
+    async def test_should_open_the_transaction_before_the_first_query(self):
+        spy = make_spy()
+        sut = LazyTransaction(spy)
+
+        await sut.create_client()
+        await sut.open_transaction()
+        await sut.query({"text": "SELECT 1", "values": ()})
+        rows = await sut.fetchall()
+        await sut.commit()
+        await sut.release()
+
+        assert rows == [{"id": 1}]
+        assert spy.create_client_counter == 1
+        assert spy.open_transaction_counter == 1
+        assert spy.query_counter == 1
+        assert spy.commit_counter == 1
+        assert spy.release_counter == 1
+        assert sut.started is False
+
+    @pytest.mark.asyncio
+    async def test_should_rollback_only_when_started(self):
+        spy = make_spy()
+        sut = LazyTransaction(spy)
+
+        await sut.open_transaction()
+        await sut.rollback()
+        await sut.open_transaction()
+        await sut.query({"text": "SELECT 1", "values": ()})
+        await sut.rollback()
+
+        assert spy.rollback_counter == 1
+
+    @pytest.mark.asyncio
+    async def test_should_run_the_first_query_without_begin_when_read_only(self):
+        spy = SpyTransaction(
+            [QueryResponseWithSuccessObject(None)],
+            [],
+            [],
+            [ReleaseResponseWithSuccessObject(None)],
+            [CreateClientResponseWithSuccessObject(None)],
+            [],
+            [],
+            [],
+            [OpenReadOnlyTransactionResponseWithSuccessObject(None)],
+        )
+        sut = LazyTransaction(spy)
+
+        await sut.open_read_only_transaction()
+        await sut.query({"text": "SELECT 1", "values": ()})
+        await sut.release()
+
+        assert spy.create_client_counter == 1
+        assert spy.open_read_only_transaction_counter == 1
+        assert spy.open_transaction_counter == 0
+        assert spy.release_counter == 1
+
+    @pytest.mark.asyncio
+    async def test_should_open_the_transaction_before_holding_back_a_statement(self):
+        spy = make_spy()
+        sut = LazyTransaction(spy)
+
+        await sut.create_client()
+        await sut.open_transaction()
+        await sut.defer_query({"text": "INSERT INTO test (id) VALUES (%s)", "values": ("1",)})
+        await sut.commit()
+        await sut.release()
+
+        assert spy.create_client_counter == 1
+        assert spy.open_transaction_counter == 1
+        assert spy.query_counter == 1
+        assert spy.commit_counter == 1
@@ -1,3 +1,6 @@
+import asyncio
+import socket
+
 import pytest
 
 from testcontainers.postgres import PostgresContainer
@@ -7,6 +10,11 @@ from src.infra.database.postgres.connection.psycopg2_connection import (
     Config,
 )
 
+from src.infra.exceptions.database_connection_timeout import DatabaseConnectionTimeoutException
+from src.infra.exceptions.database_not_ready import DatabaseNotReadyException
+from src.infra.exceptions.database_acquire_timeout import DatabaseAcquireTimeoutException
+from src.infra.exceptions.database_pool_queue_full import DatabasePoolQueueFullException
+
 
 @pytest.fixture(scope="class")
 def container():
@@ -30,15 +38,46 @@ def container():
     postgres.stop(force=True, delete_volume=True)
 
 
+@pytest.fixture(scope="class")
+def replica_container():
+    postgres = (
+        PostgresContainer(
+            image="postgres:16-alpine",
+            dbname="postgres",
+            username="root",
+            password="root",
+            port=5432,
+        )
+        .with_bind_ports(5432, 5433)
+        .with_exposed_ports(5432)
+    )
+
+    postgres.start()
+
+    yield postgres
+
+    postgres.stop(force=True, delete_volume=True)
+
+
+@pytest.fixture(scope="class")
+def blackhole():
+    # accepts the TCP handshake and then never answers, like a server dropping every packet
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+
+    yield server.getsockname()[1]
+
+    server.close()
+
+
 class Test_Psycopg2_Pool_Connection:
     @pytest.fixture(autouse=True)
     def reset_instances(self):
         Psycopg2PoolConnection.reset_instance()
 
     @pytest.mark.asyncio
-    async def test_should_connect_to_database_and_disconnect(
-        self, container: PostgresContainer
-    ):
+    async def test_should_connect_to_database_and_disconnect(self, container: PostgresContainer):
         sut = Psycopg2PoolConnection.get_instance()
 
         await sut.connect(
@@ -53,9 +92,289 @@ class Test_Psycopg2_Pool_Connection:
             )
         )
 
+        assert sut.is_ready() is True
+
         pool = await sut.get_pool()
         pool_client = pool.getconn()
         pool.putconn(pool_client)
         await sut.disconnect()
 
         assert pool.closed is True
+        assert sut.is_ready() is False
+
+    @pytest.mark.asyncio
+    async def test_should_raise_exception_if_database_is_not_reachable_before_deadline(self):
+        sut = Psycopg2PoolConnection.get_instance()
+
+        with pytest.raises(DatabaseConnectionTimeoutException):
+            await sut.connect(
+                Config(
+                    db="postgres",
+                    user="root",
+                    password="root",
+                    port=1,
+                    host="127.0.0.1",
+                    min=2,
+                    max=2,
+                    connect_timeout=0.3,
+                    backoff_initial=0.05,
+                )
+            )
+
+        assert sut.is_ready() is False
+        with pytest.raises(DatabaseNotReadyException):
+            await sut.get_pool()
+
+    async def connect(self, container: PostgresContainer, acquire_timeout: float, max_waiting: int):
+        sut = Psycopg2PoolConnection.get_instance()
+
+        await sut.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+                acquire_timeout=acquire_timeout,
+                max_waiting=max_waiting,
+            )
+        )
+
+        return sut
+
+    @pytest.mark.asyncio
+    async def test_should_hand_released_connections_to_waiters_in_arrival_order(self, container: PostgresContainer):
+        sut = await self.connect(container, 1, 10)
+        pool = await sut.get_pool()
+        served: list[str] = []
+
+        async def wait_for_connection(name: str):
+            conn = await pool.acquire()
+            served.append(name)
+            pool.release(conn)
+
+        conn = await pool.acquire()
+        first = asyncio.create_task(wait_for_connection("first"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(wait_for_connection("second"))
+        await asyncio.sleep(0)
+
+        waiting = pool.waiting_count()
+
+        pool.release(conn)
+        await asyncio.gather(first, second)
+        await sut.disconnect()
+
+        assert waiting == 2
+        assert served == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_should_hand_released_connection_to_waiter_of_another_event_loop(self, container: PostgresContainer):
+        sut = await self.connect(container, 1, 10)
+        pool = await sut.get_pool()
+
+        conn = await pool.acquire()
+        other_loop = asyncio.create_task(asyncio.to_thread(asyncio.run, pool.acquire()))
+        while pool.waiting_count() == 0:
+            await asyncio.sleep(0.01)
+
+        pool.release(conn)
+        handed: object = await other_loop
+
+        pool.release(handed)
+        await sut.disconnect()
+
+        assert handed is conn
+        assert pool.waiting_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_should_open_replacement_of_broken_connection_for_waiter_off_the_event_loop(
+        self, container: PostgresContainer, monkeypatch
+    ):
+        sut = await self.connect(container, 1, 10)
+        pool = await sut.get_pool()
+
+        def connect_on_event_loop(*args, **kwargs):
+            raise AssertionError("connection opened on the event loop")
+
+        monkeypatch.setattr(pool, "_connect", connect_on_event_loop)
+
+        conn = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+
+        conn.close()
+        pool.release(conn)
+        replacement = await waiter
+
+        with replacement.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            selected = cursor.fetchone()[0]
+
+        pool.release(replacement)
+        await sut.disconnect()
+
+        assert replacement is not conn
+        assert selected == 1
+
+    @pytest.mark.asyncio
+    async def test_should_raise_exception_if_no_connection_is_released_in_time(self, container: PostgresContainer):
+        sut = await self.connect(container, 0.05, 10)
+        pool = await sut.get_pool()
+
+        conn = await pool.acquire()
+
+        with pytest.raises(DatabaseAcquireTimeoutException):
+            await pool.acquire()
+
+        waiting = pool.waiting_count()
+
+        pool.release(conn)
+        await sut.disconnect()
+
+        assert waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_should_raise_exception_if_waiting_queue_is_full(self, container: PostgresContainer):
+        sut = await self.connect(container, 1, 1)
+        pool = await sut.get_pool()
+
+        conn = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(DatabasePoolQueueFullException):
+            await pool.acquire()
+
+        pool.release(conn)
+        pool.release(await waiter)
+        await sut.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_should_open_every_connection_in_autocommit(self, container: PostgresContainer):
+        sut = Psycopg2PoolConnection.get_instance()
+
+        await sut.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=2,
+            )
+        )
+
+        pool = await sut.get_pool()
+        warmed_up_conn = await pool.acquire()
+        on_demand_conn = await pool.acquire()
+
+        autocommit = (warmed_up_conn.autocommit, on_demand_conn.autocommit)
+
+        pool.release(warmed_up_conn)
+        pool.release(on_demand_conn)
+        await sut.disconnect()
+
+        assert autocommit == (True, True)
+
+    @pytest.mark.asyncio
+    async def test_should_read_from_replica_once_its_lag_is_measured(
+        self, container: PostgresContainer, replica_container: PostgresContainer
+    ):
+        sut = Psycopg2PoolConnection.get_instance()
+
+        await sut.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+                replicas=[(replica_container.get_container_host_ip(), replica_container.get_exposed_port(5432))],
+            )
+        )
+
+        primary_pool = await sut.get_pool()
+        read_pool_before_check = await sut.get_read_pool()
+        await sut.check_replicas()
+        read_pool_after_check = await sut.get_read_pool()
+
+        await sut.disconnect()
+
+        assert read_pool_before_check is primary_pool
+        assert read_pool_after_check is not primary_pool
+
+    @pytest.mark.asyncio
+    async def test_should_read_from_primary_if_replica_is_not_reachable(self, container: PostgresContainer):
+        sut = Psycopg2PoolConnection.get_instance()
+
+        await sut.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+                replicas=[("127.0.0.1", 1)],
+            )
+        )
+
+        await sut.check_replicas()
+        read_pool = await sut.get_read_pool()
+        primary_pool = await sut.get_pool()
+
+        await sut.disconnect()
+
+        assert read_pool is primary_pool
+
+    @pytest.mark.asyncio
+    async def test_should_keep_event_loop_running_while_replica_does_not_answer(
+        self, container: PostgresContainer, blackhole: int
+    ):
+        sut = Psycopg2PoolConnection.get_instance()
+
+        await sut.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+                connect_timeout=2,
+                replicas=[("127.0.0.1", blackhole)],
+                replica_check_interval=0.2,
+            )
+        )
+
+        ticks: int = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        loop = asyncio.get_running_loop()
+        started: float = loop.time()
+        await sut.check_replicas()
+        elapsed: float = loop.time() - started
+        ticker.cancel()
+
+        read_pool = await sut.get_read_pool()
+        primary_pool = await sut.get_pool()
+
+        await sut.disconnect()
+
+        assert elapsed < 1
+        assert ticks >= 10
+        assert read_pool is primary_pool
@@ -0,0 +1,111 @@
+import pytest
+
+from testcontainers.postgres import PostgresContainer
+
+from src.infra.database.postgres.connection.psycopg3_connection import (
+    Psycopg3PoolConnection,
+    Config,
+)
+
+
+@pytest.fixture(scope="class")
+def container():
+    postgres = (
+        PostgresContainer(
+            image="postgres:16-alpine",
+            dbname="postgres",
+            username="root",
+            password="root",
+            port=5432,
+        )
+        .with_bind_ports(5432, 5432)
+        .with_exposed_ports(5432)
+        .with_env("POSTGRES_MAX_CONNECTIONS", "1")
+    )
+
+    postgres.start()
+
+    yield postgres
+
+    postgres.stop(force=True, delete_volume=True)
+
+
+@pytest.fixture(scope="class")
+def replica_container():
+    postgres = (
+        PostgresContainer(
+            image="postgres:16-alpine",
+            dbname="postgres",
+            username="root",
+            password="root",
+            port=5432,
+        )
+        .with_bind_ports(5432, 5433)
+        .with_exposed_ports(5432)
+    )
+
+    postgres.start()
+
+    yield postgres
+
+    postgres.stop(force=True, delete_volume=True)
+
+
+class Test_Psycopg3_Pool_Connection:
+    @pytest.fixture(autouse=True)
+    def reset_instances(self):
+        Psycopg3PoolConnection.reset_instance()
+
+    @pytest.mark.asyncio
+    async def test_should_connect_to_database_and_disconnect(
+        self, container: PostgresContainer
+    ):
+        sut = Psycopg3PoolConnection.get_instance()
+
+        await sut.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+            )
+        )
+
+        pool = await sut.get_pool()
+        pool_client = await pool.getconn()
+        await pool.putconn(pool_client)
+        await sut.disconnect()
+
+        assert pool.closed is True
+
+    @pytest.mark.asyncio
+    async def test_should_read_from_replica_once_its_lag_is_measured(
+        self, container: PostgresContainer, replica_container: PostgresContainer
+    ):
+        sut = Psycopg3PoolConnection.get_instance()
+
+        await sut.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+                replicas=[(replica_container.get_container_host_ip(), replica_container.get_exposed_port(5432))],
+            )
+        )
+
+        primary_pool = await sut.get_pool()
+        read_pool_before_check = await sut.get_read_pool()
+        await sut.check_replicas()
+        read_pool_after_check = await sut.get_read_pool()
+
+        await sut.disconnect()
+
+        assert read_pool_before_check is primary_pool
+        assert read_pool_after_check is not primary_pool
@@ -0,0 +1,36 @@
+from decimal import Decimal
+
+from src.infra.database.postgres.connection.replica_set import ReplicaSet
+
+
+class Test_Replica_Set:
+    def test_should_not_pick_replica_before_its_lag_is_measured(self):
+        sut = ReplicaSet(["replica_a"], 1.0)
+
+        assert sut.pick() is None
+
+    def test_should_pick_caught_up_replicas_in_turns(self):
+        sut = ReplicaSet(["replica_a", "replica_b"], 1.0)
+        sut.record_lag(0, 0)
+        sut.record_lag(1, Decimal("0.5"))
+
+        assert [sut.pick() for _ in range(4)] == ["replica_a", "replica_b", "replica_a", "replica_b"]
+
+    def test_should_skip_replica_behind_the_allowed_lag(self):
+        sut = ReplicaSet(["replica_a", "replica_b"], 1.0)
+        sut.record_lag(0, 2.5)
+        sut.record_lag(1, 0)
+
+        assert [sut.pick() for _ in range(3)] == ["replica_b", "replica_b", "replica_b"]
+
+    def test_should_leave_out_replica_that_could_not_be_measured(self):
+        sut = ReplicaSet(["replica_a"], 1.0)
+        sut.record_lag(0, 0)
+        sut.record_lag(0, None)
+
+        assert sut.pick() is None
+
+    def test_should_not_pick_anything_without_replicas(self):
+        sut = ReplicaSet([], 1.0)
+
+        assert sut.pick() is None
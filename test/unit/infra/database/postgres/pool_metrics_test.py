@@ -0,0 +1,44 @@
+import pytest
+
+from src.infra.database.postgres.pool_metrics import PoolMetrics
+
+
+class Test_Pool_Metrics:
+    @pytest.fixture(autouse=True)
+    def reset_metrics(self):
+        PoolMetrics.reset_instance()
+
+    def test_should_track_connections_in_use(self):
+        sut = PoolMetrics.get_instance()
+
+        sut.record_checkout(0.002, 3, 10)
+        sut.record_checkout(0.002, 2, 10)
+        sut.record_release(0.2, 3)
+
+        assert sut.in_use == 1
+        assert sut.idle == 3
+        assert sut.max == 10
+        assert sut.checkouts == 2
+
+    def test_should_render_prometheus_text_format(self):
+        sut = PoolMetrics.get_instance()
+
+        sut.record_checkout(0.002, 0, 1)
+        sut.record_exhaustion(0.0001)
+        sut.record_release(0.3, 1)
+
+        output = sut.render()
+
+        assert "db_pool_connections_in_use 0\n" in output
+        assert "db_pool_connections_idle 1\n" in output
+        assert "db_pool_connections_max 1\n" in output
+        assert "db_pool_checkouts_total 1\n" in output
+        assert "db_pool_exhaustions_total 1\n" in output
+        assert "# TYPE db_pool_checkout_wait_seconds histogram\n" in output
+        assert 'db_pool_checkout_wait_seconds_bucket{le="0.001"} 1\n' in output
+        assert 'db_pool_checkout_wait_seconds_bucket{le="0.005"} 2\n' in output
+        assert 'db_pool_checkout_wait_seconds_bucket{le="+Inf"} 2\n' in output
+        assert "db_pool_checkout_wait_seconds_count 2\n" in output
+        assert 'db_pool_hold_seconds_bucket{le="0.25"} 0\n' in output
+        assert 'db_pool_hold_seconds_bucket{le="0.5"} 1\n' in output
+        assert output.endswith("\n")
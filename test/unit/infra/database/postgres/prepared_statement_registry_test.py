@@ -0,0 +1,77 @@
+from typing import Any
+
+import pytest
+
+from src.infra.database.postgres.prepared_statement_registry import Psycopg2PreparedStatementRegistry
+
+
+class CursorRecorder:
+    def __init__(self):
+        self.statements: list = []
+
+    def execute(self, query: str, vars: Any = None) -> None:
+        self.statements.append((query, vars))
+
+
+class Connection:
+    pass
+
+
+class Test_Psycopg2_Prepared_Statement_Registry:
+    @pytest.fixture(autouse=True)
+    def reset_registry(self):
+        Psycopg2PreparedStatementRegistry.reset_instance()
+
+    def test_should_prepare_statement_once_per_connection(self):
+        registry = Psycopg2PreparedStatementRegistry.get_instance()
+        conn = Connection()
+        cursor = CursorRecorder()
+
+        registry.execute(conn, cursor, "find_user", "SELECT * FROM users WHERE id = %s AND name LIKE 'a%%'", ("1",))
+        registry.execute(conn, cursor, "find_user", "SELECT * FROM users WHERE id = %s AND name LIKE 'a%%'", ("2",))
+
+        assert cursor.statements == [
+            ("PREPARE find_user AS SELECT * FROM users WHERE id = $1 AND name LIKE 'a%'", None),
+            ("EXECUTE find_user (%s)", ("1",)),
+            ("EXECUTE find_user (%s)", ("2",)),
+        ]
+
+    def test_should_prepare_statement_again_on_another_connection(self):
+        registry = Psycopg2PreparedStatementRegistry.get_instance()
+        first_conn = Connection()
+        second_conn = Connection()
+        cursor = CursorRecorder()
+
+        registry.execute(first_conn, cursor, "count_users", "SELECT COUNT(*) FROM users", ())
+        registry.execute(second_conn, cursor, "count_users", "SELECT COUNT(*) FROM users", ())
+
+        assert registry.is_prepared(first_conn, "count_users")
+        assert registry.is_prepared(second_conn, "count_users")
+        assert cursor.statements == [
+            ("PREPARE count_users AS SELECT COUNT(*) FROM users", None),
+            ("EXECUTE count_users", None),
+            ("PREPARE count_users AS SELECT COUNT(*) FROM users", None),
+            ("EXECUTE count_users", None),
+        ]
+
+    def test_should_not_register_statement_if_prepare_fails(self):
+        class FailingCursor(CursorRecorder):
+            def execute(self, query: str, vars: Any = None) -> None:
+                raise Exception("syntax error")
+
+        registry = Psycopg2PreparedStatementRegistry.get_instance()
+        conn = Connection()
+
+        with pytest.raises(Exception):
+            registry.execute(conn, FailingCursor(), "broken", "SELEC 1", ())
+
+        assert not registry.is_prepared(conn, "broken")
+
+    def test_should_raise_exception_if_name_is_reused_for_another_query(self):
+        registry = Psycopg2PreparedStatementRegistry.get_instance()
+        registry.register("find_user", "SELECT * FROM users WHERE id = %s")
+
+        with pytest.raises(Exception) as error:
+            registry.register("find_user", "SELECT * FROM users WHERE email = %s")
+
+        assert str(error.value) == 'prepared statement - "find_user" - is already registered with another query'
@@ -10,6 +10,9 @@ from src.infra.database.postgres.connection.psycopg2_connection import (
 from src.infra.database.postgres.psycopg2_transaction import (
     Psycopg2Transaction,
 )
+from src.infra.database.postgres.pool_metrics import PoolMetrics
+
+from src.infra.exceptions.database_acquire_timeout import DatabaseAcquireTimeoutException
 
 
 class Test_Psycopg2_Pool_Transaction:
@@ -136,3 +139,200 @@ class Test_Psycopg2_Pool_Transaction:
         await pool.disconnect()
 
         assert result == []
+
+    @pytest.mark.asyncio
+    async def test_should_send_held_back_statements_with_the_next_query(self, pool, container):
+        await pool.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+            )
+        )
+
+        sut = Psycopg2Transaction(pool)
+
+        await sut.create_client()
+        await sut.query(
+            {
+                "text": "CREATE TABLE test (id TEXT PRIMARY KEY, value TEXT NOT NULL)",
+                "values": [],
+            }
+        )
+        await sut.open_transaction()
+        await sut.defer_query(
+            {
+                "name": "test_insert",
+                "text": "INSERT INTO test (id, value) VALUES (%s, %s)",
+                "values": ("1", "anything"),
+            }
+        )
+        await sut.query(
+            {
+                "text": "SELECT * FROM test WHERE id = %s LIMIT 1",
+                "values": ("1",),
+            }
+        )
+        result = await sut.fetchall()
+        await sut.defer_query(
+            {
+                "name": "test_insert",
+                "text": "INSERT INTO test (id, value) VALUES (%s, %s)",
+                "values": ("2", "50%"),
+            }
+        )
+        await sut.commit()
+        await sut.query(
+            {
+                "text": "SELECT value FROM test WHERE id = %s LIMIT 1",
+                "values": ("2",),
+            }
+        )
+        committed = await sut.fetchall()
+        await sut.release()
+
+        await pool.disconnect()
+
+        assert result[0]["value"] == "anything"
+        assert committed[0]["value"] == "50%"
+
+    @pytest.mark.asyncio
+    async def test_should_drop_held_back_statements_on_rollback(self, pool, container):
+        await pool.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+            )
+        )
+
+        sut = Psycopg2Transaction(pool)
+
+        await sut.create_client()
+        await sut.query(
+            {
+                "text": "CREATE TABLE test (id TEXT PRIMARY KEY, value TEXT NOT NULL)",
+                "values": [],
+            }
+        )
+        await sut.open_transaction()
+        await sut.defer_query(
+            {
+                "text": "INSERT INTO test (id, value) VALUES (%s, %s)",
+                "values": ("1", "anything"),
+            }
+        )
+        await sut.rollback()
+        await sut.open_transaction()
+        await sut.defer_query(
+            {
+                "text": "INSERT INTO test (id, value) VALUES (%s, %s)",
+                "values": ("2", None),
+            }
+        )
+        with pytest.raises(Exception):
+            await sut.commit()
+        await sut.rollback()
+        await sut.query(
+            {
+                "text": "SELECT * FROM test",
+                "values": (),
+            }
+        )
+        result = await sut.fetchall()
+        await sut.release()
+
+        await pool.disconnect()
+
+        assert result == []
+
+    @pytest.mark.asyncio
+    async def test_should_run_queries_without_transaction_when_read_only(self, pool, container):
+        await pool.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+            )
+        )
+
+        sut = Psycopg2Transaction(pool)
+
+        await sut.create_client()
+        await sut.open_read_only_transaction()
+        await sut.query(
+            {
+                "text": "SELECT now() = statement_timestamp() AS own_transaction",
+                "values": (),
+            }
+        )
+        first = await sut.fetchall()
+        await sut.query(
+            {
+                "text": "SELECT now() = statement_timestamp() AS own_transaction",
+                "values": (),
+            }
+        )
+        second = await sut.fetchall()
+        await sut.rollback()
+        await sut.release()
+
+        await pool.disconnect()
+
+        assert first[0]["own_transaction"] is True
+        assert second[0]["own_transaction"] is True
+
+    @pytest.mark.asyncio
+    async def test_should_record_pool_metrics(self, pool, container):
+        PoolMetrics.reset_instance()
+
+        await pool.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+                acquire_timeout=0.05,
+            )
+        )
+
+        sut = Psycopg2Transaction(pool)
+        other = Psycopg2Transaction(pool)
+
+        await sut.create_client()
+
+        in_use = PoolMetrics.get_instance().in_use
+        idle = PoolMetrics.get_instance().idle
+
+        with pytest.raises(DatabaseAcquireTimeoutException):
+            await other.create_client()
+
+        await sut.release()
+
+        await pool.disconnect()
+
+        metrics = PoolMetrics.get_instance()
+
+        assert in_use == 1
+        assert idle == 0
+        assert metrics.in_use == 0
+        assert metrics.idle == 1
+        assert metrics.max == 1
+        assert metrics.checkouts == 1
+        assert metrics.exhaustions == 1
+        assert metrics.hold.count == 1
@@ -0,0 +1,308 @@
+import sys
+import subprocess
+
+import pytest
+
+from testcontainers.postgres import PostgresContainer
+
+from src.infra.database.postgres.connection.psycopg3_connection import (
+    Psycopg3PoolConnection,
+    Config,
+)
+
+from src.infra.database.postgres.psycopg3_transaction import (
+    Psycopg3Transaction,
+)
+
+
+class Test_Psycopg3_Pool_Transaction:
+    @pytest.fixture(scope="function")
+    def container(self):
+        postgres = (
+            PostgresContainer(
+                image="postgres:16-alpine",
+                dbname="postgres",
+                username="root",
+                password="root",
+                port=5432,
+            )
+            .with_bind_ports(5432, 5432)
+            .with_exposed_ports(5432)
+            .with_env("POSTGRES_MAX_CONNECTIONS", "1")
+        )
+
+        postgres.start()
+
+        yield postgres
+
+        postgres.stop(force=True, delete_volume=True)
+
+    @pytest.fixture(scope="function")
+    def pool(self):
+        conn_pool = Psycopg3PoolConnection.get_instance()
+
+        yield conn_pool
+
+        Psycopg3PoolConnection.reset_instance()
+
+    @pytest.mark.asyncio
+    async def test_should_commit(self, pool, container):
+        await pool.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+            )
+        )
+
+        sut = Psycopg3Transaction(pool)
+
+        await sut.create_client()
+        await sut.open_transaction()
+        await sut.query(
+            {
+                "text": "CREATE TABLE test (id TEXT PRIMARY KEY, value TEXT NOT NULL)",
+                "values": [],
+            }
+        )
+        await sut.query(
+            {
+                "text": "INSERT INTO test (id, value) VALUES (%s, %s)",
+                "values": ("1", "anything"),
+            }
+        )
+        await sut.query(
+            {
+                "text": "SELECT * FROM test WHERE id = %s LIMIT 1",
+                "values": ("1",),
+            }
+        )
+        result = await sut.fetchall()
+
+        await sut.commit()
+        await sut.release()
+
+        await pool.disconnect()
+
+        assert result[0]["id"] == "1"
+        assert result[0]["value"] == "anything"
+
+    @pytest.mark.asyncio
+    async def test_should_rollback(self, pool, container):
+        await pool.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+            )
+        )
+
+        sut = Psycopg3Transaction(pool)
+
+        await sut.create_client()
+        await sut.open_transaction()
+        await sut.query(
+            {
+                "text": "CREATE TABLE test (id TEXT PRIMARY KEY, value TEXT NOT NULL)",
+                "values": [],
+            }
+        )
+        await sut.commit()
+        await sut.release()
+
+        await sut.create_client()
+        await sut.open_transaction()
+        await sut.query(
+            {
+                "text": "INSERT INTO test (id, value) VALUES (%s, %s)",
+                "values": ("1", "anything"),
+            }
+        )
+        await sut.rollback()
+        await sut.query(
+            {
+                "text": "SELECT * FROM test WHERE id = %s LIMIT 1",
+                "values": ("1",),
+            }
+        )
+        result = await sut.fetchall()
+        await sut.release()
+
+        await pool.disconnect()
+
+        assert result == []
+
+    @pytest.mark.asyncio
+    async def test_should_send_held_back_statements_with_the_next_query(self, pool, container):
+        await pool.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+            )
+        )
+
+        sut = Psycopg3Transaction(pool)
+
+        await sut.create_client()
+        await sut.query(
+            {
+                "text": "CREATE TABLE test (id TEXT PRIMARY KEY, value TEXT NOT NULL)",
+                "values": [],
+            }
+        )
+        await sut.open_transaction()
+        await sut.defer_query(
+            {
+                "name": "test_insert",
+                "text": "INSERT INTO test (id, value) VALUES (%s, %s)",
+                "values": ("1", "anything"),
+            }
+        )
+        await sut.query(
+            {
+                "text": "SELECT * FROM test WHERE id = %s LIMIT 1",
+                "values": ("1",),
+            }
+        )
+        result = await sut.fetchall()
+        await sut.defer_query(
+            {
+                "name": "test_insert",
+                "text": "INSERT INTO test (id, value) VALUES (%s, %s)",
+                "values": ("2", "50%"),
+            }
+        )
+        await sut.commit()
+        await sut.query(
+            {
+                "text": "SELECT value FROM test WHERE id = %s LIMIT 1",
+                "values": ("2",),
+            }
+        )
+        committed = await sut.fetchall()
+        await sut.release()
+
+        await pool.disconnect()
+
+        assert result[0]["value"] == "anything"
+        assert committed[0]["value"] == "50%"
+
+    @pytest.mark.asyncio
+    async def test_should_drop_held_back_statements_on_rollback(self, pool, container):
+        await pool.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+            )
+        )
+
+        sut = Psycopg3Transaction(pool)
+
+        await sut.create_client()
+        await sut.query(
+            {
+                "text": "CREATE TABLE test (id TEXT PRIMARY KEY, value TEXT NOT NULL)",
+                "values": [],
+            }
+        )
+        await sut.open_transaction()
+        await sut.defer_query(
+            {
+                "text": "INSERT INTO test (id, value) VALUES (%s, %s)",
+                "values": ("1", "anything"),
+            }
+        )
+        await sut.rollback()
+        await sut.open_transaction()
+        await sut.defer_query(
+            {
+                "text": "INSERT INTO test (id, value) VALUES (%s, %s)",
+                "values": ("2", None),
+            }
+        )
+        with pytest.raises(Exception):
+            await sut.commit()
+        await sut.rollback()
+        await sut.query(
+            {
+                "text": "SELECT * FROM test",
+                "values": (),
+            }
+        )
+        result = await sut.fetchall()
+        await sut.release()
+
+        await pool.disconnect()
+
+        assert result == []
+
+    @pytest.mark.asyncio
+    async def test_should_run_queries_without_transaction_when_read_only(self, pool, container):
+        await pool.connect(
+            Config(
+                db=container.dbname,
+                user=container.username,
+                password=container.password,
+                port=container.get_exposed_port(5432),
+                host=container.get_container_host_ip(),
+                min=1,
+                max=1,
+            )
+        )
+
+        sut = Psycopg3Transaction(pool)
+
+        await sut.create_client()
+        await sut.open_read_only_transaction()
+        await sut.query(
+            {
+                "text": "SELECT now() = statement_timestamp() AS own_transaction",
+                "values": (),
+            }
+        )
+        first = await sut.fetchall()
+        await sut.query(
+            {
+                "text": "SELECT now() = statement_timestamp() AS own_transaction",
+                "values": (),
+            }
+        )
+        second = await sut.fetchall()
+        await sut.rollback()
+        await sut.release()
+
+        await pool.disconnect()
+
+        assert first[0]["own_transaction"] is True
+        assert second[0]["own_transaction"] is True
+
+    def test_should_load_without_psycopg2(self):
+        # psycopg2 can not be imported in this interpreter, as if only psycopg3 was installed
+        script = (
+            "import sys\n"
+            "sys.modules['psycopg2'] = None\n"
+            "import src.infra.database.postgres.psycopg3_transaction\n"
+            "import src.infra.database.postgres.connection.psycopg3_connection\n"
+        )
+
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
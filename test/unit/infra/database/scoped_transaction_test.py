@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from src.infra.database.scoped_transaction import ScopedTransaction
+from src.infra.database.postgres.spy_transaction import (
+    SpyTransaction,
+    QueryResponseWithSuccessObject,
+    CommitResponseWithSuccessObject,
+)
+
+
+class Test_Scoped_Transaction:
+    @pytest.mark.asyncio
+    async def test_should_raise_exception_if_scope_was_not_entered(self):
+        with pytest.raises(LookupError):
+            transaction = ScopedTransaction()
+            await transaction.commit()
+
+    @pytest.mark.asyncio
+    async def test_should_delegate_to_the_transaction_of_the_current_scope(self):
+        transaction = ScopedTransaction()
+        spy_transaction = SpyTransaction([], [], [], [], [], [CommitResponseWithSuccessObject(None)], [], [])
+
+        transaction.enter_scope(spy_transaction)
+        await transaction.commit()
+
+        assert spy_transaction.commit_counter == 1
+
+    @pytest.mark.asyncio
+    async def test_should_keep_concurrent_scopes_apart(self):
+        transaction = ScopedTransaction()
+        spy_transactions = [
+            SpyTransaction([QueryResponseWithSuccessObject(None)], [], [], [], [], [], [], []),
+            SpyTransaction([QueryResponseWithSuccessObject(None)], [], [], [], [], [], [], []),
+        ]
+
+        async def request(spy_transaction: SpyTransaction) -> None:
+            transaction.enter_scope(spy_transaction)
+            await asyncio.sleep(0)
+            await transaction.query({"text": "SELECT 1", "values": ()})
+
+        await asyncio.gather(*[request(spy_transaction) for spy_transaction in spy_transactions])
+
+        assert spy_transactions[0].query_counter == 1
+        assert spy_transactions[1].query_counter == 1
@@ -0,0 +1,93 @@
+import pytest
+
+from src.infra.database.postgres.spy_transaction import (
+    SpyTransaction,
+    QueryResponseWithSuccessObject,
+    FetchallResponseWithSuccessObject,
+)
+
+from src.infra.exceptions.database_lock_timeout import DatabaseLockTimeoutException
+
+from src.infra.locks.advisory_lock import PostgresAdvisoryLock
+from src.infra.locks.lock_metrics import LockMetrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    LockMetrics.reset_instance()
+    yield
+    LockMetrics.reset_instance()
+
+
+class Test_Postgres_Advisory_Lock:
+    @pytest.mark.asyncio
+    async def test_should_take_free_lock_in_a_single_query(self):
+        spy_transaction = SpyTransaction(
+            [QueryResponseWithSuccessObject(None)],
+            [FetchallResponseWithSuccessObject([{"locked": True}])],
+            [],
+            [],
+            [],
+            [],
+            [],
+            [],
+        )
+        sut = PostgresAdvisoryLock(spy_transaction)
+
+        await sut.acquire("a8351752-ec32-4578-bdb6-883d703cbee7")
+
+        assert spy_transaction.query_counter == 1
+        assert LockMetrics.get_instance().advisory_acquisitions == 1
+        assert LockMetrics.get_instance().advisory_contentions == 0
+
+    @pytest.mark.asyncio
+    async def test_should_wait_for_lock_held_by_another_transaction(self):
+        spy_transaction = SpyTransaction(
+            [QueryResponseWithSuccessObject(None), QueryResponseWithSuccessObject(None)],
+            [
+                FetchallResponseWithSuccessObject([{"locked": False}]),
+                FetchallResponseWithSuccessObject([{"locked": True}]),
+            ],
+            [],
+            [],
+            [],
+            [],
+            [],
+            [],
+        )
+        sut = PostgresAdvisoryLock(spy_transaction, poll_initial=0.001)
+
+        await sut.acquire("a8351752-ec32-4578-bdb6-883d703cbee7")
+
+        assert spy_transaction.query_counter == 2
+        assert LockMetrics.get_instance().advisory_acquisitions == 1
+        assert LockMetrics.get_instance().advisory_contentions == 1
+
+    @pytest.mark.asyncio
+    async def test_should_give_up_when_lock_is_not_released_in_time(self):
+        spy_transaction = SpyTransaction(
+            [QueryResponseWithSuccessObject(None) for _ in range(100)],
+            [FetchallResponseWithSuccessObject([{"locked": False}]) for _ in range(100)],
+            [],
+            [],
+            [],
+            [],
+            [],
+            [],
+        )
+        sut = PostgresAdvisoryLock(spy_transaction, lock_timeout=0.05, poll_initial=0.001, poll_max=0.01)
+
+        with pytest.raises(DatabaseLockTimeoutException):
+            await sut.acquire("a8351752-ec32-4578-bdb6-883d703cbee7")
+
+        assert spy_transaction.query_counter > 2
+        assert LockMetrics.get_instance().advisory_acquisitions == 0
+
+    @pytest.mark.asyncio
+    async def test_should_leave_release_to_the_end_of_the_transaction(self):
+        spy_transaction = SpyTransaction([], [], [], [], [], [], [], [])
+        sut = PostgresAdvisoryLock(spy_transaction)
+
+        await sut.release("a8351752-ec32-4578-bdb6-883d703cbee7")
+
+        assert spy_transaction.query_counter == 0
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from src.infra.locks.keyed_async_lock import KeyedAsyncLock
+from src.infra.locks.lock_metrics import LockMetrics
+
+
+@pytest.fixture(autouse=True)
+def reset_lock():
+    KeyedAsyncLock.reset_instance()
+    LockMetrics.reset_instance()
+    yield
+    KeyedAsyncLock.reset_instance()
+    LockMetrics.reset_instance()
+
+
+class Test_Keyed_Async_Lock:
+    def test_should_raise_exception_by_using_constructor(self):
+        with pytest.raises(Exception, match="Use the 'get_instance' method to create an instance of this class."):
+            KeyedAsyncLock()
+
+    def test_should_return_the_same_instance(self):
+        assert KeyedAsyncLock.get_instance() is KeyedAsyncLock.get_instance()
+
+    @pytest.mark.asyncio
+    async def test_should_let_one_holder_of_the_same_key_at_a_time(self):
+        sut = KeyedAsyncLock.get_instance()
+        events: list[str] = []
+
+        async def hold(name: str) -> None:
+            await sut.acquire("machine")
+            events.append(name + " in")
+            await asyncio.sleep(0.01)
+            events.append(name + " out")
+            await sut.release("machine")
+
+        await asyncio.gather(hold("first"), hold("second"))
+
+        assert events == ["first in", "first out", "second in", "second out"]
+        assert LockMetrics.get_instance().acquisitions == 2
+        assert LockMetrics.get_instance().contentions == 1
+
+    @pytest.mark.asyncio
+    async def test_should_not_make_different_keys_wait(self):
+        sut = KeyedAsyncLock.get_instance()
+
+        await sut.acquire("machine")
+        await asyncio.wait_for(sut.acquire("other machine"), 0.1)
+
+        assert LockMetrics.get_instance().contentions == 0
+
+    @pytest.mark.asyncio
+    async def test_should_forget_keys_nobody_holds_nor_waits_for(self):
+        sut = KeyedAsyncLock.get_instance()
+
+        await sut.acquire("machine")
+        waiter = asyncio.create_task(sut.acquire("machine"))
+        await asyncio.sleep(0)
+
+        assert LockMetrics.get_instance().waiting == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await sut.release("machine")
+
+        assert len(sut) == 0
+        assert LockMetrics.get_instance().waiting == 0
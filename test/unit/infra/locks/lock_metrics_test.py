@@ -0,0 +1,27 @@
+import pytest
+
+from src.infra.locks.lock_metrics import LockMetrics
+
+
+class Test_Lock_Metrics:
+    @pytest.fixture(autouse=True)
+    def reset_metrics(self):
+        LockMetrics.reset_instance()
+
+    def test_should_render_prometheus_text_format(self):
+        sut = LockMetrics.get_instance()
+
+        sut.record_acquire(0.0, False)
+        sut.record_acquire(0.02, True)
+        sut.record_advisory_acquire(0.3, True)
+
+        output = sut.render()
+
+        assert "machine_lock_waiting 0\n" in output
+        assert "machine_lock_acquisitions_total 2\n" in output
+        assert "machine_lock_contentions_total 1\n" in output
+        assert "machine_advisory_lock_acquisitions_total 1\n" in output
+        assert "machine_advisory_lock_contentions_total 1\n" in output
+        assert 'machine_lock_wait_seconds_bucket{le="0.025"} 2\n' in output
+        assert 'machine_advisory_lock_wait_seconds_bucket{le="0.25"} 0\n' in output
+        assert 'machine_advisory_lock_wait_seconds_bucket{le="0.5"} 1\n' in output
@@ -0,0 +1,108 @@
+import pytest
+
+from src.domain.value_objects.uuid import UUIDValueObject
+from src.domain.value_objects.coins import CoinsVector
+
+from src.domain.entities.owner import OwnerEntity
+from src.domain.entities.product import ProductEntity
+from src.domain.entities.machine import MachineEntity, MachineState
+
+from src.infra.cache.machine_catalog_cache import MachineCatalogCache
+from src.infra.repositories.machine.cached_machine_repository import CachedMachineRepository
+from src.infra.repositories.machine.stub_machine_repository import (
+    StubMachineRepository,
+    FindByIdResponseWithSuccessObject,
+    UpdateResponseWithSuccessObject,
+    SaveResponseWithSuccessObject,
+)
+
+
+def make_machine() -> MachineEntity:
+    owner = OwnerEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com")
+    products = [ProductEntity.create("223e4567-e89b-12d3-a456-426614174003", "Pepsi", 10, "00", 150)]
+    return MachineEntity.create(
+        "a8351752-ec32-4578-bdb6-883d703cbee7",
+        owner,
+        MachineState.READY,
+        CoinsVector.create(1, 2, 3, 4, 5, 6),
+        products,
+    )
+
+
+@pytest.fixture
+def cache():
+    MachineCatalogCache.reset_instance()
+    yield MachineCatalogCache.get_instance()
+    MachineCatalogCache.reset_instance()
+
+
+class Test_Cached_Machine_Repository:
+    @pytest.mark.asyncio
+    async def test_should_load_machine_once_while_cached(self, cache):
+        machine = make_machine()
+        sut = CachedMachineRepository(
+            StubMachineRepository([FindByIdResponseWithSuccessObject(machine)], [], []), cache
+        )
+
+        first = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        second = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+
+        assert first is machine
+        assert second is not machine
+        assert second.id.value == machine.id.value
+        assert second.owner.email.value == "test@mail.com"
+        assert second.state == MachineState.READY
+        assert second.coins == CoinsVector.create(1, 2, 3, 4, 5, 6)
+        assert second.find_product_by_code("00").qty == 10
+        assert second.find_product_by_code("00").unit_price == 150
+
+    @pytest.mark.asyncio
+    async def test_should_not_share_changes_made_to_cached_machines(self, cache):
+        machine = make_machine()
+        sut = CachedMachineRepository(
+            StubMachineRepository([FindByIdResponseWithSuccessObject(machine)], [], []), cache
+        )
+
+        await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        cached = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        cached.deliver_product(cached.find_product_by_code("00").id)
+        result = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+
+        assert result.find_product_by_code("00").qty == 10
+
+    @pytest.mark.asyncio
+    async def test_should_not_cache_machines_that_were_not_found(self, cache):
+        machine = make_machine()
+        sut = CachedMachineRepository(
+            StubMachineRepository(
+                [FindByIdResponseWithSuccessObject(None), FindByIdResponseWithSuccessObject(machine)], [], []
+            ),
+            cache,
+        )
+
+        first = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        second = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+
+        assert first is None
+        assert second is machine
+
+    @pytest.mark.asyncio
+    async def test_should_load_machine_again_after_update_and_save(self, cache):
+        machine = make_machine()
+        sut = CachedMachineRepository(
+            StubMachineRepository(
+                [FindByIdResponseWithSuccessObject(machine)] * 3,
+                [UpdateResponseWithSuccessObject()],
+                [SaveResponseWithSuccessObject()],
+            ),
+            cache,
+        )
+
+        await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        await sut.update(machine)
+        after_update = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        await sut.save(machine)
+        after_save = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+
+        assert after_update is machine
+        assert after_save is machine
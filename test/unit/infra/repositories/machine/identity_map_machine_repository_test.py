@@ -0,0 +1,146 @@
+import pytest
+
+from src.domain.value_objects.uuid import UUIDValueObject
+from src.domain.value_objects.coins import CoinsVector, CoinTypes
+
+from src.domain.entities.owner import OwnerEntity
+from src.domain.entities.machine import MachineEntity, MachineState
+
+from src.infra.cache.machine_catalog_cache import MachineCatalogCache
+from src.infra.repositories.machine.identity_map_machine_repository import IdentityMapMachineRepository
+from src.infra.repositories.machine.stub_machine_repository import (
+    StubMachineRepository,
+    FindByIdResponseWithSuccessObject,
+    UpdateResponseWithSuccessObject,
+    SaveResponseWithSuccessObject,
+)
+
+
+def make_machine() -> MachineEntity:
+    owner = OwnerEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com")
+    return MachineEntity.create(
+        "a8351752-ec32-4578-bdb6-883d703cbee7", owner, MachineState.READY, CoinsVector.create(0, 0, 0, 0, 0, 0), []
+    )
+
+
+@pytest.fixture
+def cache():
+    MachineCatalogCache.reset_instance()
+    yield MachineCatalogCache.get_instance()
+    MachineCatalogCache.reset_instance()
+
+
+class Test_Identity_Map_Machine_Repository:
+    @pytest.mark.asyncio
+    async def test_should_load_machine_once_per_transaction(self):
+        machine = make_machine()
+        sut = IdentityMapMachineRepository(StubMachineRepository([FindByIdResponseWithSuccessObject(machine)], [], []))
+
+        first = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        second = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+
+        assert first is machine
+        assert second is machine
+
+    @pytest.mark.asyncio
+    async def test_should_not_keep_machines_that_were_not_found(self):
+        machine = make_machine()
+        sut = IdentityMapMachineRepository(
+            StubMachineRepository(
+                [FindByIdResponseWithSuccessObject(None), FindByIdResponseWithSuccessObject(machine)], [], []
+            )
+        )
+
+        first = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        second = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+
+        assert first is None
+        assert second is machine
+
+    @pytest.mark.asyncio
+    async def test_should_return_saved_machine_without_loading_it(self):
+        machine = make_machine()
+        sut = IdentityMapMachineRepository(StubMachineRepository([], [], [SaveResponseWithSuccessObject()]))
+
+        await sut.save(machine)
+        result = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+
+        assert result is machine
+
+    @pytest.mark.asyncio
+    async def test_should_flush_dirty_machine_once(self):
+        machine = make_machine()
+        sut = IdentityMapMachineRepository(
+            StubMachineRepository([FindByIdResponseWithSuccessObject(machine)], [UpdateResponseWithSuccessObject()], [])
+        )
+
+        found = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        found.add_coins(CoinsVector.create(1, 0, 0, 0, 0, 0))
+        await sut.update(found)
+        found.start_dispense_product()
+        await sut.update(found)
+        await sut.flush()
+        await sut.flush()
+
+        assert machine.coins[CoinTypes.COIN_01] == 1
+        assert machine.state == MachineState.DISPENSING
+
+    @pytest.mark.asyncio
+    async def test_should_load_machine_again_after_clear(self):
+        machine = make_machine()
+        reloaded_machine = make_machine()
+        sut = IdentityMapMachineRepository(
+            StubMachineRepository(
+                [FindByIdResponseWithSuccessObject(machine), FindByIdResponseWithSuccessObject(reloaded_machine)],
+                [],
+                [],
+            )
+        )
+
+        await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        await sut.update(machine)
+        await sut.clear()
+        await sut.flush()
+        result = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+
+        assert result is reloaded_machine
+
+    @pytest.mark.asyncio
+    async def test_should_evict_written_machine_from_catalog_cache_only_after_commit(self, cache):
+        machine = make_machine()
+        sut = IdentityMapMachineRepository(
+            StubMachineRepository(
+                [FindByIdResponseWithSuccessObject(machine)], [UpdateResponseWithSuccessObject()], []
+            ),
+            cache,
+        )
+        cache.put(machine.id.value, "snapshot", cache.generation)
+
+        found = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        await sut.update(found)
+        await sut.flush()
+        cached_before_commit = cache.get(machine.id.value)
+        await sut.after_commit()
+        cached_after_commit = cache.get(machine.id.value)
+
+        assert cached_before_commit == "snapshot"
+        assert cached_after_commit is None
+
+    @pytest.mark.asyncio
+    async def test_should_not_evict_machines_of_a_transaction_that_was_cleared(self, cache):
+        machine = make_machine()
+        sut = IdentityMapMachineRepository(
+            StubMachineRepository(
+                [FindByIdResponseWithSuccessObject(machine)], [UpdateResponseWithSuccessObject()], []
+            ),
+            cache,
+        )
+        cache.put(machine.id.value, "snapshot", cache.generation)
+
+        found = await sut.find_by_id(UUIDValueObject.create(machine.id.value))
+        await sut.update(found)
+        await sut.flush()
+        await sut.clear()
+        await sut.after_commit()
+
+        assert cache.get(machine.id.value) == "snapshot"
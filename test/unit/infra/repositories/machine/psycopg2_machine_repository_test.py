@@ -4,6 +4,7 @@ import pytest_asyncio
 from testcontainers.postgres import PostgresContainer
 
 from src.domain.value_objects.uuid import UUIDValueObject
+from src.domain.value_objects.coins import CoinsVector, CoinTypes
 from src.domain.entities.owner import OwnerEntity
 from src.domain.entities.product import ProductEntity
 from src.domain.entities.machine import MachineEntity, MachineState
@@ -12,17 +13,21 @@ from src.services.contracts.database.base import (
     IDatabaseTransaction,
     IDatabasePoolConnection,
 )
+from src.services.exceptions.concurrent_machine_update import ConcurrentMachineUpdateException
 
-from src.infra.database.postgres.connection.psycopg2_connection import (
-    Psycopg2PoolConnection,
-    Config,
-)
-from src.infra.database.postgres.psycopg2_transaction import (
-    Psycopg2Transaction,
+from src.infra.database.postgres.connection.config import Config
+
+from src.infra.database.postgres.spy_transaction import (
+    SpyTransaction,
+    QueryResponseWithSuccessObject,
+    FetchallResponseWithSuccessObject,
 )
 
 from src.infra.repositories.machine.psycopg2_machine_repository import Psycopg2MachineRepository
 
+from src.main.factories.infra.database_conn import make_conn
+from src.main.factories.infra.database_transaction import make_transaction
+
 
 class Test_Psycopg2_Machine_Repository:
     @pytest.fixture
@@ -45,10 +50,13 @@ class Test_Psycopg2_Machine_Repository:
 
         postgres.stop(force=True, delete_volume=True)
 
-    @pytest_asyncio.fixture
-    async def pool(self, postgres_container: PostgresContainer) -> IDatabasePoolConnection:
+    @pytest_asyncio.fixture(params=["psycopg2", "psycopg3"])
+    async def pool(
+        self, request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch, postgres_container: PostgresContainer
+    ) -> IDatabasePoolConnection:
         container = postgres_container
-        conn_pool = Psycopg2PoolConnection.get_instance()
+        monkeypatch.setenv("POSTGRES_DRIVER", request.param)
+        conn_pool = make_conn()
 
         await conn_pool.connect(
             Config(
@@ -66,11 +74,11 @@ class Test_Psycopg2_Machine_Repository:
 
         await conn_pool.disconnect()
 
-        Psycopg2PoolConnection.reset_instance()
+        type(conn_pool).reset_instance()
 
     @pytest.fixture
     def transaction(self, pool) -> IDatabaseTransaction:
-        return Psycopg2Transaction(pool)
+        return make_transaction(pool)
 
     async def create_db(self, t: IDatabaseTransaction) -> None:
         await t.query(
@@ -124,18 +132,38 @@ class Test_Psycopg2_Machine_Repository:
                     id UUID NOT NULL,
                     owner_id UUID NOT NULL,
                     state machine_state NOT NULL,
-                    coin_01_qty SMALLINT NOT NULL,
-                    coin_05_qty SMALLINT NOT NULL,
-                    coin_10_qty SMALLINT NOT NULL,
-                    coin_25_qty SMALLINT NOT NULL,
-                    coin_50_qty SMALLINT NOT NULL,
-                    coin_100_qty SMALLINT NOT NULL,
+                    coin_01_qty INT NOT NULL,
+                    coin_05_qty INT NOT NULL,
+                    coin_10_qty INT NOT NULL,
+                    coin_25_qty INT NOT NULL,
+                    coin_50_qty INT NOT NULL,
+                    coin_100_qty INT NOT NULL,
+                    version INT NOT NULL DEFAULT 0,
                     CONSTRAINT pk_machine_id PRIMARY KEY (id)
                 );""",
                 "values": [],
             }
         )
 
+        await t.query(
+            {
+                "text": """CREATE TABLE IF NOT EXISTS machines_schema.coin_movements(
+                    id BIGINT GENERATED ALWAYS AS IDENTITY,
+                    machine_id UUID NOT NULL,
+                    coin_01_qty INT NOT NULL,
+                    coin_05_qty INT NOT NULL,
+                    coin_10_qty INT NOT NULL,
+                    coin_25_qty INT NOT NULL,
+                    coin_50_qty INT NOT NULL,
+                    coin_100_qty INT NOT NULL,
+                    created_at TIMESTAMP NOT NULL DEFAULT now(),
+                    CONSTRAINT pk_coin_movement_id PRIMARY KEY (id),
+                    CONSTRAINT fk_machine_id FOREIGN KEY(machine_id) REFERENCES machines_schema.machines(id) ON UPDATE CASCADE ON DELETE CASCADE
+                );""",
+                "values": [],
+            }
+        )
+
         await t.query(
             {
                 "text": """
@@ -213,16 +241,62 @@ class Test_Psycopg2_Machine_Repository:
                     machine.id.value,
                     machine.owner.id.value,
                     machine.state.value,
-                    machine.coin_01.qty,
-                    machine.coin_05.qty,
-                    machine.coin_10.qty,
-                    machine.coin_25.qty,
-                    machine.coin_50.qty,
-                    machine.coin_100.qty,
+                    machine.coins[CoinTypes.COIN_01],
+                    machine.coins[CoinTypes.COIN_05],
+                    machine.coins[CoinTypes.COIN_10],
+                    machine.coins[CoinTypes.COIN_25],
+                    machine.coins[CoinTypes.COIN_50],
+                    machine.coins[CoinTypes.COIN_100],
                 ),
             }
         )
 
+    async def compact_coin_movements(self, t: IDatabaseTransaction) -> None:
+        await t.query(
+            {
+                "text": """
+                    CREATE OR REPLACE FUNCTION fn_compact_coin_movements()
+                    RETURNS VOID AS $$
+                    DECLARE
+                        machine RECORD;
+                    BEGIN
+                        FOR machine IN SELECT DISTINCT machine_id AS id FROM machines_schema.coin_movements LOOP
+                            BEGIN
+                                WITH folded AS (
+                                    DELETE FROM machines_schema.coin_movements
+                                    WHERE machine_id = machine.id
+                                    RETURNING machine_id, coin_01_qty, coin_05_qty, coin_10_qty, coin_25_qty, coin_50_qty, coin_100_qty
+                                ), totals AS (
+                                    SELECT machine_id,
+                                           SUM(coin_01_qty) AS coin_01_qty,
+                                           SUM(coin_05_qty) AS coin_05_qty,
+                                           SUM(coin_10_qty) AS coin_10_qty,
+                                           SUM(coin_25_qty) AS coin_25_qty,
+                                           SUM(coin_50_qty) AS coin_50_qty,
+                                           SUM(coin_100_qty) AS coin_100_qty
+                                    FROM folded
+                                    GROUP BY machine_id
+                                )
+                                UPDATE machines_schema.machines machines
+                                SET coin_01_qty = machines.coin_01_qty + totals.coin_01_qty,
+                                    coin_05_qty = machines.coin_05_qty + totals.coin_05_qty,
+                                    coin_10_qty = machines.coin_10_qty + totals.coin_10_qty,
+                                    coin_25_qty = machines.coin_25_qty + totals.coin_25_qty,
+                                    coin_50_qty = machines.coin_50_qty + totals.coin_50_qty,
+                                    coin_100_qty = machines.coin_100_qty + totals.coin_100_qty
+                                FROM totals
+                                WHERE machines.id = totals.machine_id;
+                            EXCEPTION WHEN OTHERS THEN
+                                RAISE WARNING 'coin movements of machine %% were not compacted: %%', machine.id, SQLERRM;
+                            END;
+                        END LOOP;
+                    END;
+                    $$ LANGUAGE plpgsql;""",
+                "values": [],
+            }
+        )
+        await t.query({"text": "SELECT fn_compact_coin_movements();", "values": []})
+
     async def open_transaction(self, t: IDatabaseTransaction) -> None:
         await t.create_client()
         await t.open_transaction()
@@ -261,12 +335,7 @@ class Test_Psycopg2_Machine_Repository:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -280,18 +349,79 @@ class Test_Psycopg2_Machine_Repository:
         await self.commit_transaction(transaction)
 
         assert result.id.value == machine_id
-        assert result.coin_01.qty == 0
-        assert result.coin_05.qty == 0
-        assert result.coin_10.qty == 0
-        assert result.coin_25.qty == 0
-        assert result.coin_50.qty == 0
-        assert result.coin_100.qty == 0
+        assert result.coins[CoinTypes.COIN_01] == 0
+        assert result.coins[CoinTypes.COIN_05] == 0
+        assert result.coins[CoinTypes.COIN_10] == 0
+        assert result.coins[CoinTypes.COIN_25] == 0
+        assert result.coins[CoinTypes.COIN_50] == 0
+        assert result.coins[CoinTypes.COIN_100] == 0
         assert result.state == MachineState.READY
         assert result.owner.email.value == "test@mail.com"
         assert result.owner.full_name == "Sebastião Maia"
         assert result.owner.id.value == owner_id
         assert len(result.products) == 1
 
+    @pytest.mark.asyncio
+    async def test_should_load_machine_aggregate_in_a_single_query(self):
+        owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
+        machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
+
+        spy_transaction = SpyTransaction(
+            [QueryResponseWithSuccessObject(None)],
+            [
+                FetchallResponseWithSuccessObject(
+                    [
+                        {
+                            "id": machine_id,
+                            "state": "READY",
+                            "coin_01_qty": 1,
+                            "coin_05_qty": 2,
+                            "coin_10_qty": 3,
+                            "coin_25_qty": 4,
+                            "coin_50_qty": 5,
+                            "coin_100_qty": 6,
+                            "version": 3,
+                            "owner_id": owner_id,
+                            "owner_full_name": "Sebastião Maia",
+                            "owner_email": "test@mail.com",
+                            "products": [
+                                {
+                                    "product_id": "b9651752-6c44-4578-bdb6-883d703cbfff",
+                                    "name": "Hersheys",
+                                    "unit_price": 75,
+                                    "code": "00",
+                                    "qty": 10,
+                                }
+                            ],
+                        }
+                    ]
+                )
+            ],
+            [],
+            [],
+            [],
+            [],
+            [],
+            [],
+        )
+
+        repo = Psycopg2MachineRepository(spy_transaction)
+        result = await repo.find_by_id(UUIDValueObject.create(machine_id))
+
+        assert spy_transaction.query_counter == 1
+        assert spy_transaction.fetchall_counter == 1
+
+        assert result.id.value == machine_id
+        assert result.coins[CoinTypes.COIN_01] == 1
+        assert result.coins[CoinTypes.COIN_100] == 6
+        assert result.owner.id.value == owner_id
+        assert result.owner.full_name == "Sebastião Maia"
+        assert result.products[0].id.value == "b9651752-6c44-4578-bdb6-883d703cbfff"
+        assert result.products[0].code == "00"
+        assert result.products[0].qty == 10
+        assert result.products[0].unit_price == 75
+        assert result.version == 3
+
     @pytest.mark.asyncio
     async def test_should_save_new_machine(self, transaction):
         await self.open_transaction(transaction)
@@ -306,12 +436,7 @@ class Test_Psycopg2_Machine_Repository:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -324,12 +449,12 @@ class Test_Psycopg2_Machine_Repository:
         await self.commit_transaction(transaction)
 
         assert result.id.value == machine_id
-        assert result.coin_01.qty == 0
-        assert result.coin_05.qty == 0
-        assert result.coin_10.qty == 0
-        assert result.coin_25.qty == 0
-        assert result.coin_50.qty == 0
-        assert result.coin_100.qty == 0
+        assert result.coins[CoinTypes.COIN_01] == 0
+        assert result.coins[CoinTypes.COIN_05] == 0
+        assert result.coins[CoinTypes.COIN_10] == 0
+        assert result.coins[CoinTypes.COIN_25] == 0
+        assert result.coins[CoinTypes.COIN_50] == 0
+        assert result.coins[CoinTypes.COIN_100] == 0
         assert result.state == MachineState.READY
         assert result.owner.email.value == "test@mail.com"
         assert result.owner.full_name == "Sebastião Maia"
@@ -350,12 +475,7 @@ class Test_Psycopg2_Machine_Repository:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -364,21 +484,258 @@ class Test_Psycopg2_Machine_Repository:
         repo = Psycopg2MachineRepository(transaction)
         await repo.save(machine)
 
-        machine.add_coins(1, 0, 0, 0, 0, 0)
+        machine.add_coins(CoinsVector.create(1, 0, 0, 0, 0, 0))
         await repo.update(machine)
         result = await repo.find_by_id(machine.id)
 
         await self.commit_transaction(transaction)
 
         assert result.id.value == machine_id
-        assert result.coin_01.qty == 1
-        assert result.coin_05.qty == 0
-        assert result.coin_10.qty == 0
-        assert result.coin_25.qty == 0
-        assert result.coin_50.qty == 0
-        assert result.coin_100.qty == 0
+        assert result.coins[CoinTypes.COIN_01] == 1
+        assert result.coins[CoinTypes.COIN_05] == 0
+        assert result.coins[CoinTypes.COIN_10] == 0
+        assert result.coins[CoinTypes.COIN_25] == 0
+        assert result.coins[CoinTypes.COIN_50] == 0
+        assert result.coins[CoinTypes.COIN_100] == 0
         assert result.state == MachineState.READY
         assert result.owner.email.value == "test@mail.com"
         assert result.owner.full_name == "Sebastião Maia"
         assert result.owner.id.value == owner_id
         assert len(result.products) == 1
+
+    @pytest.mark.asyncio
+    async def test_should_refuse_update_of_machine_changed_since_it_was_read(self, transaction):
+        await self.open_transaction(transaction)
+        await self.create_db(transaction)
+
+        owner = OwnerEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            "a8351752-ec32-4578-bdb6-883d703cbee7",
+            owner,
+            MachineState.READY,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
+            [],
+        )
+
+        repo = Psycopg2MachineRepository(transaction)
+        await repo.save(machine)
+
+        first_read = await repo.find_by_id(machine.id)
+        second_read = await repo.find_by_id(machine.id)
+
+        first_read.start_dispense_product()
+        await repo.update(first_read)
+
+        second_read.start_dispense_product()
+        with pytest.raises(ConcurrentMachineUpdateException):
+            await repo.update(second_read)
+
+        await self.rollback_transaction(transaction)
+
+        assert first_read.version == 1
+        assert second_read.version == 0
+
+    @pytest.mark.asyncio
+    async def test_should_not_query_database_if_machine_did_not_change(self):
+        owner = OwnerEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            "a8351752-ec32-4578-bdb6-883d703cbee7",
+            owner,
+            MachineState.READY,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
+            [ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbfff", "Hersheys", 1, "00", 0)],
+        )
+        spy_transaction = SpyTransaction([], [], [], [], [], [], [], [])
+
+        repo = Psycopg2MachineRepository(spy_transaction)
+        await repo.update(machine)
+
+        assert spy_transaction.query_counter == 0
+
+    @pytest.mark.asyncio
+    async def test_should_only_update_changed_columns(self):
+        owner = OwnerEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            "a8351752-ec32-4578-bdb6-883d703cbee7",
+            owner,
+            MachineState.READY,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
+            [],
+        )
+        machine.start_dispense_product()
+        queries: list = []
+
+        class CapturingQueryResponse(QueryResponseWithSuccessObject):
+            def execute(self, input_data):
+                queries.append(input_data)
+
+        spy_transaction = SpyTransaction(
+            [CapturingQueryResponse(None)],
+            [FetchallResponseWithSuccessObject([{"version": 1}])],
+            [],
+            [],
+            [],
+            [],
+            [],
+            [],
+        )
+
+        repo = Psycopg2MachineRepository(spy_transaction)
+        await repo.update(machine)
+        await repo.update(machine)
+
+        assert spy_transaction.query_counter == 1
+        assert "state = %s" in queries[0]["text"]
+        assert "coin_" not in queries[0]["text"]
+        assert "owners" not in queries[0]["text"]
+        assert queries[0]["values"] == ("DISPENSING", "a8351752-ec32-4578-bdb6-883d703cbee7", 0)
+        assert machine.version == 1
+
+    @pytest.mark.asyncio
+    async def test_should_record_coin_changes_as_a_movement_without_updating_the_machine(self):
+        owner = OwnerEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            "a8351752-ec32-4578-bdb6-883d703cbee7",
+            owner,
+            MachineState.READY,
+            CoinsVector.create(0, 0, 0, 1, 0, 0),
+            [],
+        )
+        machine.add_coins(CoinsVector.create(0, 0, 0, 0, 1, 1))
+        machine.subtract_coins(CoinsVector.create(0, 0, 0, 1, 0, 0))
+        queries: list = []
+
+        class CapturingQueryResponse(QueryResponseWithSuccessObject):
+            def execute(self, input_data):
+                queries.append(input_data)
+
+        spy_transaction = SpyTransaction([CapturingQueryResponse(None)], [], [], [], [], [], [], [])
+
+        repo = Psycopg2MachineRepository(spy_transaction)
+        await repo.update(machine)
+
+        assert spy_transaction.query_counter == 1
+        assert "INSERT INTO machines_schema.coin_movements" in queries[0]["text"]
+        assert "UPDATE machines_schema.machines" not in queries[0]["text"]
+        assert queries[0]["values"] == ("a8351752-ec32-4578-bdb6-883d703cbee7", 0, 0, 0, -1, 1, 1)
+        assert machine.version == 0
+
+    @pytest.mark.asyncio
+    async def test_should_keep_coins_when_movements_are_compacted(self, transaction):
+        await self.open_transaction(transaction)
+        await self.create_db(transaction)
+
+        owner = OwnerEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            "a8351752-ec32-4578-bdb6-883d703cbee7",
+            owner,
+            MachineState.READY,
+            CoinsVector.create(1, 1, 1, 1, 1, 1),
+            [],
+        )
+
+        repo = Psycopg2MachineRepository(transaction)
+        await repo.save(machine)
+
+        machine.add_coins(CoinsVector.create(0, 0, 0, 0, 2, 0))
+        await repo.update(machine)
+        machine.subtract_coins(CoinsVector.create(1, 0, 0, 1, 0, 0))
+        await repo.update(machine)
+
+        before_compaction = await repo.find_by_id(machine.id)
+        await self.compact_coin_movements(transaction)
+        after_compaction = await repo.find_by_id(machine.id)
+
+        await self.commit_transaction(transaction)
+
+        assert tuple(before_compaction.coins) == (0, 1, 1, 0, 3, 1)
+        assert tuple(after_compaction.coins) == (0, 1, 1, 0, 3, 1)
+
+    @pytest.mark.asyncio
+    async def test_should_compact_other_machines_when_one_cannot_be_compacted(self, transaction):
+        await self.open_transaction(transaction)
+        await self.create_db(transaction)
+
+        owner = OwnerEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com")
+        overflowing = MachineEntity.create(
+            "a8351752-ec32-4578-bdb6-883d703cbee7", owner, MachineState.READY, CoinsVector.create(0, 0, 0, 0, 0, 0), []
+        )
+        other_owner = OwnerEntity.create("b9651752-6c44-4578-bdb6-883d703cbff6", "Jane Doe", "jane@mail.com")
+        machine = MachineEntity.create(
+            "a8351752-ec32-4578-bdb6-883d703cbee8",
+            other_owner,
+            MachineState.READY,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
+            [],
+        )
+
+        repo = Psycopg2MachineRepository(transaction)
+        await repo.save(overflowing)
+        await repo.save(machine)
+
+        overflowing.add_coins(CoinsVector.create(2_000_000_000, 0, 0, 0, 0, 0))
+        await repo.update(overflowing)
+        overflowing.add_coins(CoinsVector.create(2_000_000_000, 0, 0, 0, 0, 0))
+        await repo.update(overflowing)
+        machine.add_coins(CoinsVector.create(0, 0, 0, 0, 0, 2))
+        await repo.update(machine)
+
+        await self.compact_coin_movements(transaction)
+
+        await transaction.query(
+            {
+                "text": "SELECT machine_id::TEXT AS machine_id, COUNT(*) AS movements FROM machines_schema.coin_movements GROUP BY machine_id;",
+                "values": [],
+            }
+        )
+        movements = await transaction.fetchall()
+        await transaction.query(
+            {
+                "text": "SELECT coin_100_qty FROM machines_schema.machines WHERE id = %s;",
+                "values": (machine.id.value,),
+            }
+        )
+        snapshot = await transaction.fetchall()
+
+        await self.commit_transaction(transaction)
+
+        assert [(row["machine_id"], row["movements"]) for row in movements] == [(overflowing.id.value, 2)]
+        assert snapshot[0]["coin_100_qty"] == 2
+
+    @pytest.mark.asyncio
+    async def test_should_update_changed_products_stock_in_a_single_statement(self, transaction):
+        await self.open_transaction(transaction)
+        await self.create_db(transaction)
+
+        products = [
+            ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbfff", "Hersheys", 2, "00", 0),
+            ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbffe", "Twix", 2, "01", 0),
+            ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbffd", "Pepsi", 2, "02", 0),
+        ]
+        owner = OwnerEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            "a8351752-ec32-4578-bdb6-883d703cbee7",
+            owner,
+            MachineState.READY,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
+            products,
+        )
+
+        for product in products:
+            await self.create_product(transaction, product)
+
+        repo = Psycopg2MachineRepository(transaction)
+        await repo.save(machine)
+
+        products[0].reduce_qty()
+        products[2].increase_qty()
+        machine.add_coins(CoinsVector.create(0, 0, 0, 1, 0, 0))
+        await repo.update(machine)
+        result = await repo.find_by_id(machine.id)
+
+        await self.commit_transaction(transaction)
+
+        stock = {product.code: product.qty for product in result.products}
+
+        assert stock == {"00": 1, "01": 2, "02": 3}
+        assert result.coins[CoinTypes.COIN_25] == 1
@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import pytest
+
+from src.domain.value_objects.uuid import UUIDValueObject
+
+from src.domain.entities.product import ProductEntity
+from src.domain.entities.order import OrderEntity, OrderStatus
+from src.domain.entities.order_item import OrderItemEntity
+
+from src.infra.repositories.order.identity_map_order_repository import IdentityMapOrderRepository
+from src.infra.repositories.order.stub_order_repository import (
+    StubOrderRepository,
+    FindByIdAndMachineIdResponseWithSuccessObject,
+    SaveResponseWithSuccessObject,
+    UpdateResponseWithSuccessObject,
+)
+
+
+def make_order() -> OrderEntity:
+    product = ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "00", 0)
+    order_items = [OrderItemEntity.create("f3331752-6c11-4578-adb7-331d703cb445", 1, product, datetime(1970, 1, 1))]
+    return OrderEntity.create(
+        "f3331752-6c11-4578-adb7-331d703cb446",
+        "a8351752-ec32-4578-bdb6-883d703cbee7",
+        order_items,
+        OrderStatus.PENDING,
+        datetime(1970, 1, 1),
+        datetime(1970, 1, 1),
+    )
+
+
+class Test_Identity_Map_Order_Repository:
+    @pytest.mark.asyncio
+    async def test_should_load_order_once_per_transaction(self):
+        order = make_order()
+        sut = IdentityMapOrderRepository(
+            StubOrderRepository([FindByIdAndMachineIdResponseWithSuccessObject(order)], [], [])
+        )
+
+        first = await sut.find_by_id_and_machine_id(order.id, order.machine_id)
+        second = await sut.find_by_id_and_machine_id(order.id, order.machine_id)
+
+        assert first is order
+        assert second is order
+
+    @pytest.mark.asyncio
+    async def test_should_return_saved_order_without_loading_it(self):
+        order = make_order()
+        sut = IdentityMapOrderRepository(StubOrderRepository([], [SaveResponseWithSuccessObject()], []))
+
+        await sut.save(order)
+        result = await sut.find_by_id_and_machine_id(order.id, order.machine_id)
+
+        assert result is order
+
+    @pytest.mark.asyncio
+    async def test_should_return_none_if_tracked_order_belongs_to_another_machine(self):
+        order = make_order()
+        sut = IdentityMapOrderRepository(StubOrderRepository([], [SaveResponseWithSuccessObject()], []))
+
+        await sut.save(order)
+        result = await sut.find_by_id_and_machine_id(
+            order.id, UUIDValueObject.create("43c6fc3c-a51a-4c5d-9c1d-aae7e0c6ac4f")
+        )
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_should_flush_dirty_order_once(self):
+        order = make_order()
+        sut = IdentityMapOrderRepository(
+            StubOrderRepository(
+                [FindByIdAndMachineIdResponseWithSuccessObject(order)], [], [UpdateResponseWithSuccessObject()]
+            )
+        )
+
+        found = await sut.find_by_id_and_machine_id(order.id, order.machine_id)
+        found.deliver_order()
+        await sut.update(found)
+        await sut.flush()
+        await sut.flush()
+
+        assert order.order_status == OrderStatus.DELIVERED
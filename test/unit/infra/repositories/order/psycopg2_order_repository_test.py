@@ -1,4 +1,7 @@
+import uuid
+
 from datetime import datetime
+from typing import Any
 
 import pytest
 import pytest_asyncio
@@ -6,6 +9,7 @@ import pytest_asyncio
 from testcontainers.postgres import PostgresContainer
 
 from src.domain.value_objects.uuid import UUIDValueObject
+from src.domain.value_objects.coins import CoinsVector, CoinTypes
 
 from src.domain.entities.owner import OwnerEntity
 from src.domain.entities.product import ProductEntity
@@ -14,20 +18,43 @@ from src.domain.entities.order_item import OrderItemEntity
 from src.domain.entities.machine import MachineEntity, MachineState
 
 from src.services.contracts.database.base import (
+    IDatabaseQuery,
     IDatabaseTransaction,
     IDatabasePoolConnection,
 )
 
-from src.infra.database.postgres.connection.psycopg2_connection import (
-    Psycopg2PoolConnection,
-    Config,
-)
-from src.infra.database.postgres.psycopg2_transaction import (
-    Psycopg2Transaction,
-)
+from src.infra.database.postgres.connection.config import Config
 
 from src.infra.repositories.order.psycopg2_order_repository import Psycopg2OrderRepository
 
+from src.main.factories.infra.database_conn import make_conn
+from src.main.factories.infra.database_transaction import make_transaction
+
+
+# time ordered id carrying `created_at`, the way ids of new orders are generated
+def _time_ordered_id(created_at: datetime, sequence: int = 0) -> str:
+    unix_ts_ms: int = int(created_at.timestamp() * 1000)
+    return str(uuid.UUID(int=(unix_ts_ms << 80) | (7 << 76) | (0b10 << 62) | sequence))
+
+
+# Runs every statement after asking postgres for its plan, the plans are kept to check which
+# partitions each statement reads
+class ExplainingQueryRunner(IDatabaseQuery):
+    def __init__(self, decoratee: IDatabaseQuery):
+        self._decoratee = decoratee
+        self.plans: list[str] = []
+
+    async def query(self, input_data: Any) -> None:
+        await self._decoratee.query({"text": "EXPLAIN " + input_data["text"], "values": input_data["values"]})
+        self.plans.append("\n".join(row["QUERY PLAN"] for row in await self._decoratee.fetchall()))
+        await self._decoratee.query(input_data)
+
+    async def defer_query(self, input_data: Any) -> None:
+        await self.query(input_data)
+
+    async def fetchall(self) -> Any:
+        return await self._decoratee.fetchall()
+
 
 class Test_Psycopg2_Order_Repository:
     @pytest.fixture
@@ -50,10 +77,13 @@ class Test_Psycopg2_Order_Repository:
 
         postgres.stop(force=True, delete_volume=True)
 
-    @pytest_asyncio.fixture
-    async def pool(self, postgres_container: PostgresContainer) -> IDatabasePoolConnection:
+    @pytest_asyncio.fixture(params=["psycopg2", "psycopg3"])
+    async def pool(
+        self, request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch, postgres_container: PostgresContainer
+    ) -> IDatabasePoolConnection:
         container = postgres_container
-        conn_pool = Psycopg2PoolConnection.get_instance()
+        monkeypatch.setenv("POSTGRES_DRIVER", request.param)
+        conn_pool = make_conn()
 
         await conn_pool.connect(
             Config(
@@ -71,11 +101,11 @@ class Test_Psycopg2_Order_Repository:
 
         await conn_pool.disconnect()
 
-        Psycopg2PoolConnection.reset_instance()
+        type(conn_pool).reset_instance()
 
     @pytest.fixture
     def transaction(self, pool) -> IDatabaseTransaction:
-        return Psycopg2Transaction(pool)
+        return make_transaction(pool)
 
     async def create_db(self, t: IDatabaseTransaction) -> None:
         await t.query(
@@ -143,12 +173,13 @@ class Test_Psycopg2_Order_Repository:
                     id UUID NOT NULL,
                     owner_id UUID NOT NULL,
                     state machine_state NOT NULL,
-                    coin_01_qty SMALLINT NOT NULL,
-                    coin_05_qty SMALLINT NOT NULL,
-                    coin_10_qty SMALLINT NOT NULL,
-                    coin_25_qty SMALLINT NOT NULL,
-                    coin_50_qty SMALLINT NOT NULL,
-                    coin_100_qty SMALLINT NOT NULL,
+                    coin_01_qty INT NOT NULL,
+                    coin_05_qty INT NOT NULL,
+                    coin_10_qty INT NOT NULL,
+                    coin_25_qty INT NOT NULL,
+                    coin_50_qty INT NOT NULL,
+                    coin_100_qty INT NOT NULL,
+                    version INT NOT NULL DEFAULT 0,
                     CONSTRAINT pk_machine_id PRIMARY KEY (id)
                 );""",
                 "values": [],
@@ -162,6 +193,7 @@ class Test_Psycopg2_Order_Repository:
                     product_id UUID NOT NULL,
                     product_qty INT NOT NULL,
                     code VARCHAR(2) NOT NULL,
+                    CONSTRAINT chk_product_qty_not_negative CHECK (product_qty >= 0),
                     CONSTRAINT fk_product_id FOREIGN KEY(product_id) REFERENCES products_schema.products(id) ON UPDATE CASCADE ON DELETE CASCADE,
                     CONSTRAINT fk_machine_id FOREIGN KEY(machine_id) REFERENCES machines_schema.machines(id) ON UPDATE CASCADE ON DELETE CASCADE
                 );""",
@@ -179,7 +211,7 @@ class Test_Psycopg2_Order_Repository:
                     created_at TIMESTAMP NOT NULL,
                     updated_at TIMESTAMP NOT NULL,
                     CONSTRAINT pk_order_id PRIMARY KEY (id, created_at)
-                );""",
+                ) PARTITION BY RANGE (created_at);""",
                 "values": [],
             }
         )
@@ -195,11 +227,27 @@ class Test_Psycopg2_Order_Repository:
                     created_at TIMESTAMP NOT NULL,
                     CONSTRAINT pk_order_item_id_created_at PRIMARY KEY (id, created_at),
                     CONSTRAINT fk_product_id FOREIGN KEY(product_id) REFERENCES products_schema.products(id) ON UPDATE CASCADE ON DELETE CASCADE
-                );""",
+                ) PARTITION BY RANGE (created_at);""",
                 "values": [],
             }
         )
 
+        # one partition per month, like the ones kept by pg_partman
+        for table in ("orders", "order_items"):
+            for suffix, month_start, next_month_start in (
+                ("1969_12", "1969-12-01", "1970-01-01"),
+                ("1970_01", "1970-01-01", "1970-02-01"),
+                ("1970_02", "1970-02-01", "1970-03-01"),
+            ):
+                await t.query(
+                    {
+                        "text": f"""CREATE TABLE orders_schema.{table}_{suffix}
+                            PARTITION OF orders_schema.{table}
+                            FOR VALUES FROM ('{month_start}') TO ('{next_month_start}');""",
+                        "values": [],
+                    }
+                )
+
     async def create_product(self, t: IDatabaseTransaction, product: ProductEntity) -> None:
         await t.query(
             {
@@ -305,12 +353,12 @@ class Test_Psycopg2_Order_Repository:
                     machine.id.value,
                     machine.owner.id.value,
                     machine.state.value,
-                    machine.coin_01.qty,
-                    machine.coin_05.qty,
-                    machine.coin_10.qty,
-                    machine.coin_25.qty,
-                    machine.coin_50.qty,
-                    machine.coin_100.qty,
+                    machine.coins[CoinTypes.COIN_01],
+                    machine.coins[CoinTypes.COIN_05],
+                    machine.coins[CoinTypes.COIN_10],
+                    machine.coins[CoinTypes.COIN_25],
+                    machine.coins[CoinTypes.COIN_50],
+                    machine.coins[CoinTypes.COIN_100],
                 ),
             }
         )
@@ -334,7 +382,7 @@ class Test_Psycopg2_Order_Repository:
 
         repo = Psycopg2OrderRepository(transaction)
         result = await repo.find_by_id_and_machine_id(
-            UUIDValueObject.create_new(), UUIDValueObject.create_new(), datetime(1970, 1, 1)
+            UUIDValueObject.create_new(time_ordered=True), UUIDValueObject.create_new()
         )
 
         await self.commit_transaction(transaction)
@@ -348,7 +396,7 @@ class Test_Psycopg2_Order_Repository:
 
         owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
         machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
-        order_created_at: datetime = datetime(1970, 1, 1)
+        order_created_at: datetime = datetime(1970, 1, 2)
 
         products = [
             ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "01", 0),
@@ -359,17 +407,12 @@ class Test_Psycopg2_Order_Repository:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
         order_items = []
         order = OrderEntity.create(
-            "f3331752-6c11-4578-adb7-331d703cb446",
+            _time_ordered_id(order_created_at),
             machine_id,
             order_items,
             OrderStatus.PENDING,
@@ -385,7 +428,7 @@ class Test_Psycopg2_Order_Repository:
         await self.create_order(transaction, order)
 
         repo = Psycopg2OrderRepository(transaction)
-        result = await repo.find_by_id_and_machine_id(order.id, machine.id, order_created_at)
+        result = await repo.find_by_id_and_machine_id(order.id, machine.id)
 
         await self.commit_transaction(transaction)
 
@@ -398,7 +441,7 @@ class Test_Psycopg2_Order_Repository:
 
         owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
         machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
-        order_created_at: datetime = datetime(1970, 1, 1)
+        order_created_at: datetime = datetime(1970, 1, 2)
 
         products = [
             ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "01", 0),
@@ -409,18 +452,13 @@ class Test_Psycopg2_Order_Repository:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
         order_items = [OrderItemEntity.create("f3331752-6c11-4578-adb7-331d703cb445", 1, products[0], order_created_at)]
         order = OrderEntity.create(
-            "f3331752-6c11-4578-adb7-331d703cb446",
+            _time_ordered_id(order_created_at),
             machine_id,
             order_items,
             OrderStatus.PENDING,
@@ -436,11 +474,11 @@ class Test_Psycopg2_Order_Repository:
         await self.create_order(transaction, order)
 
         repo = Psycopg2OrderRepository(transaction)
-        result = await repo.find_by_id_and_machine_id(order.id, machine.id, order_created_at)
+        result = await repo.find_by_id_and_machine_id(order.id, machine.id)
 
         await self.commit_transaction(transaction)
 
-        assert result.id.value == "f3331752-6c11-4578-adb7-331d703cb446"
+        assert result.id.value == order.id.value
         assert result.machine_id.value == machine_id
         assert result.order_status == OrderStatus.PENDING
         assert result.created_at.isoformat() == order_created_at.isoformat()
@@ -460,6 +498,202 @@ class Test_Psycopg2_Order_Repository:
         assert result.order_items[0].product.qty == order.order_items[0].product.qty
         assert result.order_items[0].product.unit_price == order.order_items[0].product.unit_price
 
+    @pytest.mark.asyncio
+    async def test_should_return_order_created_late_on_the_last_day_of_the_month(self, transaction):
+        await self.open_transaction(transaction)
+        await self.create_db(transaction)
+
+        owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
+        machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
+        order_created_at: datetime = datetime(1970, 1, 31, 23, 30)
+
+        products = [ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "01", 0)]
+        owner = OwnerEntity.create(owner_id, "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            machine_id, owner, MachineState.READY, CoinsVector.create(0, 0, 0, 0, 0, 0), products
+        )
+
+        order_items = [OrderItemEntity.create("f3331752-6c11-4578-adb7-331d703cb445", 1, products[0], order_created_at)]
+        order = OrderEntity.create(
+            _time_ordered_id(order_created_at),
+            machine_id,
+            order_items,
+            OrderStatus.PENDING,
+            order_created_at,
+            order_created_at,
+        )
+
+        await self.create_machine(transaction, machine)
+        await self.create_product(transaction, products[0])
+        await self.link_product_to_machine(transaction, products[0], machine_id)
+        await self.create_order(transaction, order)
+
+        repo = Psycopg2OrderRepository(transaction)
+        result = await repo.find_by_id_and_machine_id(order.id, machine.id)
+
+        await self.commit_transaction(transaction)
+
+        assert result.id.value == order.id.value
+        assert result.created_at.isoformat() == order_created_at.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_should_return_items_created_in_the_month_before_their_order(self, transaction):
+        await self.open_transaction(transaction)
+        await self.create_db(transaction)
+
+        owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
+        machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
+        order_item_created_at: datetime = datetime(1970, 1, 31, 23, 59, 59, 900000)
+        order_created_at: datetime = datetime(1970, 2, 1, 0, 0, 0, 100000)
+
+        products = [ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "01", 0)]
+        owner = OwnerEntity.create(owner_id, "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            machine_id, owner, MachineState.READY, CoinsVector.create(0, 0, 0, 0, 0, 0), products
+        )
+
+        order_items = [OrderItemEntity.create_new(_time_ordered_id(order_item_created_at), 1, products[0])]
+        order = OrderEntity.create_new(_time_ordered_id(order_created_at), machine_id, order_items)
+
+        await self.create_machine(transaction, machine)
+        await self.create_product(transaction, products[0])
+        await self.link_product_to_machine(transaction, products[0], machine_id)
+
+        repo = Psycopg2OrderRepository(transaction)
+        await repo.save(order)
+        result = await repo.find_by_id_and_machine_id(order.id, machine.id)
+
+        await self.commit_transaction(transaction)
+
+        assert order.order_items[0].created_at.month == 1
+        assert len(result.order_items) == 1
+        assert result.order_items[0].id.value == order.order_items[0].id.value
+        assert result.order_items[0].created_at.month == 2
+
+    @pytest.mark.asyncio
+    async def test_should_return_order_with_a_random_id_from_any_partition(self, transaction):
+        await self.open_transaction(transaction)
+        await self.create_db(transaction)
+
+        owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
+        machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
+        order_created_at: datetime = datetime(1970, 2, 10)
+
+        products = [ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "01", 0)]
+        owner = OwnerEntity.create(owner_id, "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            machine_id, owner, MachineState.READY, CoinsVector.create(0, 0, 0, 0, 0, 0), products
+        )
+
+        order_items = [OrderItemEntity.create("f3331752-6c11-4578-adb7-331d703cb445", 1, products[0], order_created_at)]
+        order = OrderEntity.create(
+            "f3331752-6c11-4578-adb7-331d703cb446",
+            machine_id,
+            order_items,
+            OrderStatus.PENDING,
+            order_created_at,
+            order_created_at,
+        )
+
+        await self.create_machine(transaction, machine)
+        await self.create_product(transaction, products[0])
+        await self.link_product_to_machine(transaction, products[0], machine_id)
+        await self.create_order(transaction, order)
+
+        repo = Psycopg2OrderRepository(transaction)
+        result = await repo.find_by_id_and_machine_id(order.id, machine.id)
+
+        await self.commit_transaction(transaction)
+
+        assert result.id.value == "f3331752-6c11-4578-adb7-331d703cb446"
+        assert result.created_at.isoformat() == order_created_at.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_should_find_order_in_a_single_query_reading_only_its_monthly_partitions(self, transaction):
+        await self.open_transaction(transaction)
+        await self.create_db(transaction)
+
+        owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
+        machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
+        order_created_at: datetime = datetime(1970, 1, 2)
+
+        products = [ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "01", 0)]
+        owner = OwnerEntity.create(owner_id, "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            machine_id, owner, MachineState.READY, CoinsVector.create(0, 0, 0, 0, 0, 0), products
+        )
+
+        order_items = [OrderItemEntity.create("f3331752-6c11-4578-adb7-331d703cb445", 1, products[0], order_created_at)]
+        order = OrderEntity.create(
+            _time_ordered_id(order_created_at),
+            machine_id,
+            order_items,
+            OrderStatus.PENDING,
+            order_created_at,
+            order_created_at,
+        )
+
+        await self.create_machine(transaction, machine)
+        await self.create_product(transaction, products[0])
+        await self.link_product_to_machine(transaction, products[0], machine_id)
+        await self.create_order(transaction, order)
+
+        query_runner = ExplainingQueryRunner(transaction)
+        repo = Psycopg2OrderRepository(query_runner)
+        result = await repo.find_by_id_and_machine_id(order.id, machine.id)
+
+        await self.commit_transaction(transaction)
+
+        assert result is not None
+        assert len(query_runner.plans) == 1
+        assert "orders_1970_01" in query_runner.plans[0]
+        assert "order_items_1970_01" in query_runner.plans[0]
+        assert "1969_12" not in query_runner.plans[0]
+        assert "1970_02" not in query_runner.plans[0]
+
+    @pytest.mark.asyncio
+    async def test_should_update_order_reading_only_its_monthly_partition(self, transaction):
+        await self.open_transaction(transaction)
+        await self.create_db(transaction)
+
+        owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
+        machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
+        order_created_at: datetime = datetime(1970, 1, 2)
+
+        products = [ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "01", 0)]
+        owner = OwnerEntity.create(owner_id, "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            machine_id, owner, MachineState.READY, CoinsVector.create(0, 0, 0, 0, 0, 0), products
+        )
+
+        order_items = [OrderItemEntity.create("f3331752-6c11-4578-adb7-331d703cb445", 1, products[0], order_created_at)]
+        order = OrderEntity.create(
+            _time_ordered_id(order_created_at),
+            machine_id,
+            order_items,
+            OrderStatus.PENDING,
+            order_created_at,
+            order_created_at,
+        )
+
+        await self.create_machine(transaction, machine)
+        await self.create_product(transaction, products[0])
+        await self.link_product_to_machine(transaction, products[0], machine_id)
+        await self.create_order(transaction, order)
+
+        order.deliver_order()
+
+        query_runner = ExplainingQueryRunner(transaction)
+        repo = Psycopg2OrderRepository(query_runner)
+        await repo.update(order)
+
+        await self.commit_transaction(transaction)
+
+        assert len(query_runner.plans) == 1
+        assert "orders_1970_01" in query_runner.plans[0]
+        assert "1969_12" not in query_runner.plans[0]
+        assert "1970_02" not in query_runner.plans[0]
+
     @pytest.mark.asyncio
     async def test_should_save_new_order(self, transaction):
         await self.open_transaction(transaction)
@@ -467,7 +701,7 @@ class Test_Psycopg2_Order_Repository:
 
         owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
         machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
-        order_created_at: datetime = datetime(1970, 1, 1)
+        order_created_at: datetime = datetime(1970, 1, 2)
 
         products = [
             ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "01", 0),
@@ -478,18 +712,13 @@ class Test_Psycopg2_Order_Repository:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
         order_items = [OrderItemEntity.create("f3331752-6c11-4578-adb7-331d703cb445", 1, products[0], order_created_at)]
         order = OrderEntity.create(
-            "f3331752-6c11-4578-adb7-331d703cb446",
+            _time_ordered_id(order_created_at),
             machine_id,
             order_items,
             OrderStatus.PENDING,
@@ -505,11 +734,11 @@ class Test_Psycopg2_Order_Repository:
 
         repo = Psycopg2OrderRepository(transaction)
         await repo.save(order)
-        result = await repo.find_by_id_and_machine_id(order.id, machine.id, order_created_at)
+        result = await repo.find_by_id_and_machine_id(order.id, machine.id)
 
         await self.commit_transaction(transaction)
 
-        assert result.id.value == "f3331752-6c11-4578-adb7-331d703cb446"
+        assert result.id.value == order.id.value
         assert result.machine_id.value == machine_id
         assert result.order_status == OrderStatus.PENDING
         assert result.created_at.isoformat() == order_created_at.isoformat()
@@ -529,6 +758,67 @@ class Test_Psycopg2_Order_Repository:
         assert result.order_items[0].product.qty == 0
         assert result.order_items[0].product.unit_price == order.order_items[0].product.unit_price
 
+    @pytest.mark.asyncio
+    async def test_should_keep_stock_changes_of_orders_made_from_the_same_stock(self, transaction):
+        await self.open_transaction(transaction)
+        await self.create_db(transaction)
+
+        owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
+        machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
+        product_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
+        order_created_at: datetime = datetime(1970, 1, 2)
+
+        product = ProductEntity.create(product_id, "Hersheys", 2, "01", 0)
+        owner = OwnerEntity.create(owner_id, "Sebastião Maia", "test@mail.com")
+        machine = MachineEntity.create(
+            machine_id, owner, MachineState.READY, CoinsVector.create(0, 0, 0, 0, 0, 0), [product]
+        )
+
+        await self.create_machine(transaction, machine)
+        await self.create_product(transaction, product)
+        await self.link_product_to_machine(transaction, product, machine_id)
+
+        # both orders were built from the same two units in stock
+        first_order = OrderEntity.create(
+            _time_ordered_id(order_created_at),
+            machine_id,
+            [
+                OrderItemEntity.create(
+                    "f3331752-6c11-4578-adb7-331d703cb445",
+                    1,
+                    ProductEntity.create(product_id, "Hersheys", 2, "01", 0),
+                    order_created_at,
+                )
+            ],
+            OrderStatus.PENDING,
+            order_created_at,
+            order_created_at,
+        )
+        second_order = OrderEntity.create(
+            _time_ordered_id(order_created_at, 1),
+            machine_id,
+            [
+                OrderItemEntity.create(
+                    "f3331752-6c11-4578-adb7-331d703cb447",
+                    1,
+                    ProductEntity.create(product_id, "Hersheys", 2, "01", 0),
+                    order_created_at,
+                )
+            ],
+            OrderStatus.PENDING,
+            order_created_at,
+            order_created_at,
+        )
+
+        repo = Psycopg2OrderRepository(transaction)
+        await repo.save(first_order)
+        await repo.save(second_order)
+        result = await repo.find_by_id_and_machine_id(second_order.id, machine.id)
+
+        await self.commit_transaction(transaction)
+
+        assert result.order_items[0].product.qty == 0
+
     @pytest.mark.asyncio
     async def test_should_update_order_to_delivered(self, transaction):
         await self.open_transaction(transaction)
@@ -536,7 +826,7 @@ class Test_Psycopg2_Order_Repository:
 
         owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
         machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
-        order_created_at: datetime = datetime(1970, 1, 1)
+        order_created_at: datetime = datetime(1970, 1, 2)
 
         products = [
             ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "01", 0),
@@ -547,18 +837,13 @@ class Test_Psycopg2_Order_Repository:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
         order_items = [OrderItemEntity.create("f3331752-6c11-4578-adb7-331d703cb445", 1, products[0], order_created_at)]
         order = OrderEntity.create(
-            "f3331752-6c11-4578-adb7-331d703cb446",
+            _time_ordered_id(order_created_at),
             machine_id,
             order_items,
             OrderStatus.PENDING,
@@ -576,11 +861,11 @@ class Test_Psycopg2_Order_Repository:
         await repo.save(order)
         order.deliver_order()
         await repo.update(order)
-        result = await repo.find_by_id_and_machine_id(order.id, machine.id, order_created_at)
+        result = await repo.find_by_id_and_machine_id(order.id, machine.id)
 
         await self.commit_transaction(transaction)
 
-        assert result.id.value == "f3331752-6c11-4578-adb7-331d703cb446"
+        assert result.id.value == order.id.value
         assert result.machine_id.value == machine_id
         assert result.order_status == OrderStatus.DELIVERED
         assert result.created_at.isoformat() == order_created_at.isoformat()
@@ -607,7 +892,7 @@ class Test_Psycopg2_Order_Repository:
 
         owner_id: str = "b9651752-6c44-4578-bdb6-883d703cbff5"
         machine_id: str = "a8351752-ec32-4578-bdb6-883d703cbee7"
-        order_created_at: datetime = datetime(1970, 1, 1)
+        order_created_at: datetime = datetime(1970, 1, 2)
 
         products = [
             ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Hersheys", 1, "01", 0),
@@ -618,18 +903,13 @@ class Test_Psycopg2_Order_Repository:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
         order_items = [OrderItemEntity.create("f3331752-6c11-4578-adb7-331d703cb445", 1, products[0], order_created_at)]
         order = OrderEntity.create(
-            "f3331752-6c11-4578-adb7-331d703cb446",
+            _time_ordered_id(order_created_at),
             machine_id,
             order_items,
             OrderStatus.PENDING,
@@ -647,11 +927,11 @@ class Test_Psycopg2_Order_Repository:
         await repo.save(order)
         order.cancel_order()
         await repo.update(order)
-        result = await repo.find_by_id_and_machine_id(order.id, machine.id, order_created_at)
+        result = await repo.find_by_id_and_machine_id(order.id, machine.id)
 
         await self.commit_transaction(transaction)
 
-        assert result.id.value == "f3331752-6c11-4578-adb7-331d703cb446"
+        assert result.id.value == order.id.value
         assert result.machine_id.value == machine_id
         assert result.order_status == OrderStatus.CANCELED
         assert result.created_at.isoformat() == order_created_at.isoformat()
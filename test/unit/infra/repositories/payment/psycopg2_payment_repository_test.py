@@ -7,6 +7,8 @@ import pytest_asyncio
 
 from testcontainers.postgres import PostgresContainer
 
+from src.domain.value_objects.coins import CoinsVector, CoinTypes
+
 from src.domain.entities.owner import OwnerEntity
 from src.domain.entities.product import ProductEntity
 from src.domain.entities.order import OrderEntity, OrderStatus
@@ -18,16 +20,13 @@ from src.services.contracts.database.base import (
     IDatabasePoolConnection,
 )
 
-from src.infra.database.postgres.connection.psycopg2_connection import (
-    Psycopg2PoolConnection,
-    Config,
-)
-from src.infra.database.postgres.psycopg2_transaction import (
-    Psycopg2Transaction,
-)
+from src.infra.database.postgres.connection.config import Config
 
 from src.infra.repositories.payment.psycopg2_payment_repository import Psycopg2PaymentRepository
 
+from src.main.factories.infra.database_conn import make_conn
+from src.main.factories.infra.database_transaction import make_transaction
+
 
 class Test_Psycopg2_Payment_Repository:
     @pytest.fixture
@@ -50,10 +49,13 @@ class Test_Psycopg2_Payment_Repository:
 
         postgres.stop(force=True, delete_volume=True)
 
-    @pytest_asyncio.fixture
-    async def pool(self, postgres_container: PostgresContainer) -> IDatabasePoolConnection:
+    @pytest_asyncio.fixture(params=["psycopg2", "psycopg3"])
+    async def pool(
+        self, request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch, postgres_container: PostgresContainer
+    ) -> IDatabasePoolConnection:
         container = postgres_container
-        conn_pool = Psycopg2PoolConnection.get_instance()
+        monkeypatch.setenv("POSTGRES_DRIVER", request.param)
+        conn_pool = make_conn()
 
         await conn_pool.connect(
             Config(
@@ -71,11 +73,11 @@ class Test_Psycopg2_Payment_Repository:
 
         await conn_pool.disconnect()
 
-        Psycopg2PoolConnection.reset_instance()
+        type(conn_pool).reset_instance()
 
     @pytest.fixture
     def transaction(self, pool) -> IDatabaseTransaction:
-        return Psycopg2Transaction(pool)
+        return make_transaction(pool)
 
     async def create_db(self, t: IDatabaseTransaction) -> None:
         await t.query(
@@ -157,12 +159,13 @@ class Test_Psycopg2_Payment_Repository:
                     id UUID NOT NULL,
                     owner_id UUID NOT NULL,
                     state machine_state NOT NULL,
-                    coin_01_qty SMALLINT NOT NULL,
-                    coin_05_qty SMALLINT NOT NULL,
-                    coin_10_qty SMALLINT NOT NULL,
-                    coin_25_qty SMALLINT NOT NULL,
-                    coin_50_qty SMALLINT NOT NULL,
-                    coin_100_qty SMALLINT NOT NULL,
+                    coin_01_qty INT NOT NULL,
+                    coin_05_qty INT NOT NULL,
+                    coin_10_qty INT NOT NULL,
+                    coin_25_qty INT NOT NULL,
+                    coin_50_qty INT NOT NULL,
+                    coin_100_qty INT NOT NULL,
+                    version INT NOT NULL DEFAULT 0,
                     CONSTRAINT pk_machine_id PRIMARY KEY (id)
                 );""",
                 "values": [],
@@ -349,12 +352,12 @@ class Test_Psycopg2_Payment_Repository:
                     machine.id.value,
                     machine.owner.id.value,
                     machine.state.value,
-                    machine.coin_01.qty,
-                    machine.coin_05.qty,
-                    machine.coin_10.qty,
-                    machine.coin_25.qty,
-                    machine.coin_50.qty,
-                    machine.coin_100.qty,
+                    machine.coins[CoinTypes.COIN_01],
+                    machine.coins[CoinTypes.COIN_05],
+                    machine.coins[CoinTypes.COIN_10],
+                    machine.coins[CoinTypes.COIN_25],
+                    machine.coins[CoinTypes.COIN_50],
+                    machine.coins[CoinTypes.COIN_100],
                 ),
             }
         )
@@ -409,12 +412,7 @@ class Test_Psycopg2_Payment_Repository:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
         order_items = []
@@ -0,0 +1,32 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from src.infra.exceptions.database_connection_timeout import DatabaseConnectionTimeoutException
+
+from src.main.configs import app as app_config
+
+
+class Test_Application_Lifespan:
+    def test_should_start_pool_warm_up_again_if_it_fails(self, monkeypatch):
+        attempts: list[int] = []
+
+        async def loader():
+            attempts.append(len(attempts))
+            if len(attempts) == 1:
+                raise DatabaseConnectionTimeoutException(0.1)
+
+        async def idle():
+            pass
+
+        monkeypatch.setattr(app_config, "_RESTART_DELAY", 0.01)
+        monkeypatch.setattr(app_config, "loader", loader)
+        monkeypatch.setattr(app_config, "machine_changes_loader", idle)
+        monkeypatch.setattr(app_config, "replicas_loader", idle)
+
+        with TestClient(app_config.application()):
+            deadline: float = time.monotonic() + 2
+            while len(attempts) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert len(attempts) == 2
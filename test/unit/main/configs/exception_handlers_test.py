@@ -0,0 +1,68 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.infra.exceptions.database_acquire_timeout import DatabaseAcquireTimeoutException
+from src.infra.exceptions.database_pool_queue_full import DatabasePoolQueueFullException
+from src.infra.exceptions.database_not_ready import DatabaseNotReadyException
+from src.infra.exceptions.database_lock_timeout import DatabaseLockTimeoutException
+
+from src.services.exceptions.concurrent_machine_update import ConcurrentMachineUpdateException
+
+from src.main.configs.exception_handlers import database_unavailable_handler, concurrent_update_handler
+
+
+class Test_Database_Unavailable_Handler:
+    def make_client(self, error: Exception) -> TestClient:
+        app = FastAPI()
+        app.add_exception_handler(type(error), database_unavailable_handler)
+
+        @app.get("/")
+        async def route():
+            raise error
+
+        return TestClient(app)
+
+    def test_should_return_503_with_retry_after_if_waiting_queue_is_full(self):
+        response = self.make_client(DatabasePoolQueueFullException(2.5)).get("/")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+        assert response.json() == {
+            "detail": {"error": {"message": "database - too many requests are waiting for a connection"}}
+        }
+
+    def test_should_return_503_with_retry_after_if_acquire_times_out(self):
+        response = self.make_client(DatabaseAcquireTimeoutException(0.1)).get("/")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_should_return_503_with_retry_after_if_pool_is_not_ready(self):
+        response = self.make_client(DatabaseNotReadyException()).get("/")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert response.json() == {
+            "detail": {"error": {"message": "database - the connection pool is still warming up"}}
+        }
+
+    def test_should_return_503_with_retry_after_if_machine_lock_is_not_released(self):
+        response = self.make_client(DatabaseLockTimeoutException(5.0)).get("/")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+
+
+class Test_Concurrent_Update_Handler:
+    def test_should_return_409_if_machine_kept_changing_concurrently(self):
+        app = FastAPI()
+        app.add_exception_handler(ConcurrentMachineUpdateException, concurrent_update_handler)
+
+        @app.get("/")
+        async def route():
+            raise ConcurrentMachineUpdateException()
+
+        response = TestClient(app).get("/")
+
+        assert response.status_code == 409
+        assert response.json() == {"detail": {"error": {"message": "machine was changed by another operation"}}}
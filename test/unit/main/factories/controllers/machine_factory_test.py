@@ -0,0 +1,36 @@
+import tracemalloc
+from typing import Callable
+
+from src.infra.database.postgres.connection.psycopg2_connection import Psycopg2PoolConnection
+
+from src.main.factories.controllers.machine_factory import MachineControllerProvider
+
+
+class Test_Machine_Controller_Provider:
+    def measure_peak_bytes_per_request(self, make_request_controller: Callable) -> int:
+        make_request_controller()
+
+        tracemalloc.start()
+        start: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for _ in range(100):
+            make_request_controller()
+        peak: int = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        return peak - start
+
+    def test_should_reuse_the_controller_graph_between_requests(self):
+        provider = MachineControllerProvider(Psycopg2PoolConnection.get_instance())
+
+        assert provider() is provider()
+
+    def test_should_allocate_less_per_request_than_rebuilding_the_graph(self):
+        pool = Psycopg2PoolConnection.get_instance()
+        provider = MachineControllerProvider(pool)
+
+        # a provider per request builds the whole controller graph again every time
+        rebuilt_bytes: int = self.measure_peak_bytes_per_request(lambda: MachineControllerProvider(pool)())
+        provided_bytes: int = self.measure_peak_bytes_per_request(provider)
+
+        assert provided_bytes * 10 < rebuilt_bytes
@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from src.infra.cache.machine_catalog_cache import MachineCatalogCache
+
+from src.main.factories.infra.machine_catalog_cache import make_machine_catalog_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    MachineCatalogCache.reset_instance()
+    yield
+    MachineCatalogCache.reset_instance()
+
+
+class Test_Make_Machine_Catalog_Cache:
+    def test_should_expire_values_after_configured_ttl(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        monkeypatch.setenv("MACHINE_CACHE_TTL", "10")
+        sut = make_machine_catalog_cache()
+
+        sut.put("machine", ("READY",), sut.generation)
+        now[0] += 5
+        fresh = sut.get("machine")
+        now[0] += 6
+
+        assert fresh == ("READY",)
+        assert sut.get("machine") is None
+
+    def test_should_keep_configured_number_of_entries(self, monkeypatch):
+        monkeypatch.setenv("MACHINE_CACHE_MAX_ENTRIES", "1")
+        sut = make_machine_catalog_cache()
+
+        sut.put("first", ("READY",), sut.generation)
+        sut.put("second", ("READY",), sut.generation)
+
+        assert len(sut) == 1
+        assert sut.get("second") == ("READY",)
+
+    def test_should_not_store_values_above_configured_bytes(self, monkeypatch):
+        monkeypatch.setenv("MACHINE_CACHE_MAX_BYTES", "10")
+        sut = make_machine_catalog_cache()
+
+        sut.put("machine", ("READY",), sut.generation)
+
+        assert len(sut) == 0
@@ -0,0 +1,29 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.infra.database.postgres.connection.psycopg2_connection import Psycopg2PoolConnection
+
+from src.main.routes import health_routes
+
+
+class Test_Health_Routes:
+    def make_client(self) -> TestClient:
+        app = FastAPI()
+        app.include_router(health_routes.router)
+        return TestClient(app)
+
+    def test_should_return_503_while_pool_is_not_ready(self, monkeypatch):
+        monkeypatch.setattr(Psycopg2PoolConnection, "_ready", False)
+
+        response = self.make_client().get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json() == {"status": "starting"}
+
+    def test_should_return_200_once_pool_is_ready(self, monkeypatch):
+        monkeypatch.setattr(Psycopg2PoolConnection, "_ready", True)
+
+        response = self.make_client().get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ready"}
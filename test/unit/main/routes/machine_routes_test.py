@@ -0,0 +1,39 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.infra.database.postgres.connection.psycopg2_connection import Psycopg2PoolConnection
+from src.infra.exceptions.database_not_ready import DatabaseNotReadyException
+
+from src.main.configs.exception_handlers import database_unavailable_handler
+from src.main.routes import machine_routes
+
+
+class Test_Machine_Routes:
+    def make_client(self) -> TestClient:
+        app = FastAPI()
+        app.include_router(machine_routes.router)
+        app.add_exception_handler(DatabaseNotReadyException, database_unavailable_handler)
+        return TestClient(app)
+
+    def test_should_return_503_if_pool_is_not_ready_when_choose_product_is_called(self, monkeypatch):
+        monkeypatch.setattr(Psycopg2PoolConnection, "_ready", False)
+
+        response = self.make_client().get("/v1/machine/5f0c1b52-0c1e-4e3a-9a51-3b8f1f1b2a01/choose_product/00")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert response.json() == {
+            "detail": {"error": {"message": "database - the connection pool is still warming up"}}
+        }
+
+    def test_should_return_503_if_pool_is_not_ready_when_pay_for_product_is_called(self, monkeypatch):
+        monkeypatch.setattr(Psycopg2PoolConnection, "_ready", False)
+
+        response = self.make_client().post(
+            "/v1/machine/5f0c1b52-0c1e-4e3a-9a51-3b8f1f1b2a01/pay_for_product/223e4567-e89b-12d3-a456-426614174003",
+            params={"product_qty": 1, "payment_type": "CASH"},
+            json={"coin_100_qty": 2},
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
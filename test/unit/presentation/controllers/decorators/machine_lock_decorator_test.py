@@ -0,0 +1,107 @@
+import asyncio
+
+from typing import Any
+
+import pytest
+
+from src.domain.value_objects.coins import CoinsVector
+from src.domain.entities.payment import PaymentType
+from src.domain.contracts.dtos.machine import ChooseProductOutputDTO
+
+from src.services.contracts.controllers.machine import (
+    IMachineController,
+    ChooseProductInputControllerDTO,
+    PayForProductInputControllerDTO,
+)
+
+from src.presentation.controllers.decorators.machine_lock_decorator import MachineLockDecorator
+from src.presentation.controllers.stub_machine import (
+    StubMachineController,
+    ChooseProductResponseWithSuccessObject,
+    PayForProductResponseWithFailureObject,
+)
+
+from src.infra.locks.keyed_async_lock import KeyedAsyncLock
+from src.infra.locks.lock_metrics import LockMetrics
+
+
+@pytest.fixture(autouse=True)
+def reset_lock():
+    KeyedAsyncLock.reset_instance()
+    LockMetrics.reset_instance()
+    yield
+    KeyedAsyncLock.reset_instance()
+    LockMetrics.reset_instance()
+
+
+def make_pay_for_product_input(machine_id: str) -> PayForProductInputControllerDTO:
+    return PayForProductInputControllerDTO(
+        machine_id,
+        "fake_product_id",
+        0,
+        PaymentType.CASH,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
+    )
+
+
+class SlowMachineController(IMachineController):
+    def __init__(self):
+        self.running = 0
+        self.most_running = 0
+
+    async def choose_product(self, input_dto: ChooseProductInputControllerDTO) -> Any:
+        raise NotImplementedError
+
+    async def pay_for_product(self, input_dto: PayForProductInputControllerDTO) -> Any:
+        self.running += 1
+        self.most_running = max(self.most_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return None, 201
+
+
+class Test_Machine_Lock_Decorator:
+    @pytest.mark.asyncio
+    async def test_should_run_purchases_of_the_same_machine_one_at_a_time(self):
+        decoratee = SlowMachineController()
+        sut = MachineLockDecorator(decoratee, KeyedAsyncLock.get_instance())
+
+        await asyncio.gather(*[sut.pay_for_product(make_pay_for_product_input("fake_machine_id")) for _ in range(3)])
+
+        assert decoratee.most_running == 1
+        assert LockMetrics.get_instance().contentions == 2
+
+    @pytest.mark.asyncio
+    async def test_should_run_purchases_of_different_machines_together(self):
+        decoratee = SlowMachineController()
+        sut = MachineLockDecorator(decoratee, KeyedAsyncLock.get_instance())
+
+        await asyncio.gather(
+            sut.pay_for_product(make_pay_for_product_input("fake_machine_id")),
+            sut.pay_for_product(make_pay_for_product_input("other_fake_machine_id")),
+        )
+
+        assert decoratee.most_running == 2
+
+    @pytest.mark.asyncio
+    async def test_should_release_lock_when_decoratee_raises(self):
+        decoratee = StubMachineController([], [PayForProductResponseWithFailureObject(Exception("purchase failed"))])
+        lock = KeyedAsyncLock.get_instance()
+        sut = MachineLockDecorator(decoratee, lock)
+
+        with pytest.raises(Exception, match="purchase failed"):
+            await sut.pay_for_product(make_pay_for_product_input("fake_machine_id"))
+
+        assert len(lock) == 0
+
+    @pytest.mark.asyncio
+    async def test_should_choose_product_without_taking_the_lock(self):
+        decoratee = StubMachineController(
+            [ChooseProductResponseWithSuccessObject([ChooseProductOutputDTO("fake_id", 0, "fake_name"), 200])], []
+        )
+        sut = MachineLockDecorator(decoratee, KeyedAsyncLock.get_instance())
+
+        result = await sut.choose_product(ChooseProductInputControllerDTO("01", "fake_machine_id"))
+
+        assert result[1] == 200
+        assert LockMetrics.get_instance().acquisitions == 0
@@ -1,44 +1,65 @@
-from datetime import datetime
-
 import pytest
 
+from src.domain.value_objects.coins import CoinsVector
 from src.domain.entities.payment import PaymentType
 from src.domain.contracts.dtos.machine import ChooseProductOutputDTO, AddCoinsOutputDTO
 
 from src.services.contracts.controllers.machine import ChooseProductInputControllerDTO, PayForProductInputControllerDTO
+from src.services.exceptions.concurrent_machine_update import ConcurrentMachineUpdateException
 
 from src.presentation.controllers.decorators.machine_transaction_decorator import MachineTransactionDecorator
 from src.presentation.controllers.stub_machine import (
     StubMachineController,
     ChooseProductResponseWithSuccessObject,
+    ChooseProductResponseWithFailureObject,
     PayForProductResponseWithSuccessObject,
+    PayForProductResponseWithFailureObject,
 )
 
 from src.infra.database.postgres.spy_transaction import (
     SpyTransaction,
     CreateClientResponseWithSuccessObject,
     CommitResponseWithSuccessObject,
+    CommitResponseWithFailureObject,
     OpenTransactionResponseWithSuccessObject,
+    OpenReadOnlyTransactionResponseWithSuccessObject,
     ReleaseResponseWithSuccessObject,
     RollbackResponseWithSuccessObject,
 )
+from src.infra.repositories.spy_unit_of_work import (
+    SpyUnitOfWork,
+    FlushResponseWithSuccessObject,
+    FlushResponseWithFailureObject,
+    ClearResponseWithSuccessObject,
+)
+
+
+def make_pay_for_product_input() -> PayForProductInputControllerDTO:
+    return PayForProductInputControllerDTO(
+        "fake_machine_id",
+        "fake_product_id",
+        0,
+        PaymentType.CASH,
+        CoinsVector.create(0, 0, 0, 0, 0, 0),
+    )
 
 
 class Test_Machine_Transaction_Decorator:
     @pytest.mark.asyncio
-    async def test_should_commit_choose_product_decoratee_response(self):
+    async def test_should_choose_product_without_opening_a_transaction(self):
         decoratee = StubMachineController(
             [ChooseProductResponseWithSuccessObject([ChooseProductOutputDTO("fake_id", 0, "fake_name"), 200])], []
         )
         spy_transaction = SpyTransaction(
             [],
             [],
-            [OpenTransactionResponseWithSuccessObject(None)],
+            [],
             [ReleaseResponseWithSuccessObject(None)],
             [CreateClientResponseWithSuccessObject(None)],
-            [CommitResponseWithSuccessObject(None)],
             [],
             [],
+            [],
+            [OpenReadOnlyTransactionResponseWithSuccessObject(None)],
         )
         sut = MachineTransactionDecorator(decoratee, spy_transaction)
         result = await sut.choose_product(ChooseProductInputControllerDTO("01", "eb56f21b-57fe-4534-81ca-afa42f7ca6d5"))
@@ -46,17 +67,18 @@ class Test_Machine_Transaction_Decorator:
         assert result[1] == 200
 
         assert spy_transaction.create_client_counter == 1
-        assert spy_transaction.open_transaction_counter == 1
-        assert spy_transaction.commit_counter == 1
+        assert spy_transaction.open_read_only_transaction_counter == 1
         assert spy_transaction.release_counter == 1
 
+        assert spy_transaction.open_transaction_counter == 0
+        assert spy_transaction.commit_counter == 0
         assert spy_transaction.rollback_counter == 0
         assert spy_transaction.close_counter == 0
 
     @pytest.mark.asyncio
     async def test_should_commit_pay_for_product_decoratee_response(self):
         decoratee = StubMachineController(
-            [], [PayForProductResponseWithSuccessObject([AddCoinsOutputDTO(0, 0, 0, 0, 0, 0, 0), 201])]
+            [], [PayForProductResponseWithSuccessObject([AddCoinsOutputDTO(CoinsVector.create_empty(), 0), 201])]
         )
         spy_transaction = SpyTransaction(
             [],
@@ -75,13 +97,7 @@ class Test_Machine_Transaction_Decorator:
                 "fake_product_id",
                 0,
                 PaymentType.CASH,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                datetime(1970, 1, 1).isoformat(timespec="seconds"),
+                CoinsVector.create(0, 0, 0, 0, 0, 0),
             )
         )
 
@@ -96,37 +112,36 @@ class Test_Machine_Transaction_Decorator:
         assert spy_transaction.close_counter == 0
 
     @pytest.mark.asyncio
-    async def test_should_rollback_choose_product_decoratee_response(self):
+    async def test_should_release_choose_product_failed_response_without_rollback(self):
         decoratee = StubMachineController(
             [ChooseProductResponseWithSuccessObject([ChooseProductOutputDTO("fake_id", 0, "fake_name"), 400])], []
         )
         spy_transaction = SpyTransaction(
             [],
             [],
-            [OpenTransactionResponseWithSuccessObject(None)],
+            [],
             [ReleaseResponseWithSuccessObject(None)],
             [CreateClientResponseWithSuccessObject(None)],
             [],
-            [RollbackResponseWithSuccessObject(None)],
             [],
+            [],
+            [OpenReadOnlyTransactionResponseWithSuccessObject(None)],
         )
         sut = MachineTransactionDecorator(decoratee, spy_transaction)
         result = await sut.choose_product(ChooseProductInputControllerDTO("01", "eb56f21b-57fe-4534-81ca-afa42f7ca6d5"))
 
         assert result[1] == 400
 
-        assert spy_transaction.create_client_counter == 1
-        assert spy_transaction.open_transaction_counter == 1
-        assert spy_transaction.commit_counter == 0
+        assert spy_transaction.open_read_only_transaction_counter == 1
         assert spy_transaction.release_counter == 1
 
-        assert spy_transaction.rollback_counter == 1
-        assert spy_transaction.close_counter == 0
+        assert spy_transaction.commit_counter == 0
+        assert spy_transaction.rollback_counter == 0
 
     @pytest.mark.asyncio
     async def test_should_rollback_pay_for_product_decoratee_response(self):
         decoratee = StubMachineController(
-            [], [PayForProductResponseWithSuccessObject([AddCoinsOutputDTO(0, 0, 0, 0, 0, 0, 0), 400])]
+            [], [PayForProductResponseWithSuccessObject([AddCoinsOutputDTO(CoinsVector.create_empty(), 0), 400])]
         )
         spy_transaction = SpyTransaction(
             [],
@@ -145,13 +160,7 @@ class Test_Machine_Transaction_Decorator:
                 "fake_product_id",
                 0,
                 PaymentType.CASH,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                datetime(1970, 1, 1).isoformat(timespec="seconds"),
+                CoinsVector.create(0, 0, 0, 0, 0, 0),
             )
         )
 
@@ -164,3 +173,207 @@ class Test_Machine_Transaction_Decorator:
 
         assert spy_transaction.rollback_counter == 1
         assert spy_transaction.close_counter == 0
+
+    @pytest.mark.asyncio
+    async def test_should_flush_unit_of_work_before_commit(self):
+        decoratee = StubMachineController(
+            [], [PayForProductResponseWithSuccessObject([AddCoinsOutputDTO(CoinsVector.create_empty(), 0), 201])]
+        )
+        spy_transaction = SpyTransaction(
+            [],
+            [],
+            [OpenTransactionResponseWithSuccessObject(None)],
+            [ReleaseResponseWithSuccessObject(None)],
+            [CreateClientResponseWithSuccessObject(None)],
+            [CommitResponseWithSuccessObject(None)],
+            [],
+            [],
+        )
+        spy_unit_of_work = SpyUnitOfWork([FlushResponseWithSuccessObject()], [ClearResponseWithSuccessObject()])
+        sut = MachineTransactionDecorator(decoratee, spy_transaction, spy_unit_of_work)
+        result = await sut.pay_for_product(make_pay_for_product_input())
+
+        assert result[1] == 201
+
+        assert spy_unit_of_work.flush_counter == 1
+        assert spy_unit_of_work.after_commit_counter == 1
+        assert spy_unit_of_work.clear_counter == 1
+        assert spy_transaction.commit_counter == 1
+        assert spy_transaction.release_counter == 1
+
+    @pytest.mark.asyncio
+    async def test_should_not_flush_unit_of_work_on_rollback(self):
+        decoratee = StubMachineController(
+            [], [PayForProductResponseWithSuccessObject([AddCoinsOutputDTO(CoinsVector.create_empty(), 0), 404])]
+        )
+        spy_transaction = SpyTransaction(
+            [],
+            [],
+            [OpenTransactionResponseWithSuccessObject(None)],
+            [ReleaseResponseWithSuccessObject(None)],
+            [CreateClientResponseWithSuccessObject(None)],
+            [],
+            [RollbackResponseWithSuccessObject(None)],
+            [],
+        )
+        spy_unit_of_work = SpyUnitOfWork([], [ClearResponseWithSuccessObject()])
+        sut = MachineTransactionDecorator(decoratee, spy_transaction, spy_unit_of_work)
+        result = await sut.pay_for_product(make_pay_for_product_input())
+
+        assert result[1] == 404
+
+        assert spy_unit_of_work.flush_counter == 0
+        assert spy_unit_of_work.after_commit_counter == 0
+        assert spy_unit_of_work.clear_counter == 1
+        assert spy_transaction.rollback_counter == 1
+        assert spy_transaction.release_counter == 1
+
+    @pytest.mark.asyncio
+    async def test_should_rollback_and_release_when_flush_fails(self):
+        decoratee = StubMachineController(
+            [], [PayForProductResponseWithSuccessObject([AddCoinsOutputDTO(CoinsVector.create_empty(), 0), 201])]
+        )
+        spy_transaction = SpyTransaction(
+            [],
+            [],
+            [OpenTransactionResponseWithSuccessObject(None)],
+            [ReleaseResponseWithSuccessObject(None)],
+            [CreateClientResponseWithSuccessObject(None)],
+            [],
+            [RollbackResponseWithSuccessObject(None)],
+            [],
+        )
+        spy_unit_of_work = SpyUnitOfWork(
+            [FlushResponseWithFailureObject(Exception("flush failed"))], [ClearResponseWithSuccessObject()]
+        )
+        sut = MachineTransactionDecorator(decoratee, spy_transaction, spy_unit_of_work)
+
+        result = await sut.pay_for_product(make_pay_for_product_input())
+
+        assert result[1] == 500
+        assert result[0]["error"]["message"] == "flush failed"
+        assert spy_transaction.commit_counter == 0
+        assert spy_transaction.rollback_counter == 1
+        assert spy_transaction.release_counter == 1
+        assert spy_unit_of_work.after_commit_counter == 0
+        assert spy_unit_of_work.clear_counter == 1
+
+    @pytest.mark.asyncio
+    async def test_should_rollback_and_raise_when_machine_changed_concurrently(self):
+        decoratee = StubMachineController(
+            [],
+            [PayForProductResponseWithSuccessObject([AddCoinsOutputDTO(CoinsVector.create_empty(), 0), 201])],
+        )
+        spy_transaction = SpyTransaction(
+            [],
+            [],
+            [OpenTransactionResponseWithSuccessObject(None)],
+            [ReleaseResponseWithSuccessObject(None)],
+            [CreateClientResponseWithSuccessObject(None)],
+            [],
+            [RollbackResponseWithSuccessObject(None)],
+            [],
+        )
+        spy_unit_of_work = SpyUnitOfWork(
+            [FlushResponseWithFailureObject(ConcurrentMachineUpdateException())],
+            [ClearResponseWithSuccessObject()],
+        )
+        sut = MachineTransactionDecorator(decoratee, spy_transaction, spy_unit_of_work)
+
+        with pytest.raises(ConcurrentMachineUpdateException):
+            await sut.pay_for_product(make_pay_for_product_input())
+
+        assert spy_transaction.open_transaction_counter == 1
+        assert spy_transaction.rollback_counter == 1
+        assert spy_transaction.commit_counter == 0
+        assert spy_transaction.release_counter == 1
+
+    @pytest.mark.asyncio
+    async def test_should_return_error_with_inserted_coins_when_commit_is_refused(self):
+        decoratee = StubMachineController(
+            [],
+            [PayForProductResponseWithSuccessObject([AddCoinsOutputDTO(CoinsVector.create_empty(), 0), 201])],
+        )
+        spy_transaction = SpyTransaction(
+            [],
+            [],
+            [OpenTransactionResponseWithSuccessObject(None)],
+            [ReleaseResponseWithSuccessObject(None)],
+            [CreateClientResponseWithSuccessObject(None)],
+            [CommitResponseWithFailureObject(Exception("violates check constraint"))],
+            [RollbackResponseWithSuccessObject(None)],
+            [],
+        )
+        spy_unit_of_work = SpyUnitOfWork([FlushResponseWithSuccessObject()], [ClearResponseWithSuccessObject()])
+        sut = MachineTransactionDecorator(decoratee, spy_transaction, spy_unit_of_work)
+        input_dto = make_pay_for_product_input()
+        input_dto.coins = CoinsVector.create(0, 0, 0, 1, 0, 2)
+
+        result = await sut.pay_for_product(input_dto)
+
+        assert result == (
+            {
+                "error": {
+                    "message": "violates check constraint",
+                    "data": {
+                        "coin_01": 0,
+                        "coin_05": 0,
+                        "coin_10": 0,
+                        "coin_25": 1,
+                        "coin_50": 0,
+                        "coin_100": 2,
+                    },
+                }
+            },
+            500,
+        )
+        assert spy_transaction.rollback_counter == 1
+        assert spy_transaction.release_counter == 1
+        assert spy_unit_of_work.after_commit_counter == 0
+
+    @pytest.mark.asyncio
+    async def test_should_release_choose_product_when_decoratee_raises(self):
+        decoratee = StubMachineController([ChooseProductResponseWithFailureObject(Exception("lookup failed"))], [])
+        spy_transaction = SpyTransaction(
+            [],
+            [],
+            [],
+            [ReleaseResponseWithSuccessObject(None)],
+            [CreateClientResponseWithSuccessObject(None)],
+            [],
+            [],
+            [],
+            [OpenReadOnlyTransactionResponseWithSuccessObject(None)],
+        )
+        sut = MachineTransactionDecorator(decoratee, spy_transaction)
+
+        with pytest.raises(Exception, match="lookup failed"):
+            await sut.choose_product(ChooseProductInputControllerDTO("01", "eb56f21b-57fe-4534-81ca-afa42f7ca6d5"))
+
+        assert spy_transaction.release_counter == 1
+        assert spy_transaction.rollback_counter == 0
+
+    @pytest.mark.asyncio
+    async def test_should_rollback_and_release_pay_for_product_when_decoratee_raises(self):
+        decoratee = StubMachineController([], [PayForProductResponseWithFailureObject(Exception("purchase failed"))])
+        spy_transaction = SpyTransaction(
+            [],
+            [],
+            [OpenTransactionResponseWithSuccessObject(None)],
+            [ReleaseResponseWithSuccessObject(None)],
+            [CreateClientResponseWithSuccessObject(None)],
+            [],
+            [RollbackResponseWithSuccessObject(None)],
+            [],
+        )
+        spy_unit_of_work = SpyUnitOfWork([], [ClearResponseWithSuccessObject()])
+        sut = MachineTransactionDecorator(decoratee, spy_transaction, spy_unit_of_work)
+
+        with pytest.raises(Exception, match="purchase failed"):
+            await sut.pay_for_product(make_pay_for_product_input())
+
+        assert spy_transaction.commit_counter == 0
+        assert spy_transaction.rollback_counter == 1
+        assert spy_transaction.release_counter == 1
+        assert spy_unit_of_work.flush_counter == 0
+        assert spy_unit_of_work.clear_counter == 1
@@ -1,10 +1,9 @@
-from datetime import datetime
-
 import pytest
 
 from src.domain.entities.machine import MachineEntity, MachineState
 from src.domain.entities.owner import OwnerEntity
 from src.domain.entities.product import ProductEntity
+from src.domain.value_objects.coins import CoinsVector
 from src.domain.entities.payment import PaymentType
 
 from src.services.contracts.controllers.machine import (
@@ -19,8 +18,7 @@ from src.presentation.controllers.machine import (
 from src.presentation.presenters.json_presenter import JSONPresenter
 
 from src.services.machine import MachineService
-from src.services.order import OrderService
-from src.services.payment import PaymentService
+from src.services.checkout import CheckoutService
 
 from src.infra.repositories.machine.fake_machine_repository import FakeMachineRepository
 from src.infra.repositories.order.fake_order_repository import FakeOrderRepository
@@ -41,16 +39,10 @@ class Test_Machine_Controller_Choose_Product:
         payment_repo = FakePaymentRepository.get_instance()
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(
-            json_presenter,
-            machine_service,
-            order_service,
-            payment_service,
-        )
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.choose_product(
             ChooseProductInputControllerDTO("00", "43c6fc3c-a51a-4c5d-9c1d-aae7e0c6ac4f")
@@ -81,12 +73,7 @@ class Test_Machine_Controller_Choose_Product:
             machine_id,
             owner,
             MachineState.DISPENSING,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -95,20 +82,14 @@ class Test_Machine_Controller_Choose_Product:
         payment_repo = FakePaymentRepository.get_instance()
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         await machine_repo.save(machine)
 
         machine_service = MachineService(machine_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(
-            json_presenter,
-            machine_service,
-            order_service,
-            payment_service,
-        )
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.choose_product(ChooseProductInputControllerDTO(products[0].code, machine_id))
 
@@ -135,12 +116,7 @@ class Test_Machine_Controller_Choose_Product:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -151,11 +127,10 @@ class Test_Machine_Controller_Choose_Product:
         await machine_repo.save(machine)
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(json_presenter, machine_service, order_service, payment_service)
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.choose_product(ChooseProductInputControllerDTO("03", machine_id))
 
@@ -182,12 +157,7 @@ class Test_Machine_Controller_Choose_Product:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -198,11 +168,10 @@ class Test_Machine_Controller_Choose_Product:
         await machine_repo.save(machine)
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(json_presenter, machine_service, order_service, payment_service)
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.choose_product(ChooseProductInputControllerDTO(products[0].code, machine_id))
 
@@ -232,12 +201,7 @@ class Test_Machine_Controller_Choose_Product:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -248,11 +212,10 @@ class Test_Machine_Controller_Choose_Product:
         await machine_repo.save(machine)
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(json_presenter, machine_service, order_service, payment_service)
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.choose_product(ChooseProductInputControllerDTO(products[0].code, machine_id))
 
@@ -291,12 +254,7 @@ class Test_Machine_Controller_Pay_For_Product:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -307,16 +265,10 @@ class Test_Machine_Controller_Pay_For_Product:
         await machine_repo.save(machine)
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(
-            json_presenter,
-            machine_service,
-            order_service,
-            payment_service,
-        )
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.pay_for_product(
             PayForProductInputControllerDTO(
@@ -324,13 +276,7 @@ class Test_Machine_Controller_Pay_For_Product:
                 products[0].id.value,
                 0,
                 PaymentType.CASH,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                datetime.now().isoformat(timespec="seconds"),
+                CoinsVector.create(0, 0, 0, 0, 0, 0),
             )
         )
 
@@ -366,12 +312,7 @@ class Test_Machine_Controller_Pay_For_Product:
             machine_id,
             owner,
             MachineState.DISPENSING,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -382,16 +323,10 @@ class Test_Machine_Controller_Pay_For_Product:
         await machine_repo.save(machine)
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(
-            json_presenter,
-            machine_service,
-            order_service,
-            payment_service,
-        )
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.pay_for_product(
             PayForProductInputControllerDTO(
@@ -399,13 +334,7 @@ class Test_Machine_Controller_Pay_For_Product:
                 products[0].id.value,
                 0,
                 PaymentType.CASH,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                datetime.now().isoformat(timespec="seconds"),
+                CoinsVector.create(0, 0, 0, 0, 0, 0),
             )
         )
 
@@ -438,12 +367,7 @@ class Test_Machine_Controller_Pay_For_Product:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -454,11 +378,10 @@ class Test_Machine_Controller_Pay_For_Product:
         await machine_repo.save(machine)
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(json_presenter, machine_service, order_service, payment_service)
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.pay_for_product(
             PayForProductInputControllerDTO(
@@ -466,13 +389,7 @@ class Test_Machine_Controller_Pay_For_Product:
                 products[0].id.value,
                 1,
                 PaymentType.CASH,
-                4,
-                0,
-                2,
-                1,
-                1,
-                0,
-                datetime.now().isoformat(timespec="seconds"),
+                CoinsVector.create(4, 0, 2, 1, 1, 0),
             )
         )
 
@@ -507,12 +424,7 @@ class Test_Machine_Controller_Pay_For_Product:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -523,11 +435,10 @@ class Test_Machine_Controller_Pay_For_Product:
         await machine_repo.save(machine)
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(json_presenter, machine_service, order_service, payment_service)
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.pay_for_product(
             PayForProductInputControllerDTO(
@@ -535,13 +446,7 @@ class Test_Machine_Controller_Pay_For_Product:
                 "b9651752-6c44-4578-bdb6-883d703cbffe",
                 1,
                 PaymentType.CASH,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                datetime.now().isoformat(timespec="seconds"),
+                CoinsVector.create(0, 0, 0, 0, 0, 0),
             )
         )
 
@@ -576,12 +481,7 @@ class Test_Machine_Controller_Pay_For_Product:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -592,11 +492,10 @@ class Test_Machine_Controller_Pay_For_Product:
         await machine_repo.save(machine)
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(json_presenter, machine_service, order_service, payment_service)
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.pay_for_product(
             PayForProductInputControllerDTO(
@@ -604,13 +503,7 @@ class Test_Machine_Controller_Pay_For_Product:
                 products[0].id.value,
                 1,
                 PaymentType.CASH,
-                0,
-                1,
-                0,
-                0,
-                0,
-                0,
-                datetime.now().isoformat(timespec="seconds"),
+                CoinsVector.create(0, 1, 0, 0, 0, 0),
             )
         )
 
@@ -648,12 +541,7 @@ class Test_Machine_Controller_Pay_For_Product:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -664,11 +552,10 @@ class Test_Machine_Controller_Pay_For_Product:
         await machine_repo.save(machine)
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(json_presenter, machine_service, order_service, payment_service)
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.pay_for_product(
             PayForProductInputControllerDTO(
@@ -676,13 +563,7 @@ class Test_Machine_Controller_Pay_For_Product:
                 products[1].id.value,
                 1,
                 PaymentType.CASH,
-                0,
-                0,
-                0,
-                0,
-                1,
-                1,
-                datetime.now().isoformat(timespec="seconds"),
+                CoinsVector.create(0, 0, 0, 0, 1, 1),
             )
         )
 
@@ -717,12 +598,7 @@ class Test_Machine_Controller_Pay_For_Product:
             machine_id,
             owner,
             MachineState.READY,
-            0,
-            0,
-            0,
-            0,
-            0,
-            0,
+            CoinsVector.create(0, 0, 0, 0, 0, 0),
             products,
         )
 
@@ -733,11 +609,10 @@ class Test_Machine_Controller_Pay_For_Product:
         await machine_repo.save(machine)
 
         machine_service = MachineService(machine_repo)
-        order_service = OrderService(machine_repo, order_repo)
-        payment_service = PaymentService(order_repo, payment_repo)
+        checkout_service = CheckoutService(machine_repo, order_repo, payment_repo)
 
         json_presenter = JSONPresenter()
-        machine_controller = MachineController(json_presenter, machine_service, order_service, payment_service)
+        machine_controller = MachineController(json_presenter, machine_service, checkout_service)
 
         output = await machine_controller.pay_for_product(
             PayForProductInputControllerDTO(
@@ -745,13 +620,7 @@ class Test_Machine_Controller_Pay_For_Product:
                 products[0].id.value,
                 1,
                 PaymentType.CASH,
-                0,
-                0,
-                0,
-                0,
-                0,
-                2,
-                datetime.now().isoformat(timespec="seconds"),
+                CoinsVector.create(0, 0, 0, 0, 0, 2),
             )
         )
 
@@ -761,5 +630,6 @@ class Test_Machine_Controller_Pay_For_Product:
         assert output[0]["coin_25_qty"] == 0
         assert output[0]["coin_50_qty"] == 0
         assert output[0]["coin_100_qty"] == 1
+        assert output[0]["amount_paid"] == 100
 
         assert output[1] == 201
@@ -0,0 +1,117 @@
+import pytest
+
+from src.domain.entities.machine import MachineEntity, MachineState
+from src.domain.entities.owner import OwnerEntity
+from src.domain.entities.product import ProductEntity
+from src.domain.entities.payment import PaymentType
+
+from src.domain.value_objects.uuid import UUIDValueObject
+from src.domain.value_objects.coins import CoinsVector, CoinTypes
+
+from src.domain.contracts.dtos.checkout import CheckoutInputDTO
+
+from src.services.checkout import CheckoutService
+
+from src.services.exceptions.unregistered_machine import UnregisteredMachineException
+from src.services.exceptions.machine_is_not_ready import MachineIsNotReadyException
+from src.services.exceptions.product_does_not_exist import ProductDoesNotExistException
+from src.services.exceptions.unavailable_product import UnavailableProductException
+from src.services.exceptions.incorrect_negative_change import IncorrectNegativeChangeException
+from src.services.exceptions.invalid_payment_type import InvalidPaymentTypeException
+
+from src.infra.repositories.machine.fake_machine_repository import FakeMachineRepository
+from src.infra.repositories.order.fake_order_repository import FakeOrderRepository
+from src.infra.repositories.payment.fake_payment_repository import FakePaymentRepository
+
+
+def make_machine(state: MachineState, coin_qty: int, product_qty: int) -> MachineEntity:
+    owner = OwnerEntity.create("b9651752-6c44-4578-bdb6-883d703cbff5", "Sebastião Maia", "test@mail.com")
+    products = [
+        ProductEntity.create("b9651752-6c44-4578-bdb6-883d703cbfff", "Hersheys", product_qty, "00", 100),
+    ]
+    return MachineEntity.create(
+        "43c6fc3c-a51a-4c5d-9c1d-aae7e0c6ac4e",
+        owner,
+        state,
+        CoinsVector.create(coin_qty, coin_qty, coin_qty, coin_qty, coin_qty, coin_qty),
+        products,
+    )
+
+
+def make_input(product_id: str, payment_type: str, coin_50_qty: int, coin_100_qty: int) -> CheckoutInputDTO:
+    return CheckoutInputDTO(
+        "43c6fc3c-a51a-4c5d-9c1d-aae7e0c6ac4e",
+        product_id,
+        1,
+        payment_type,
+        CoinsVector.create(0, 0, 0, 0, coin_50_qty, coin_100_qty),
+    )
+
+
+class Test_Checkout_Service_Checkout:
+    @pytest.fixture(autouse=True)
+    def reset_fake_repos(self):
+        FakeMachineRepository.reset_instance()
+        FakeOrderRepository.reset_instance()
+        FakePaymentRepository.reset_instance()
+
+    @pytest.fixture
+    def service(self) -> CheckoutService:
+        return CheckoutService(
+            FakeMachineRepository.get_instance(),
+            FakeOrderRepository.get_instance(),
+            FakePaymentRepository.get_instance(),
+        )
+
+    @pytest.mark.asyncio
+    async def test_should_raise_exception_if_machine_is_not_registered(self, service):
+        with pytest.raises(UnregisteredMachineException):
+            await service.checkout(make_input("b9651752-6c44-4578-bdb6-883d703cbfff", PaymentType.CASH, 0, 1))
+
+    @pytest.mark.asyncio
+    async def test_should_raise_exception_if_machine_is_not_ready(self, service):
+        await FakeMachineRepository.get_instance().save(make_machine(MachineState.DISPENSING, 0, 1))
+        with pytest.raises(MachineIsNotReadyException):
+            await service.checkout(make_input("b9651752-6c44-4578-bdb6-883d703cbfff", PaymentType.CASH, 0, 1))
+
+    @pytest.mark.asyncio
+    async def test_should_raise_exception_if_product_does_not_exists(self, service):
+        await FakeMachineRepository.get_instance().save(make_machine(MachineState.READY, 0, 1))
+        with pytest.raises(ProductDoesNotExistException):
+            await service.checkout(make_input("b9651752-6c44-4578-bdb6-883d703cb000", PaymentType.CASH, 0, 1))
+
+    @pytest.mark.asyncio
+    async def test_should_raise_exception_if_product_is_out_of_stock(self, service):
+        await FakeMachineRepository.get_instance().save(make_machine(MachineState.READY, 0, 0))
+        with pytest.raises(UnavailableProductException):
+            await service.checkout(make_input("b9651752-6c44-4578-bdb6-883d703cbfff", PaymentType.CASH, 0, 1))
+
+    @pytest.mark.asyncio
+    async def test_should_raise_exception_if_change_is_negative(self, service):
+        await FakeMachineRepository.get_instance().save(make_machine(MachineState.READY, 0, 1))
+        with pytest.raises(IncorrectNegativeChangeException):
+            await service.checkout(make_input("b9651752-6c44-4578-bdb6-883d703cbfff", PaymentType.CASH, 1, 0))
+
+    @pytest.mark.asyncio
+    async def test_should_raise_exception_if_payment_type_is_invalid(self, service):
+        await FakeMachineRepository.get_instance().save(make_machine(MachineState.READY, 0, 1))
+        with pytest.raises(InvalidPaymentTypeException):
+            await service.checkout(make_input("b9651752-6c44-4578-bdb6-883d703cbfff", "UNKNOWN", 0, 1))
+
+    @pytest.mark.asyncio
+    async def test_should_return_change_and_dispense_product(self, service):
+        await FakeMachineRepository.get_instance().save(make_machine(MachineState.READY, 1, 2))
+
+        output = await service.checkout(make_input("b9651752-6c44-4578-bdb6-883d703cbfff", PaymentType.CASH, 1, 1))
+
+        machine = await FakeMachineRepository.get_instance().find_by_id(
+            UUIDValueObject.create("43c6fc3c-a51a-4c5d-9c1d-aae7e0c6ac4e")
+        )
+
+        assert output.coins[CoinTypes.COIN_50] == 1
+        assert output.coins[CoinTypes.COIN_100] == 0
+        assert output.amount_paid == 100
+        assert machine.state == MachineState.READY
+        assert machine.coins[CoinTypes.COIN_50] == 1
+        assert machine.coins[CoinTypes.COIN_100] == 2
+        assert machine.products[0].qty == 1